@@ -1,2 +1,7 @@
 # This file makes the utils directory a Python package
-# It allows you to import modules from utils
\ No newline at end of file
+# It allows you to import modules from utils
+#
+# Core modules (pdf_processor, nlp_processor, openai_helpers, data_store and
+# their helpers) must not import streamlit, so the pipeline can run in process
+# pools, batch jobs and services. Streamlit-specific code lives in
+# streamlit_adapter and ui_components.
\ No newline at end of file
@@ -0,0 +1,169 @@
+import hashlib
+import re
+from typing import Dict
+
+from utils.metrics import timed
+from utils.nlp_processor import find_skill_terms
+from utils.pipeline import NodeCache
+
+# Words per minute of a typical spoken answer
+SPEAKING_WPM = 130
+
+# Word counts of an answer that fits in roughly 30 seconds to 2.5 minutes
+MIN_ANSWER_WORDS = 60
+MAX_ANSWER_WORDS = 320
+
+# "like" is only counted when it is set off as a filler (", like,")
+FILLER_PATTERN = re.compile(
+    r"\b(?:um+|uh+|erm+|basically|actually|literally|honestly|you know|i mean|sort of|kind of)\b"
+    r"|(?:^|,)\s*like\s*,",
+    re.IGNORECASE
+)
+
+# Phrases that mark each part of a STAR (Situation, Task, Action, Result) answer
+STAR_CUES = {
+    'situation': (
+        r"when i was|while (?:i was |working )|at my (?:previous|last|current|first) (?:job|role|company|team|internship)"
+        r"|in my (?:previous|last|current) (?:job|role|position)|the situation|we were (?:facing|dealing)"
+        r"|background|context|(?:last|one) (?:year|quarter|semester)"
+    ),
+    'task': (
+        r"my (?:task|goal|job|responsibility|role|objective) was|i was (?:asked|tasked|responsible|assigned)"
+        r"|(?:i|we) needed to|(?:i|we) had to|the (?:goal|challenge|problem) was|in charge of"
+    ),
+    'action': (
+        r"i (?:implemented|built|designed|led|created|wrote|developed|decided|organized|set up|introduced"
+        r"|refactored|migrated|automated|proposed|analyzed|investigated|reached out|collaborated|coordinated)"
+        r"|my approach|first,? i|then,? i|so i"
+    ),
+    'result': (
+        r"as a result|resulted in|result was|outcome|which (?:led|reduced|increased|improved|saved|cut)"
+        r"|(?:reduced|increased|improved|saved|cut|grew|boosted) [\w\s]{0,30}?by"
+        r"|\d+(?:\.\d+)?\s?(?:%|percent|x\b)|in the end|ultimately|we delivered|i learned"
+    ),
+}
+
+STAR_PATTERN = re.compile(
+    '|'.join(rf"(?P<{part}>\b(?:{cues}))" for part, cues in STAR_CUES.items()),
+    re.IGNORECASE
+)
+
+# Everyday phrasings of words that are also skill names ("go about",
+# "express checkout", "spring sale"); they're blanked out of a question
+# before its skill terms are found, so "with Go" still counts
+EVERYDAY_USES = {
+    'go': r"go (?:about|through|over|back|ahead|wrong|well|into|beyond|live|for|from|on|out|further)"
+          r"|(?:let|to|on the) go|go-to",
+    'express': r"express (?:checkout|delivery|shipping|lane|mail|interest|concerns?|yourself|your|an?|the|that)"
+               r"|(?:to|you|we|i) express",
+    'spring': r"spring (?:sale|break|season|semester|term|cleaning|quarter)|(?:this|last|next|during the) spring",
+    'chef': r"(?:head|pastry|sous|executive|private) chef",
+    'shell': r"shell out",
+    'node': r"(?:a|each|every|leaf|root|parent|child|single|one) node",
+    'oracle': r"(?:an|the|test) oracle",
+    'testing': r"testing (?:the waters|times|your|my|our|their|the limits)",
+    'swift': r"swift (?:response|action|decision|resolution|turnaround|recovery)",
+}
+EVERYDAY_PATTERN = re.compile(
+    '|'.join(rf"\b(?:{uses})\b" for uses in EVERYDAY_USES.values()),
+    re.IGNORECASE
+)
+
+WORD_PATTERN = re.compile(r"[A-Za-z0-9][\w'+#.-]*")
+
+# Scores by answer hash, shared by every session; reruns with an unchanged answer hit it
+_score_cache = NodeCache(max_entries=1024)
+
+
+def answer_key(question: str, answer: str) -> str:
+    """Hash identifying one answer to one question."""
+    return hashlib.sha1(f"{question}\0{answer}".encode('utf-8')).hexdigest()
+
+
+def score_answer(question: str, answer: str) -> Dict:
+    """
+    Score a practice answer locally, without calling the API
+
+    Args:
+        question: Interview question text
+        answer: User's answer text
+
+    Returns:
+        dict: Coverage of the question's skill terms, STAR parts found, length
+        and filler-word metrics, an overall score from 0 to 1 and tips
+    """
+    key = answer_key(question, answer)
+    hit, result = _score_cache.get(key)
+    if not hit:
+        with timed("answer_scoring"):
+            result = _score(question, answer)
+        _score_cache.put(key, result)
+    return result
+
+
+def _score(question: str, answer: str) -> Dict:
+    words = WORD_PATTERN.findall(answer)
+    word_count = len(words)
+
+    # Skill terms the question asks about and how many the answer mentions
+    question_terms = find_skill_terms(EVERYDAY_PATTERN.sub(' ', question))
+    answer_terms = find_skill_terms(answer)
+    covered = sorted(question_terms & answer_terms)
+    missing = sorted(question_terms - answer_terms)
+    coverage = len(covered) / len(question_terms) if question_terms else None
+
+    star = {part: False for part in STAR_CUES}
+    for match in STAR_PATTERN.finditer(answer):
+        star[match.lastgroup] = True
+    star_score = sum(star.values()) / len(star)
+
+    fillers: Dict[str, int] = {}
+    for match in FILLER_PATTERN.finditer(answer):
+        filler = re.sub(r'[^a-z ]', '', match.group(0).lower()).strip()
+        filler = re.sub(r'(.)\1+$', r'\1', filler)  # "ummm" -> "um"
+        fillers[filler] = fillers.get(filler, 0) + 1
+    filler_count = sum(fillers.values())
+    filler_rate = filler_count / word_count * 100 if word_count else 0.0
+
+    if word_count < MIN_ANSWER_WORDS:
+        length_score = word_count / MIN_ANSWER_WORDS
+    elif word_count > MAX_ANSWER_WORDS:
+        length_score = max(0.0, 1 - (word_count - MAX_ANSWER_WORDS) / MAX_ANSWER_WORDS)
+    else:
+        length_score = 1.0
+    delivery_score = max(0.0, length_score - filler_rate / 10)
+
+    # Weights: coverage 40%, STAR 40%, length and fillers 20%; coverage's
+    # share moves to STAR when the question names no skills
+    if coverage is None:
+        score = 0.8 * star_score + 0.2 * delivery_score
+    else:
+        score = 0.4 * coverage + 0.4 * star_score + 0.2 * delivery_score
+
+    tips = []
+    if word_count < MIN_ANSWER_WORDS:
+        tips.append("Expand your answer with a specific example.")
+    elif word_count > MAX_ANSWER_WORDS:
+        tips.append("Tighten your answer; aim for under two minutes.")
+    missing_parts = [part for part, found in star.items() if not found]
+    if missing_parts:
+        tips.append("Add the " + ", ".join(missing_parts) + " of your STAR story.")
+    if missing:
+        tips.append("Mention " + ", ".join(missing) + ".")
+    if filler_rate > 3:
+        tips.append("Cut filler words like " + ", ".join(f'"{f}"' for f in sorted(fillers, key=fillers.get, reverse=True)[:3]) + ".")
+
+    return {
+        'word_count': word_count,
+        'speaking_seconds': round(word_count / SPEAKING_WPM * 60),
+        'skill_terms': sorted(question_terms),
+        'covered_terms': covered,
+        'missing_terms': missing,
+        'coverage': coverage,
+        'star': star,
+        'fillers': fillers,
+        'filler_count': filler_count,
+        'filler_rate': filler_rate,
+        'score': score,
+        'tips': tips
+    }
@@ -1,14 +1,26 @@
 import streamlit as st
 import os
+import json
+import uuid
+import hashlib
 from dotenv import load_dotenv
-from utils.pdf_processor import extract_text_from_pdf, clean_text, extract_resume_sections
-from utils.nlp_processor import analyze_job_description, analyze_resume, calculate_match_score
-from utils.ui_components import display_match_score_gauge, display_keyword_match_bar, display_match_details_expander, display_recommendations
-from utils.openai_helpers import initialize_openai, generate_interview_questions
+from utils.pdf_processor import clean_text, extract_resume_sections
+from utils.streamlit_adapter import extract_text_from_pdf
+from utils.ui_components import display_match_score_gauge, display_keyword_match_bar, display_match_details_expander, display_recommendations, display_skill_gap_panel, display_timing_sidebar, display_pipeline_stages, display_resume_result, display_resume_comparison_table, display_session_memory, display_answer_feedback, display_analysis_coverage
+from utils.openai_helpers import initialize_openai
+from utils.metrics import start_trace, start_metrics_server
+from utils.job_queue import JobQueue, DONE, FAILED
+from utils.pipeline import analysis_pipeline, COMPUTED
+from utils.answer_scoring import score_answer
+from utils.warmup import start_warmup
+from utils.session_payloads import SessionPayloadStore, SessionMemoryTracker, session_memory_usage
 
 # Configure page settings
 st.set_page_config(page_title="AI Interview Prep", page_icon="🧠", layout="wide")
 
+# Collect timing spans for this script run
+timing_spans = start_trace()
+
 # Page title
 st.title("AI Interview Preparation Platform")
 st.markdown("---")
@@ -23,11 +35,329 @@ if not OPENAI_API_KEY:
     st.info("Please add your OpenAI API key to the .env file")
     st.stop()
 
-# Initialize OpenAI client
-openai_client = initialize_openai()
-if not openai_client:
-    st.info("Please check your .env file and ensure the OPENAI_API_KEY is set correctly.")
-    st.stop()
+# Heavy modules (spaCy, plotly, the OpenAI SDK) load on the page that needs
+# them or in the background warm-up started at the end of this script
+@st.cache_resource
+def get_openai_client():
+    """OpenAI client, created once per process on first use."""
+    return initialize_openai()
+
+# ---- METRICS ----
+@st.cache_resource
+def get_metrics_server():
+    """Serve Prometheus metrics on METRICS_PORT, once per process."""
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return start_metrics_server(int(port))
+    except Exception as e:
+        print(f"Metrics server disabled: {e}")
+        return None
+
+
+get_metrics_server()
+
+# ---- PERSISTENCE ----
+@st.cache_resource
+def get_persistence_queue():
+    """Process-wide write-behind queue, or None when no database is configured."""
+    if not os.getenv("DATABASE_URL"):
+        return None
+    try:
+        from models.database import init_db
+        from utils.data_store import DataStore
+        from utils.persistence_queue import PersistenceQueue
+        init_db()
+        DataStore().migrate_text_blobs()
+        return PersistenceQueue()
+    except Exception as e:
+        print(f"Persistence disabled: {e}")
+        return None
+
+
+# ---- SESSION PAYLOADS ----
+# Large values live in the payload store; session state only holds PayloadRefs
+PAYLOAD_KEYS = ("resume_text", "resume_sections", "job_analysis", "resume_analysis", "questions", "comparison_results")
+
+# Payload files not used for this long are deleted at start-up
+PAYLOAD_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+
+
+@st.cache_resource
+def get_payload_store():
+    """Process-wide disk-backed store for large session-state values."""
+    store = SessionPayloadStore()
+    store.purge(PAYLOAD_MAX_AGE_SECONDS)
+    return store
+
+
+@st.cache_resource
+def get_parsed_resume_store():
+    """Resume parses stored alongside sessions, or None when no database is configured."""
+    if get_persistence_queue() is None:
+        return None
+    from utils.parsed_resumes import ParsedResumeStore
+    return ParsedResumeStore()
+
+
+@st.cache_resource
+def get_memory_tracker():
+    """Per-session memory accounting, exported on /metrics."""
+    return SessionMemoryTracker()
+
+
+def store_payload(key, value):
+    """Put a large value in the payload store and keep only its handle in session state."""
+    st.session_state[key] = payload_store.put(value) if value else None
+
+
+def load_payload(key, default=None):
+    """Value stored with store_payload, or ``default``."""
+    return payload_store.get(st.session_state.get(key), default)
+
+
+def store_results(results):
+    """Copy a dict of results into session state, offloading large values."""
+    for key, value in results.items():
+        if key in PAYLOAD_KEYS:
+            store_payload(key, value)
+        else:
+            st.session_state[key] = value
+
+
+# Returned by load_payload when a payload file is gone (purged or cleaned from tmp)
+PAYLOAD_MISSING = object()
+
+
+def session_state_parts():
+    """
+    Build the persistable parts of the current session state.
+
+    A value whose payload can no longer be loaded is left out rather than
+    sent as empty, so it doesn't overwrite what the database already holds.
+    """
+    parts = {
+        'session': {
+            'job_title': st.session_state.get("job_title", ""),
+            'job_description': st.session_state.get("job_description", "")
+        }
+    }
+    resume_text = load_payload("resume_text", PAYLOAD_MISSING)
+    if resume_text is PAYLOAD_MISSING and st.session_state.get("resume_text") is None:
+        resume_text = ""  # no resume uploaded yet
+    if resume_text is not PAYLOAD_MISSING:
+        parts['session']['resume_text'] = resume_text or ""
+    if st.session_state.get("match_result"):
+        parts['analysis'] = {'match_result': st.session_state["match_result"]}
+    questions = load_payload("questions", PAYLOAD_MISSING) if st.session_state.get("questions") else None
+    if questions and questions is not PAYLOAD_MISSING:
+        parts['interview'] = {
+            'questions': questions,
+            'answers': {str(i): st.session_state.get(f"answer_{i}", "") for i in range(1, len(questions) + 1)}
+        }
+    return parts
+
+
+def state_digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def restore_session_state(session_id):
+    """Reload a persisted session into st.session_state after a restart."""
+    from utils.data_store import DataStore
+
+    persistence_queue.flush(timeout=2.0)
+    saved = DataStore().load_full_session(session_id)
+    if not saved:
+        return
+
+    st.session_state["job_title"] = saved['session'].get('job_title') or ""
+    st.session_state["job_description"] = saved['session'].get('job_description') or ""
+    resume_text = saved['session'].get('resume_text')
+    if resume_text:
+        # Lets re-scoring against a new job description skip parsing the resume
+        parsed_resume_store.load(resume_text)
+        store_payload("resume_text", resume_text)
+        store_payload("resume_sections", extract_resume_sections(resume_text))
+        st.session_state["resume_uploaded"] = True
+    if saved['analysis']:
+        st.session_state["match_result"] = saved['analysis']['match_result']
+    if saved['interview']:
+        store_payload("questions", saved['interview']['questions'])
+        for key, answer in (saved['interview'].get('answers') or {}).items():
+            st.session_state[f"answer_{key}"] = answer
+
+    # What was just loaded is already stored; don't write it back
+    st.session_state["persisted_digests"] = {
+        part: state_digest(value) for part, value in session_state_parts().items()
+    }
+
+
+def persist_session_state():
+    """Queue the parts of the session state that changed since the last run."""
+    if persistence_queue is None:
+        return
+
+    parts = session_state_parts()
+    digests = st.session_state.setdefault("persisted_digests", {})
+    changed = {part: value for part, value in parts.items() if digests.get(part) != state_digest(value)}
+    if not changed:
+        return
+
+    # Child rows need the session row, so always send it along
+    changed.setdefault('session', parts['session'])
+    if persistence_queue.submit(st.session_state["session_id"], changed):
+        for part, value in changed.items():
+            digests[part] = state_digest(value)
+
+
+# ---- BACKGROUND JOBS ----
+# Session-state key holding the id of each kind of running job
+JOB_STATE_KEYS = {
+    'analyze_match': 'match_job_id',
+    'generate_questions': 'questions_job_id',
+}
+JOB_LABELS = {
+    'analyze_match': "Analyzing resume-job match",
+    'generate_questions': "Generating interview questions",
+}
+JOB_POLL_SECONDS = 1.0
+
+# Latency budget for the spaCy stages of an interactive match; batch comparisons run unbounded
+ANALYSIS_BUDGET_SECONDS = float(os.getenv("ANALYSIS_BUDGET_SECONDS", "5"))
+
+
+def run_match_analysis(payload):
+    """Job handler: score the match, reusing analyses whose inputs are unchanged."""
+    from utils.nlp_processor import analysis_deadline, record_parses
+    # Workers run outside the script's trace; the spans travel back with the result
+    spans = start_trace()
+    if parsed_resume_store is not None:
+        parsed_resume_store.load(payload['resume_text'])
+
+    with record_parses() as parses, analysis_deadline(ANALYSIS_BUDGET_SECONDS):
+        run = analysis_pipeline.run(payload, targets=['match_result'])
+
+    # A resume analysis cut short by the budget is not worth storing
+    if (parsed_resume_store is not None and run['stages']['resume_analysis'] == COMPUTED
+            and 'resume_analysis' not in run['partial']):
+        parsed_resume_store.save(
+            payload['resume_text'], run['values']['resume_sections'], run['values']['resume_analysis'], parses
+        )
+    return {
+        'resume_sections': run['values']['resume_sections'],
+        'job_analysis': run['values']['job_analysis'],
+        'resume_analysis': run['values']['resume_analysis'],
+        'match_result': run['values']['match_result'],
+        'match_stages': run['stages'],
+        'match_provenance': run['provenance'],
+        'timing_spans': spans
+    }
+
+
+def run_question_generation(payload):
+    """Job handler: generate fresh interview questions with OpenAI."""
+    spans = start_trace()
+    run = analysis_pipeline.run(payload, targets=['questions'], force=['questions'])
+    return {
+        'questions': run['values']['questions'],
+        'questions_stages': run['stages'],
+        'questions_provenance': run['provenance'],
+        'timing_spans': spans
+    }
+
+
+@st.cache_resource
+def get_job_queue():
+    """Process-wide background job queue shared by all sessions."""
+    return JobQueue({
+        'analyze_match': run_match_analysis,
+        'generate_questions': run_question_generation,
+    })
+
+
+def submit_job(kind, payload):
+    """Start a background job and remember its id in the session."""
+    st.session_state[JOB_STATE_KEYS[kind]] = job_queue.submit(kind, payload)
+    st.session_state.pop(f"{kind}_error", None)
+
+
+def collect_finished_jobs():
+    """Move results of finished jobs into the session state."""
+    for kind, state_key in JOB_STATE_KEYS.items():
+        job_id = st.session_state.get(state_key)
+        if not job_id:
+            continue
+        job = job_queue.get(job_id)
+        if job is None:
+            st.session_state.pop(state_key)
+            st.session_state[f"{kind}_error"] = "The background job expired. Please try again."
+        elif job['status'] == DONE:
+            st.session_state.pop(state_key)
+            # The job's stages count toward the run that picks up its result
+            timing_spans.extend(job['result'].pop('timing_spans', []))
+            store_results(job['result'])
+        elif job['status'] == FAILED:
+            st.session_state.pop(state_key)
+            st.session_state[f"{kind}_error"] = job['error']
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_status_poller():
+    """Show running jobs and rerun the page once one of them finishes."""
+    for kind, state_key in JOB_STATE_KEYS.items():
+        job_id = st.session_state.get(state_key)
+        if not job_id:
+            continue
+        job = job_queue.get(job_id)
+        if job is None or job['status'] in (DONE, FAILED):
+            st.rerun(scope="app")
+        st.caption(f"⏳ {JOB_LABELS[kind]} ({job['status']})...")
+
+
+@st.cache_resource
+def get_batch_executor():
+    """Thread pool shared by all sessions for multi-resume comparisons."""
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.batch_analysis import DEFAULT_BATCH_WORKERS
+    return ThreadPoolExecutor(max_workers=DEFAULT_BATCH_WORKERS, thread_name_prefix="resume-batch")
+
+
+@st.cache_resource
+def get_nlp_pool():
+    """spaCy worker processes shared by all sessions, if NLP_POOL_WORKERS is set."""
+    from utils.nlp_pool import start_worker_pool
+    try:
+        return start_worker_pool()
+    except Exception as e:
+        print(f"spaCy worker pool disabled: {e}")
+        return None
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_top_missing_skills(job_title):
+    """Top missing skills for a job title this month, from the aggregate table."""
+    from utils.data_store import DataStore
+    return DataStore().top_missing_skills(job_title)
+
+
+persistence_queue = get_persistence_queue()
+parsed_resume_store = get_parsed_resume_store()
+payload_store = get_payload_store()
+memory_tracker = get_memory_tracker()
+get_nlp_pool()
+
+# Each browser session gets an id kept in the URL so it can be restored
+if "session_id" not in st.session_state:
+    restored_id = st.query_params.get("sid")
+    st.session_state["session_id"] = restored_id or uuid.uuid4().hex
+    st.query_params["sid"] = st.session_state["session_id"]
+    if restored_id and persistence_queue is not None:
+        restore_session_state(restored_id)
+
+job_queue = get_job_queue()
+collect_finished_jobs()
 
 # ---- SIDEBAR SETUP ----
 st.sidebar.title("Interview Setup")
@@ -41,9 +371,14 @@ job_title = st.sidebar.text_input(
 if job_title != st.session_state.get("job_title", ""):
     st.session_state["job_title"] = job_title
 
+# Poll background jobs without blocking the page
+if any(st.session_state.get(state_key) for state_key in JOB_STATE_KEYS.values()):
+    with st.sidebar:
+        job_status_poller()
+
 # ---- PAGE NAVIGATION ----
 # Define available pages
-pages = ["Upload Resume", "Resume-Job Match", "Generate Questions", "Interview Session"]
+pages = ["Upload Resume", "Compare Resumes", "Resume-Job Match", "Generate Questions", "Interview Session"]
 
 # Get current page from query params or default to first page
 query_params = st.query_params
@@ -64,13 +399,13 @@ if page != current_page:
 if "resume_text" not in st.session_state:
     st.session_state["resume_text"] = None
 if "resume_sections" not in st.session_state:
-    st.session_state["resume_sections"] = {}
+    st.session_state["resume_sections"] = None
 if "job_description" not in st.session_state:
     st.session_state["job_description"] = ""
 if "match_result" not in st.session_state:
     st.session_state["match_result"] = None
 if "questions" not in st.session_state:
-    st.session_state["questions"] = []
+    st.session_state["questions"] = None
 if "uploaded_file_name" not in st.session_state:
     st.session_state["uploaded_file_name"] = None
 # Flag to track if resume is uploaded and processed
@@ -105,9 +440,9 @@ if page == "Upload Resume":
                     cleaned_text = clean_text(resume_text)
                     resume_sections = extract_resume_sections(cleaned_text)
                     
-                    # Save to session state
-                    st.session_state["resume_text"] = cleaned_text
-                    st.session_state["resume_sections"] = resume_sections
+                    # Save to the payload store; session state keeps handles
+                    store_payload("resume_text", cleaned_text)
+                    store_payload("resume_sections", resume_sections)
                     st.session_state["uploaded_file_name"] = uploaded_file.name
                     st.session_state["resume_uploaded"] = True
                     
@@ -122,7 +457,7 @@ if page == "Upload Resume":
         # Display resume preview if text exists
         if st.session_state.get("resume_text"):
             with st.expander("Preview Extracted Resume"):
-                preview_text = st.session_state["resume_text"]
+                preview_text = load_payload("resume_text", "")
                 st.text_area(
                     "Resume Content",
                     value=preview_text[:1000] + "..." if len(preview_text) > 1000 else preview_text,
@@ -138,6 +473,55 @@ if page == "Upload Resume":
     else:
         st.info("Please upload a resume and enter a job description to continue.")
 
+# ---- PAGE 1b: Compare Resumes ----
+elif page == "Compare Resumes":
+    from utils.batch_analysis import iter_batch_results, rank_results
+
+    st.header("Compare Resumes")
+    st.write("Upload several versions of your resume to see which one matches the job description best.")
+
+    uploaded_files = st.file_uploader("Upload Resumes (PDF)", type=["pdf"], accept_multiple_files=True)
+
+    job_description = st.text_area(
+        "Job Description",
+        value=st.session_state.get("job_description", ""),
+        placeholder="Paste the job description here...",
+        height=200
+    )
+    st.session_state["job_description"] = job_description
+
+    if st.button("Compare Resumes", type="primary", disabled=not (uploaded_files and job_description)):
+        files = [(uploaded.name, uploaded.getvalue()) for uploaded in uploaded_files]
+        results = []
+        progress = st.progress(0.0, text=f"Analyzing {len(files)} resumes...")
+
+        # Each card renders as soon as its resume finishes
+        for result in iter_batch_results(files, job_description, get_batch_executor()):
+            results.append(result)
+            display_resume_result(result)
+            progress.progress(len(results) / len(files), text=f"Analyzed {len(results)} of {len(files)} resumes")
+        progress.empty()
+        store_payload("comparison_results", rank_results(results))
+
+    comparison_results = load_payload("comparison_results")
+    if comparison_results:
+        st.subheader("Comparison")
+        display_resume_comparison_table(comparison_results)
+
+        analyzed = [result for result in comparison_results if not result["error"]]
+        if analyzed:
+            chosen_name = st.selectbox("Continue with", [result["name"] for result in analyzed])
+            if st.button("Use This Resume"):
+                chosen = next(result for result in analyzed if result["name"] == chosen_name)
+                store_payload("resume_text", chosen["resume_text"])
+                store_payload("resume_sections", extract_resume_sections(chosen["resume_text"]))
+                st.session_state["uploaded_file_name"] = chosen["name"]
+                st.session_state["resume_uploaded"] = True
+                store_payload("resume_analysis", chosen["resume_analysis"])
+                st.session_state["match_result"] = chosen["match_result"]
+                st.query_params["page"] = "Resume-Job Match"
+                st.rerun()
+
 # ---- PAGE 2: Resume-Job Match ----
 elif page == "Resume-Job Match":
     st.header("Resume and Job Description Match Analysis")
@@ -163,24 +547,24 @@ elif page == "Resume-Job Match":
             st.warning("⚠️ Please enter a job title in the sidebar!")
         
         # Analyze button
-        analyze_button = st.button("Analyze Match", disabled=not (st.session_state.get("job_title") and job_description))
+        analyzing = bool(st.session_state.get("match_job_id"))
+        analyze_button = st.button(
+            "Analyze Match",
+            disabled=analyzing or not (st.session_state.get("job_title") and job_description)
+        )
         
         if analyze_button:
-            with st.spinner("Analyzing your resume against the job description..."):
-                # Perform analysis
-                job_analysis = analyze_job_description(job_description)
-                resume_analysis = analyze_resume(
-                    st.session_state["resume_text"],
-                    st.session_state.get("resume_sections", {})
-                )
-                match_result = calculate_match_score(resume_analysis, job_analysis)
-                
-                # Store results
-                st.session_state["job_analysis"] = job_analysis
-                st.session_state["resume_analysis"] = resume_analysis
-                st.session_state["match_result"] = match_result
-            
-            st.success("✅ Analysis complete!")
+            # Runs in the background; results are picked up on a later rerun
+            submit_job('analyze_match', {
+                'job_description': job_description,
+                'resume_text': load_payload("resume_text")
+            })
+            st.rerun()
+
+        if analyzing:
+            st.info("Analyzing your resume against the job description... You can keep using the app meanwhile.")
+        elif st.session_state.get("analyze_match_error"):
+            st.error(f"Analysis failed: {st.session_state['analyze_match_error']}")
 
         # Display results if available
         if st.session_state.get("match_result"):
@@ -199,11 +583,23 @@ elif page == "Resume-Job Match":
                     match_result.get("missing_keywords", [])
                 )
             
+            # Which analysis stages were recomputed for this result
+            if st.session_state.get("match_stages"):
+                display_pipeline_stages(st.session_state["match_stages"])
+            display_analysis_coverage(match_result.get("nlp_stages", {}))
+
             # Display detailed match information
             display_match_details_expander(match_result)
             
             # Display recommendations
             display_recommendations(match_result, st.session_state.get("job_title", ""))
+
+            # Skill gaps across everyone who analyzed a resume for this role
+            if persistence_queue is not None and st.session_state.get("job_title"):
+                display_skill_gap_panel(
+                    load_top_missing_skills(st.session_state["job_title"]),
+                    st.session_state["job_title"]
+                )
             
             # Navigation buttons
             col1, col2 = st.columns(2)
@@ -232,6 +628,8 @@ elif page == "Generate Questions":
         if st.button("Go to Resume-Job Match"):
             st.query_params["page"] = "Resume-Job Match"
             st.rerun()
+    elif not get_openai_client():
+        st.info("Please check your .env file and ensure the OPENAI_API_KEY is set correctly.")
     else:
         # Display match summary
         col1, col2 = st.columns(2)
@@ -247,28 +645,28 @@ elif page == "Generate Questions":
         st.divider()
         
         # Generate questions button
-        if st.button("Generate Interview Questions", type="primary"):
-            with st.spinner("Generating personalized interview questions..."):
-                questions = generate_interview_questions(
-                    openai_client,
-                    st.session_state.get("job_title", ""),
-                    st.session_state.get("job_description", ""),
-                    st.session_state.get("resume_text", ""),
-                    st.session_state.get("match_result", {})
-                )
-                
-                if questions:
-                    st.session_state["questions"] = questions
-                    st.success("✅ Questions generated successfully!")
-                else:
-                    st.error("Failed to generate questions. Please try again.")
+        generating = bool(st.session_state.get("questions_job_id"))
+        if st.button("Generate Interview Questions", type="primary", disabled=generating):
+            submit_job('generate_questions', {
+                'job_title': st.session_state.get("job_title", ""),
+                'job_description': st.session_state.get("job_description", ""),
+                'resume_text': load_payload("resume_text", "")
+            })
+            st.rerun()
+
+        if generating:
+            st.info("Generating personalized interview questions... You can keep using the app meanwhile.")
+        elif st.session_state.get("generate_questions_error"):
+            st.error(st.session_state["generate_questions_error"])
         
         # Display questions if available
         if st.session_state.get("questions"):
             st.subheader("Your Interview Questions:")
-            for i, question in enumerate(st.session_state["questions"], start=1):
+            for i, question in enumerate(load_payload("questions", []), start=1):
                 question_text = question.lstrip('- *').strip()
                 st.write(f"{i}. {question_text}")
+            if st.session_state.get("questions_stages"):
+                display_pipeline_stages(st.session_state["questions_stages"])
             
             # Navigation
             col1, col2 = st.columns(2)
@@ -306,7 +704,7 @@ elif page == "Interview Session":
         
         # Display questions as expandable sections
         st.subheader("Interview Questions:")
-        for i, question in enumerate(st.session_state["questions"], start=1):
+        for i, question in enumerate(load_payload("questions", []), start=1):
             question_text = question.lstrip('- *').strip()
             
             with st.expander(f"Question {i}: {question_text}"):
@@ -317,9 +715,9 @@ elif page == "Interview Session":
                     placeholder="Type your practice answer here..."
                 )
                 
-                # Tips section
+                # Instant local feedback; cached per answer, so unchanged answers cost nothing on rerun
                 if user_answer:
-                    st.info("💡 Tips: Be concise, use the STAR method for behavioral questions, and provide specific examples.")
+                    display_answer_feedback(score_answer(question_text, user_answer))
         
         # Practice mode section
         st.divider()
@@ -373,4 +771,19 @@ elif page == "Interview Session":
         st.divider()
         if st.button("Back to Questions"):
             st.query_params["page"] = "Generate Questions"
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+# Hand changed state to the background writer; never blocks on the database
+persist_session_state()
+
+# Memory held by this session, for /metrics and the debug sidebar
+session_memory = session_memory_usage(st.session_state)
+memory_tracker.record(st.session_state["session_id"], session_memory, payload_store)
+
+# Cost breakdown of this run, shown with ?debug=1
+if st.query_params.get("debug") == "1":
+    display_timing_sidebar(timing_spans)
+    display_session_memory(session_memory)
+
+# The page is painted; preload what later pages need while the user reads it
+start_warmup()
\ No newline at end of file
@@ -0,0 +1,451 @@
+import json
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from models.database import DATABASE_URL, Base, User, Session, Analysis, Interview, TextBlob, SkillGapAggregate, ParsedDocument
+from utils.data_store import (
+    DEFAULT_BULK_CHUNK_SIZE,
+    IN_CLAUSE_CHUNK_SIZE,
+    SESSION_DEFAULTS,
+    _analysis_row,
+    _analysis_to_dict,
+    _blob_texts_stmt,
+    _build_bulk_rows,
+    _bulk_stats,
+    _chunks,
+    _count_skill_gaps,
+    _decode_blobs,
+    _full_session_stmt,
+    _full_session_to_dict,
+    _insert_blobs_stmt,
+    _interview_row,
+    _interview_to_dict,
+    _parsed_document_row,
+    _parsed_document_stmt,
+    _session_columns,
+    _session_hashes,
+    _session_pks_stmt,
+    _session_to_dict,
+    _skill_gap_rows,
+    _skill_gap_upsert_stmt,
+    _stored_skill_gaps_stmt,
+    _top_missing_skills_stmt,
+    _uncount_skill_gaps,
+    _upsert_parsed_document_stmt,
+    _upsert_session_stmt,
+    skill_gap_period,
+)
+from utils.text_blobs import decompress_text, text_cache
+
+# Async driver used for each backend when DATABASE_URL names a sync one
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+
+def to_async_url(url: str) -> str:
+    """
+    Rewrite a database URL to use an asyncio driver
+
+    Args:
+        url: SQLAlchemy database URL, e.g. ``sqlite:///app.db``
+
+    Returns:
+        str: The same URL with an async driver, e.g. ``sqlite+aiosqlite:///app.db``
+    """
+    parsed = make_url(url)
+    async_driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if async_driver and parsed.drivername not in ASYNC_DRIVERS.values():
+        parsed = parsed.set(drivername=async_driver)
+    return parsed.render_as_string(hide_password=False)
+
+
+# Create async engine and session
+try:
+    async_engine = create_async_engine(to_async_url(DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+except Exception as e:
+    print(f"Failed to create async database engine: {e}")
+    raise
+
+
+async def init_db_async():
+    """Create all tables through the async engine."""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+class AsyncDataStore:
+    """
+    asyncio counterpart of DataStore with the same save/load surface.
+
+    Only the request-path methods are mirrored. The maintenance and export
+    jobs (migrate_text_blobs, rebuild_skill_gap_aggregates, iter_analyses,
+    blob_storage_report) run offline and stay on the sync DataStore.
+
+    Use it as an async context manager so the session is closed even when
+    the caller is cancelled, and schedule writes alongside other awaitables
+    (PDF extraction in a thread, the OpenAI call) with ``asyncio.gather``.
+    """
+
+    def __init__(self):
+        try:
+            self.db: AsyncSession = AsyncSessionLocal()
+        except Exception as e:
+            print(f"Failed to initialize async database connection: {e}")
+            raise
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        try:
+            await self.db.close()
+        except Exception as e:
+            print(f"Error closing database connection: {e}")
+
+    async def _get_session(self, session_id: str):
+        result = await self.db.execute(select(Session).where(Session.session_id == session_id))
+        return result.scalars().first()
+
+    async def save_session(self, session_id: str, data: dict):
+        """Create or update session data in a single upsert."""
+        try:
+            dialect_name = self.db.get_bind().dialect.name
+            columns, blob_rows = _session_columns(data)
+            if blob_rows:
+                await self._insert_blobs(dialect_name, blob_rows)
+
+            stmt = _upsert_session_stmt(dialect_name, session_id, columns)
+            if stmt is None:
+                await self._save_session_fallback(session_id, columns)
+            else:
+                session_pk, user_id = (await self.db.execute(stmt)).one()
+                if user_id is None:
+                    await self._attach_user(session_pk)
+
+            await self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving session: {e}")
+            await self.db.rollback()
+            return False
+
+    async def _attach_user(self, session_pk: int):
+        """Create the owning user for a session inserted without one."""
+        user_id = (await self.db.execute(insert(User).returning(User.id))).scalar_one()
+        await self.db.execute(
+            update(Session).where(Session.id == session_pk).values(user_id=user_id)
+        )
+
+    async def _save_session_fallback(self, session_id: str, columns: dict):
+        """Select-then-write path for dialects without ON CONFLICT support."""
+        db_session = await self._get_session(session_id)
+
+        if not db_session:
+            user = User()
+            self.db.add(user)
+            await self.db.flush()
+
+            db_session = Session(session_id=session_id, user_id=user.id, **dict(SESSION_DEFAULTS, **columns))
+            self.db.add(db_session)
+        else:
+            for column, value in columns.items():
+                setattr(db_session, column, value)
+
+    async def _insert_blobs(self, dialect_name: str, blob_rows):
+        """Store text blobs that are not in the table yet."""
+        stmt = _insert_blobs_stmt(dialect_name, blob_rows)
+        if stmt is not None:
+            await self.db.execute(stmt)
+            return
+
+        existing = set(await self.db.scalars(
+            select(TextBlob.content_hash).where(
+                TextBlob.content_hash.in_([row['content_hash'] for row in blob_rows])
+            )
+        ))
+        missing = [row for row in blob_rows if row['content_hash'] not in existing]
+        if missing:
+            await self.db.execute(insert(TextBlob), missing)
+
+    async def _load_texts(self, content_hashes) -> Dict[str, str]:
+        """Resolve blob hashes to text, fetching only what the cache lacks."""
+        texts = text_cache.get_many(content_hashes)
+        missing = [content_hash for content_hash in content_hashes if content_hash not in texts]
+        for chunk in _chunks(missing, IN_CLAUSE_CHUNK_SIZE):
+            _decode_blobs(await self.db.execute(_blob_texts_stmt(chunk)), texts)
+        return texts
+
+    async def load_session(self, session_id: str):
+        """Load session data from database."""
+        try:
+            db_session = await self._get_session(session_id)
+            if db_session:
+                return _session_to_dict(db_session, await self._load_texts(_session_hashes([db_session])))
+            return None
+        except Exception as e:
+            print(f"Error loading session: {e}")
+            return None
+
+    async def save_analysis(self, session_id: str, analysis_data: dict):
+        """Save resume analysis results."""
+        try:
+            db_session = await self._get_session(session_id)
+            if not db_session:
+                print(f"No session found with id: {session_id}")
+                return False
+
+            row = _analysis_row(db_session.id, analysis_data)
+            self.db.add(Analysis(**row))
+            await self._record_skill_gaps(_count_skill_gaps(
+                [(db_session.job_title, skill_gap_period(), row['missing_keywords'])]
+            ))
+            await self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving analysis: {e}")
+            await self.db.rollback()
+            return False
+
+    async def load_analysis(self, session_id: str):
+        """Load the session's latest resume analysis results."""
+        try:
+            db_session = await self._get_session(session_id)
+            if not db_session:
+                return None
+
+            result = await self.db.execute(
+                select(Analysis).where(Analysis.session_id == db_session.id).order_by(Analysis.id.desc()).limit(1)
+            )
+            analysis = result.scalars().first()
+            if analysis:
+                return _analysis_to_dict(analysis)
+            return None
+        except Exception as e:
+            print(f"Error loading analysis: {e}")
+            return None
+
+    async def save_interview(self, session_id: str, interview_data: dict):
+        """Save interview session data."""
+        try:
+            db_session = await self._get_session(session_id)
+            if not db_session:
+                print(f"No session found with id: {session_id}")
+                return False
+
+            self.db.add(Interview(**_interview_row(db_session.id, interview_data)))
+            await self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving interview: {e}")
+            await self.db.rollback()
+            return False
+
+    async def load_interview(self, session_id: str):
+        """Load the session's latest interview session data."""
+        try:
+            db_session = await self._get_session(session_id)
+            if not db_session:
+                return None
+
+            result = await self.db.execute(
+                select(Interview).where(Interview.session_id == db_session.id).order_by(Interview.id.desc()).limit(1)
+            )
+            interview = result.scalars().first()
+            if interview:
+                return _interview_to_dict(interview)
+            return None
+        except Exception as e:
+            print(f"Error loading interview: {e}")
+            return None
+
+    async def save_parsed_document(self, content_hash: str, parser_version: str, parsed: dict):
+        """Store the parse of a text for one parser version, replacing an older one."""
+        try:
+            row = _parsed_document_row(content_hash, parser_version, parsed)
+            stmt = _upsert_parsed_document_stmt(self.db.get_bind().dialect.name, row)
+            if stmt is not None:
+                await self.db.execute(stmt)
+            else:
+                result = await self.db.execute(select(ParsedDocument).filter_by(
+                    content_hash=content_hash, parser_version=parser_version
+                ))
+                document = result.scalars().first()
+                if document:
+                    document.codec = row['codec']
+                    document.data = row['data']
+                else:
+                    self.db.add(ParsedDocument(**row))
+
+            await self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving parsed document: {e}")
+            await self.db.rollback()
+            return False
+
+    async def load_parsed_document(self, content_hash: str, parser_version: str) -> Optional[dict]:
+        """Load the parse of a text stored for this parser version, if any."""
+        try:
+            result = await self.db.execute(_parsed_document_stmt(content_hash, parser_version))
+            row = result.first()
+            if row:
+                return json.loads(decompress_text(row.codec, row.data))
+            return None
+        except Exception as e:
+            print(f"Error loading parsed document: {e}")
+            return None
+
+    async def _resolve_session_pks(self, session_ids: Iterable[str]) -> Dict[str, int]:
+        """Map public session ids to primary keys, one query per id chunk."""
+        pks = {}
+        unique_ids = list(dict.fromkeys(session_ids))
+        for chunk in _chunks(unique_ids, IN_CLAUSE_CHUNK_SIZE):
+            rows = await self.db.execute(_session_pks_stmt(chunk))
+            pks.update((session_id, pk) for session_id, pk in rows)
+        return pks
+
+    async def _delete_children(self, model, session_pks: List[int], before_delete=None):
+        """Delete the ``model`` rows of ``session_pks`` inside the current transaction."""
+        for chunk in _chunks(session_pks, IN_CLAUSE_CHUNK_SIZE):
+            if before_delete:
+                await before_delete(chunk)
+            await self.db.execute(delete(model).where(model.session_id.in_(chunk)))
+
+    async def _bulk_insert(self, model, results, build_row, chunk_size: int, label: str, after_insert=None,
+                           replace: bool = False, before_delete=None):
+        """Insert child rows for many sessions inside a single transaction; see DataStore._bulk_insert."""
+        start = time.perf_counter()
+        try:
+            results = list(results)
+            pks = await self._resolve_session_pks(session_id for session_id, _ in results)
+            rows, skipped = _build_bulk_rows(results, pks, build_row, label)
+            if replace:
+                rows = list({row['session_id']: row for row in rows}.values())
+                await self._delete_children(model, [row['session_id'] for row in rows], before_delete)
+
+            for chunk in _chunks(rows, max(1, chunk_size)):
+                await self.db.execute(insert(model), chunk)
+            if after_insert and rows:
+                await after_insert(rows)
+
+            await self.db.commit()
+            return _bulk_stats(len(rows), skipped, start)
+        except Exception as e:
+            print(f"Error bulk saving {label}: {e}")
+            await self.db.rollback()
+            return None
+
+    async def save_analyses(self, results: Iterable, chunk_size: int = DEFAULT_BULK_CHUNK_SIZE, replace: bool = False):
+        """
+        Bulk save (session_id, analysis_data) pairs in one transaction.
+
+        With ``replace`` each session's earlier analyses are deleted and their
+        missing skills taken back out of the skill-gap aggregates.
+        """
+        return await self._bulk_insert(Analysis, results, _analysis_row, chunk_size, 'analyses',
+                                       after_insert=self._record_analysis_skill_gaps,
+                                       replace=replace, before_delete=self._forget_analysis_skill_gaps)
+
+    async def _forget_analysis_skill_gaps(self, session_pks: List[int]):
+        """Subtract the stored analyses of these sessions from the skill-gap aggregates."""
+        result = await self.db.execute(_stored_skill_gaps_stmt(session_pks))
+        await self._record_skill_gaps(_uncount_skill_gaps(result))
+
+    async def _record_analysis_skill_gaps(self, rows: List[dict]):
+        """Update skill-gap aggregates for freshly inserted analysis rows."""
+        titles = {}
+        session_pks = list({row['session_id'] for row in rows})
+        for chunk in _chunks(session_pks, IN_CLAUSE_CHUNK_SIZE):
+            rows_for_chunk = await self.db.execute(
+                select(Session.id, Session.job_title).where(Session.id.in_(chunk))
+            )
+            titles.update((pk, job_title) for pk, job_title in rows_for_chunk)
+
+        period = skill_gap_period()
+        await self._record_skill_gaps(_count_skill_gaps(
+            (titles.get(row['session_id']), period, row['missing_keywords']) for row in rows
+        ))
+
+    async def _record_skill_gaps(self, counts: Counter):
+        """Add counts to the aggregate table inside the current transaction."""
+        rows = _skill_gap_rows(counts)
+        if not rows:
+            return
+
+        dialect_name = self.db.get_bind().dialect.name
+        for chunk in _chunks(rows, IN_CLAUSE_CHUNK_SIZE // 4):
+            stmt = _skill_gap_upsert_stmt(dialect_name, chunk)
+            if stmt is not None:
+                await self.db.execute(stmt)
+                continue
+
+            for row in chunk:
+                result = await self.db.execute(select(SkillGapAggregate).filter_by(
+                    job_title=row['job_title'], period=row['period'], skill=row['skill']
+                ))
+                aggregate = result.scalars().first()
+                if aggregate:
+                    aggregate.missing_count += row['missing_count']
+                else:
+                    self.db.add(SkillGapAggregate(**row))
+
+    async def top_missing_skills(self, job_title: str, period: Optional[str] = None, limit: int = 10) -> List[dict]:
+        """Most frequently missing skills for a job title in one period."""
+        try:
+            rows = await self.db.execute(_top_missing_skills_stmt(job_title, period or skill_gap_period(), limit))
+            return [{'skill': skill, 'count': count} for skill, count in rows]
+        except Exception as e:
+            print(f"Error loading skill gaps: {e}")
+            return []
+
+    async def save_interviews(self, results: Iterable, chunk_size: int = DEFAULT_BULK_CHUNK_SIZE,
+                              replace: bool = False):
+        """
+        Bulk save (session_id, interview_data) pairs in one transaction.
+
+        With ``replace`` each session's earlier interviews are deleted first.
+        """
+        return await self._bulk_insert(Interview, results, _interview_row, chunk_size, 'interviews',
+                                       replace=replace)
+
+    async def load_full_session(self, session_id: str):
+        """Load a session with its latest analysis and interview in one query."""
+        try:
+            result = await self.db.execute(
+                _full_session_stmt().where(Session.session_id == session_id)
+            )
+            row = result.first()
+            if row:
+                return _full_session_to_dict(*row, await self._load_texts(_session_hashes([row[0]])))
+            return None
+        except Exception as e:
+            print(f"Error loading full session: {e}")
+            return None
+
+    async def load_full_sessions(self, session_ids: Iterable[str]) -> Dict[str, dict]:
+        """Bulk variant of load_full_session, one joined query per id chunk."""
+        results = {}
+        try:
+            unique_ids = list(dict.fromkeys(session_ids))
+            for chunk in _chunks(unique_ids, IN_CLAUSE_CHUNK_SIZE):
+                result = await self.db.execute(
+                    _full_session_stmt().where(Session.session_id.in_(chunk))
+                )
+                rows = result.all()
+                texts = await self._load_texts(_session_hashes(row[0] for row in rows))
+                for db_session, analysis, interview in rows:
+                    results[db_session.session_id] = _full_session_to_dict(db_session, analysis, interview, texts)
+            return results
+        except Exception as e:
+            print(f"Error loading full sessions: {e}")
+            return results
@@ -0,0 +1,92 @@
+import io
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
+from typing import Iterator, List, Optional, Tuple
+
+from utils.pdf_processor import extract_pdf_text, clean_text
+from utils.pipeline import analysis_pipeline
+
+DEFAULT_BATCH_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+
+def analyze_resume_file(name: str, pdf_bytes: bytes, job_description: str) -> dict:
+    """
+    Extract one resume PDF and score it against a job description
+
+    Args:
+        name: File name, used to label the result
+        pdf_bytes: Raw PDF content
+        job_description: Job description text
+
+    Returns:
+        dict: name, resume_text, match_result, resume_analysis, warnings and
+        error (None on success)
+    """
+    result = {
+        'name': name,
+        'resume_text': None,
+        'match_result': None,
+        'resume_analysis': None,
+        'warnings': [],
+        'error': None
+    }
+    try:
+        text, warnings = extract_pdf_text(io.BytesIO(pdf_bytes))
+        result['warnings'] = warnings
+        if not text:
+            result['error'] = "Failed to extract text from the PDF."
+            return result
+
+        resume_text = clean_text(text)
+        run = analysis_pipeline.run(
+            {'resume_text': resume_text, 'job_description': job_description},
+            targets=['match_result']
+        )
+        result['resume_text'] = resume_text
+        result['match_result'] = run['values']['match_result']
+        result['resume_analysis'] = run['values']['resume_analysis']
+    except Exception as e:
+        print(f"Error analyzing {name}: {str(e)}")
+        result['error'] = str(e)
+    return result
+
+
+def iter_batch_results(files: List[Tuple[str, bytes]],
+                       job_description: str,
+                       executor: Optional[Executor] = None) -> Iterator[dict]:
+    """
+    Analyze several resumes concurrently, yielding each result as it finishes
+
+    Args:
+        files: (file name, PDF bytes) pairs
+        job_description: Job description every resume is scored against
+        executor: Pool to run on; a temporary thread pool is used if omitted
+
+    Yields:
+        dict: Results of analyze_resume_file in completion order
+    """
+    if not files:
+        return
+
+    # Analyze the shared job description once up front so the workers
+    # reuse it from the pipeline cache instead of racing to compute it
+    analysis_pipeline.run({'job_description': job_description}, targets=['job_analysis'])
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=min(DEFAULT_BATCH_WORKERS, len(files)))
+    try:
+        futures = [executor.submit(analyze_resume_file, name, data, job_description) for name, data in files]
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def rank_results(results: List[dict]) -> List[dict]:
+    """Results sorted by overall match score, failures last."""
+    return sorted(
+        results,
+        key=lambda r: (r['match_result'] is None, -(r['match_result'] or {}).get('overall_score', 0), r['name'])
+    )
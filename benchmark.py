@@ -0,0 +1,480 @@
+"""
+Benchmarks for the resume-analysis hot paths.
+
+Generates a synthetic corpus of resumes, job descriptions and multi-page
+PDFs, then measures latency percentiles, throughput and peak memory for
+each pipeline stage. Run it as a module from the directory that contains
+the ``utils`` package:
+
+    python -m utils.benchmark --size medium --output bench.json
+    python -m utils.benchmark --size medium --compare bench.json --threshold 0.15
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+# Corpus presets: words per resume section, skills per document, PDF pages
+CORPUS_SIZES = {
+    'small': {'documents': 10, 'section_words': 60, 'skills': 8, 'pdf_pages': 1},
+    'medium': {'documents': 20, 'section_words': 250, 'skills': 15, 'pdf_pages': 3},
+    'large': {'documents': 20, 'section_words': 1200, 'skills': 30, 'pdf_pages': 10},
+}
+
+SKILL_VOCABULARY = [
+    'python', 'java', 'javascript', 'typescript', 'sql', 'react', 'django', 'flask',
+    'postgresql', 'mongodb', 'redis', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+    'terraform', 'jenkins', 'machine learning', 'deep learning', 'tensorflow', 'pytorch',
+    'pandas', 'numpy', 'scikit-learn', 'rest api', 'microservices', 'git', 'agile',
+    'linux', 'ci/cd', 'graphql', 'spark', 'airflow', 'tableau', 'excel', 'kafka',
+]
+
+FILLER_WORDS = [
+    'designed', 'delivered', 'reliable', 'systems', 'team', 'customers', 'improved',
+    'latency', 'platform', 'data', 'pipelines', 'worked', 'with', 'stakeholders',
+    'to', 'build', 'scalable', 'services', 'and', 'the', 'across', 'reporting',
+    'automated', 'processes', 'reduced', 'costs', 'by', 'percent', 'led', 'projects',
+]
+
+JOB_TITLES = ['Data Scientist', 'Backend Engineer', 'Data Engineer', 'Frontend Developer', 'ML Engineer']
+
+# UI-independent modules that workers and services import
+CORE_MODULES = ('utils.pdf_processor', 'utils.nlp_processor', 'utils.openai_helpers', 'utils.data_store')
+
+# Run in a fresh interpreter so earlier imports don't hide the cost
+IMPORT_PROBE = '''
+import json, resource, sys, time
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    __import__(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules_loaded': len(sys.modules),
+    'streamlit_loaded': 'streamlit' in sys.modules,
+}))
+'''
+
+# Modules that should not be needed to paint the Upload page
+HEAVY_MODULES = ('spacy', 'plotly.graph_objects', 'openai', 'sklearn', 'nltk')
+
+# Runs the app once headless; the harness import is excluded from the timing
+STARTUP_PROBE = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+preloaded = set(sys.modules)
+start = time.perf_counter()
+app.run()
+first = time.perf_counter()
+heavy = [name for name in sys.argv[2:] if name in sys.modules and name not in preloaded]
+app.run()
+second = time.perf_counter()
+print(json.dumps({
+    'first_paint_ms': (first - start) * 1000,
+    'rerun_ms': (second - first) * 1000,
+    'heavy_modules_loaded': heavy,
+    'failed': bool(app.exception),
+}))
+'''
+
+
+def _sentences(rng: random.Random, words: int, skills: List[str]) -> str:
+    """Random filler prose of roughly ``words`` words with skills sprinkled in."""
+    out = []
+    while len(out) < words:
+        sentence = rng.choices(FILLER_WORDS, k=rng.randint(8, 16))
+        if skills and rng.random() < 0.6:
+            sentence.insert(rng.randrange(len(sentence)), rng.choice(skills))
+        out.extend(sentence)
+        out[-1] += '.'
+    return ' '.join(out).capitalize()
+
+
+def generate_resume(rng: random.Random, section_words: int, skill_count: int) -> str:
+    """Synthetic resume with summary, experience, education and skills sections."""
+    skills = rng.sample(SKILL_VOCABULARY, min(skill_count, len(SKILL_VOCABULARY)))
+    start_year = rng.randint(2005, 2018)
+    jobs = []
+    for i in range(3):
+        end = 'Present' if i == 0 else str(start_year + 3 * (3 - i))
+        jobs.append(
+            f"{rng.choice(JOB_TITLES)} - Company {rng.randint(1, 999)}\n"
+            f"January {start_year + 3 * (2 - i)} - {end}\n"
+            f"{_sentences(rng, section_words // 3, skills)}"
+        )
+    return (
+        f"RESUME\n\nSUMMARY\n{_sentences(rng, section_words // 3, skills)}\n\n"
+        f"EXPERIENCE\n" + "\n\n".join(jobs) + "\n\n"
+        f"EDUCATION\nBachelor of Science in Computer Science\nUniversity of Technology - {start_year - 4} to {start_year}\n\n"
+        f"SKILLS\n{', '.join(skills)}\n"
+    )
+
+
+def generate_job_description(rng: random.Random, section_words: int, skill_count: int) -> str:
+    """Synthetic job posting with requirement and responsibility sentences."""
+    skills = rng.sample(SKILL_VOCABULARY, min(skill_count, len(SKILL_VOCABULARY)))
+    requirements = ' '.join(f"Experience with {skill} is required." for skill in skills[:skill_count // 2])
+    responsibilities = ' '.join(
+        f"You will be responsible for {skill} based services." for skill in skills[skill_count // 2:]
+    )
+    return f"{rng.choice(JOB_TITLES)}\n{_sentences(rng, section_words, skills)}\n{requirements}\n{responsibilities}"
+
+
+def generate_pdf(text: str, pages: int) -> bytes:
+    """Spread ``text`` over ``pages`` PDF pages; requires PyMuPDF."""
+    import fitz
+
+    doc = fitz.open()
+    lines = text.splitlines() or ['']
+    per_page = max(1, -(-len(lines) // pages))
+    for page_num in range(pages):
+        page = doc.new_page()
+        chunk = '\n'.join(lines[page_num * per_page:(page_num + 1) * per_page])
+        page.insert_textbox(fitz.Rect(40, 40, 555, 800), chunk, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def generate_corpus(size: str, seed: int = 7) -> Dict[str, list]:
+    """Build the resumes, job descriptions and PDFs for a corpus preset."""
+    params = CORPUS_SIZES[size]
+    rng = random.Random(seed)
+    resumes = [generate_resume(rng, params['section_words'], params['skills']) for _ in range(params['documents'])]
+    job_descriptions = [
+        generate_job_description(rng, params['section_words'], params['skills']) for _ in range(params['documents'])
+    ]
+    try:
+        pdfs = [generate_pdf(resume, params['pdf_pages']) for resume in resumes]
+    except ImportError:
+        print("PyMuPDF not available; skipping PDF extraction benchmark.", file=sys.stderr)
+        pdfs = []
+    return {'resumes': resumes, 'job_descriptions': job_descriptions, 'pdfs': pdfs}
+
+
+def build_stages(corpus: Dict[str, list]) -> Dict[str, tuple]:
+    """
+    Map stage name to (callable taking one input, list of inputs).
+
+    Inputs for later stages are precomputed so every stage is timed alone.
+    """
+    from utils.pdf_processor import extract_text_from_pdf, extract_resume_sections
+    from utils.nlp_processor import (
+        extract_skills, extract_resume_facts, analyze_job_description, analyze_resume, calculate_match_score
+    )
+
+    sections = [extract_resume_sections(resume) for resume in corpus['resumes']]
+    stages = {
+        'extract_resume_sections': (extract_resume_sections, corpus['resumes']),
+        'extract_skills': (extract_skills, corpus['resumes']),
+        'extract_resume_facts': (extract_resume_facts, corpus['resumes']),
+        'analyze_job_description': (analyze_job_description, corpus['job_descriptions']),
+        'analyze_resume': (lambda pair: analyze_resume(*pair), list(zip(corpus['resumes'], sections))),
+    }
+
+    try:
+        with _quiet():
+            resume_analyses = [analyze_resume(r, s) for r, s in zip(corpus['resumes'], sections)]
+            job_analyses = [analyze_job_description(jd) for jd in corpus['job_descriptions']]
+        stages['calculate_match_score'] = (
+            lambda pair: calculate_match_score(*pair), list(zip(resume_analyses, job_analyses))
+        )
+    except Exception as e:
+        print(f"Skipping calculate_match_score: could not prepare inputs ({e!r})", file=sys.stderr)
+    if corpus['pdfs']:
+        stages = {
+            'extract_text_from_pdf': (lambda data: extract_text_from_pdf(io.BytesIO(data)), corpus['pdfs']),
+            **stages
+        }
+    return stages
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Send the pipeline's print() output to /dev/null while measuring."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure_stage(func: Callable, inputs: list, iterations: int, warmup: int = 1) -> dict:
+    """
+    Time ``func`` over ``inputs`` and record peak memory of one pass
+
+    Args:
+        func: Stage callable taking a single input
+        inputs: Inputs to cycle through
+        iterations: Passes over ``inputs`` to time
+        warmup: Untimed passes run first
+
+    Returns:
+        dict: Latency percentiles in milliseconds, throughput and peak memory,
+        or {'error': ...} if the stage raised
+    """
+    try:
+        return _measure_stage(func, inputs, iterations, warmup)
+    except Exception as e:
+        tracemalloc.stop()
+        return {'error': repr(e)}
+
+
+def _measure_stage(func: Callable, inputs: list, iterations: int, warmup: int) -> dict:
+    with _quiet():
+        for _ in range(warmup):
+            for item in inputs:
+                func(item)
+
+        latencies = []
+        total_start = time.perf_counter()
+        for _ in range(iterations):
+            for item in inputs:
+                start = time.perf_counter()
+                func(item)
+                latencies.append((time.perf_counter() - start) * 1000)
+        total = time.perf_counter() - total_start
+
+        # Separate pass: tracemalloc slows allocation-heavy code down
+        tracemalloc.start()
+        for item in inputs:
+            func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'mean_ms': statistics.fmean(latencies) if latencies else 0.0,
+        'p50_ms': _percentile(latencies, 50),
+        'p90_ms': _percentile(latencies, 90),
+        'p99_ms': _percentile(latencies, 99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'throughput_per_sec': len(latencies) / total if total else 0.0,
+        'peak_memory_kb': peak / 1024,
+    }
+
+
+def measure_core_imports(modules=CORE_MODULES, runs: int = 3) -> dict:
+    """
+    Import time and memory of the core modules in a fresh interpreter
+
+    Args:
+        modules: Module names to import
+        runs: Fresh interpreters to start; the fastest run is reported
+
+    Returns:
+        dict: import_ms, max_rss_kb, modules_loaded and streamlit_loaded,
+        or {'error': ...} if the import failed
+    """
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE, *modules],
+            capture_output=True, text=True, env=env
+        )
+        if proc.returncode != 0:
+            return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result['import_ms'] < best['import_ms']:
+            best = result
+    return best
+
+
+def measure_startup(runs: int = 3) -> dict:
+    """
+    First-paint time of the Streamlit app in a fresh interpreter
+
+    The app's first script run (default page) is timed headless with the
+    background warm-up disabled, followed by a rerun in the same process.
+
+    Args:
+        runs: Fresh interpreters to start; the fastest run is reported
+
+    Returns:
+        dict: first_paint_ms, rerun_ms, heavy_modules_loaded (HEAVY_MODULES
+        the first paint imported beyond what the test harness already had)
+        and failed, or {'error': ...}
+    """
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'sk-benchmark')
+    env.pop('DATABASE_URL', None)
+    env['TRAIL_WARMUP'] = '0'
+    best = None
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            env['JOB_QUEUE_PATH'] = os.path.join(tmp, 'jobs.sqlite3')
+            proc = subprocess.run(
+                [sys.executable, '-c', STARTUP_PROBE, app_path, *HEAVY_MODULES],
+                capture_output=True, text=True, env=env
+            )
+        if proc.returncode != 0:
+            return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'app run failed'}
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result['first_paint_ms'] < best['first_paint_ms']:
+            best = result
+    return best
+
+
+def run_benchmarks(size: str, iterations: int, only: List[str] = None, seed: int = 7) -> dict:
+    """Generate a corpus and measure every (or every selected) stage."""
+    corpus = generate_corpus(size, seed)
+    stages = build_stages(corpus)
+    results = {}
+    for name, (func, inputs) in stages.items():
+        if only and name not in only:
+            continue
+        print(f"Benchmarking {name} ({len(inputs)} inputs x {iterations})...", file=sys.stderr)
+        results[name] = measure_stage(func, inputs, iterations)
+
+    print("Measuring core module import cost...", file=sys.stderr)
+    imports = measure_core_imports()
+
+    print("Measuring app first paint...", file=sys.stderr)
+    startup = measure_startup()
+
+    return {
+        'imports': imports,
+        'startup': startup,
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'size': size,
+            'iterations': iterations,
+            'seed': seed,
+            'corpus': CORPUS_SIZES[size],
+        },
+        'stages': results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float,
+                    metrics=('p50_ms', 'p99_ms', 'peak_memory_kb')) -> List[str]:
+    """
+    List regressions of ``current`` against ``baseline``
+
+    Args:
+        current: Result of run_benchmarks
+        baseline: Previously saved result
+        threshold: Allowed relative increase, e.g. 0.1 for 10%
+        metrics: Stage metrics to compare (higher is worse)
+
+    Returns:
+        list: Human-readable description of each regression
+    """
+    regressions = []
+    for stage, stats in current['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if 'error' in stats:
+            regressions.append(f"{stage}: failed with {stats['error']}")
+            continue
+        if not base or 'error' in base:
+            continue
+        for metric in metrics:
+            old, new = base.get(metric, 0.0), stats.get(metric, 0.0)
+            if old > 0 and (new - old) / old > threshold:
+                regressions.append(f"{stage}.{metric}: {old:.3f} -> {new:.3f} (+{(new - old) / old:.0%})")
+
+    imports, base_imports = current.get('imports', {}), baseline.get('imports', {})
+    for metric in ('import_ms', 'max_rss_kb'):
+        old, new = base_imports.get(metric, 0.0), imports.get(metric, 0.0)
+        if old > 0 and (new - old) / old > threshold:
+            regressions.append(f"imports.{metric}: {old:.1f} -> {new:.1f} (+{(new - old) / old:.0%})")
+
+    startup, base_startup = current.get('startup', {}), baseline.get('startup', {})
+    old, new = base_startup.get('first_paint_ms', 0.0), startup.get('first_paint_ms', 0.0)
+    if old > 0 and (new - old) / old > threshold:
+        regressions.append(f"startup.first_paint_ms: {old:.1f} -> {new:.1f} (+{(new - old) / old:.0%})")
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    header = f"{'stage':<26}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak KB':>11}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    for stage, stats in results['stages'].items():
+        if 'error' in stats:
+            print(f"{stage:<26}  failed: {stats['error']}")
+            continue
+        line = (f"{stage:<26}{stats['p50_ms']:>10.3f}{stats['p90_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+                f"{stats['throughput_per_sec']:>10.1f}{stats['peak_memory_kb']:>11.1f}")
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if base and 'error' not in base and base.get('p50_ms'):
+            line += f"{(stats['p50_ms'] - base['p50_ms']) / base['p50_ms']:>+13.1%}"
+        print(line)
+
+    imports = results.get('imports', {})
+    if 'error' in imports:
+        print(f"\ncore imports failed: {imports['error']}")
+    elif imports:
+        print(f"\ncore imports: {imports['import_ms']:.1f} ms, max RSS {imports['max_rss_kb'] / 1024:.1f} MB, "
+              f"{imports['modules_loaded']} modules, streamlit loaded: {imports['streamlit_loaded']}")
+
+    startup = results.get('startup', {})
+    if 'error' in startup:
+        print(f"app startup failed: {startup['error']}")
+    elif startup:
+        heavy = ', '.join(startup['heavy_modules_loaded']) or 'none'
+        print(f"app first paint: {startup['first_paint_ms']:.1f} ms, rerun {startup['rerun_ms']:.1f} ms, "
+              f"heavy modules loaded: {heavy}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume-analysis pipeline stages")
+    parser.add_argument('--size', choices=CORPUS_SIZES, default='medium', help="Corpus preset")
+    parser.add_argument('--iterations', type=int, default=5, help="Timed passes over the corpus")
+    parser.add_argument('--stage', action='append', help="Only run this stage (repeatable)")
+    parser.add_argument('--seed', type=int, default=7, help="Corpus generator seed")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="Relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.size, args.iterations, args.stage, args.seed)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if baseline:
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions above {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,422 @@
 import json
+import time
+from collections import Counter
 from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import select, literal, exists, insert, func, delete
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session as DbSession
-from models.database import SessionLocal, User, Session, Analysis, Interview
+from models.database import SessionLocal, User, Session, Analysis, Interview, TextBlob, SkillGapAggregate, ParsedDocument
+from utils.metrics import timed
+from utils.text_blobs import DEFAULT_CODEC, blob_row, compress_text, decompress_text, text_cache
+
+# Column values for a session created without them
+SESSION_DEFAULTS = {
+    'job_title': '',
+    'job_description': '',
+    'resume_text': '',
+    'job_description_hash': None,
+    'resume_hash': None,
+}
+
+# Long text fields stored in text_blobs, mapped to their hash column
+TEXT_BLOB_FIELDS = {
+    'job_description': 'job_description_hash',
+    'resume_text': 'resume_hash',
+}
+
+# Upper bound on bound parameters per IN (...) list; SQLite caps these
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Rows per executemany batch in the bulk save methods
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip when streaming analyses out
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+
+def _chunks(items: List, size: int):
+    """Yield successive slices of ``items`` with at most ``size`` elements."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _analysis_row(session_pk: int, analysis_data: dict) -> dict:
+    match_result = analysis_data.get('match_result', {})
+    return {
+        'session_id': session_pk,
+        'overall_score': match_result.get('overall_score', 0),
+        'skill_match_score': match_result.get('skill_match_score', 0),
+        'matching_keywords': match_result.get('matching_keywords', []),
+        'missing_keywords': match_result.get('missing_keywords', [])
+    }
+
+
+def _interview_row(session_pk: int, interview_data: dict) -> dict:
+    return {
+        'session_id': session_pk,
+        'questions': interview_data.get('questions', []),
+        'answers': interview_data.get('answers', {}),
+        'feedback': interview_data.get('feedback', {})
+    }
+
+
+def _session_pks_stmt(session_ids: List[str]):
+    return select(Session.session_id, Session.id).where(Session.session_id.in_(session_ids))
+
+
+def _build_bulk_rows(results: List, pks: Dict[str, int], build_row, label: str):
+    """Turn (session_id, data) pairs into column dicts, skipping unknown sessions."""
+    rows = []
+    skipped = 0
+    for session_id, data in results:
+        session_pk = pks.get(session_id)
+        if session_pk is None:
+            skipped += 1
+            continue
+        rows.append(build_row(session_pk, data))
+
+    if skipped:
+        print(f"Skipped {skipped} {label} with unknown session ids")
+    return rows, skipped
+
+
+def _bulk_stats(inserted: int, skipped: int, start: float) -> dict:
+    elapsed = time.perf_counter() - start
+    return {
+        'inserted': inserted,
+        'skipped': skipped,
+        'seconds': elapsed,
+        'rows_per_sec': inserted / elapsed if elapsed else 0.0
+    }
+
+
+def skill_gap_period(when: Optional[datetime] = None) -> str:
+    """Aggregation period ('YYYY-MM') for a timestamp, default now."""
+    return (when or datetime.utcnow()).strftime('%Y-%m')
+
+
+def normalize_job_title(job_title: Optional[str]) -> str:
+    """Key used to group job titles in the skill-gap aggregates."""
+    return ' '.join((job_title or '').lower().split())
+
+
+def _skill_gap_rows(counts: Counter) -> List[dict]:
+    return [
+        {'job_title': job_title, 'period': period, 'skill': skill, 'missing_count': count}
+        for (job_title, period, skill), count in counts.items()
+    ]
+
+
+def _count_skill_gaps(entries, counts: Optional[Counter] = None) -> Counter:
+    """
+    Tally missing skills per (job title, period, skill).
+
+    Args:
+        entries: Iterable of (job_title, period, missing_keywords)
+        counts: Counter to add to; a new one is created if omitted
+    """
+    counts = Counter() if counts is None else counts
+    for job_title, period, missing_keywords in entries:
+        title = normalize_job_title(job_title)
+        if not title:
+            continue
+        for skill in {keyword.lower() for keyword in missing_keywords or []}:
+            counts[(title, period, skill)] += 1
+    return counts
+
+
+def _stored_skill_gaps_stmt(session_pks: List[int]):
+    """Job title, period and missing skills of the stored analyses of these sessions."""
+    return (
+        select(Session.job_title, Analysis.created_at, Analysis.missing_keywords)
+        .join(Session, Session.id == Analysis.session_id)
+        .where(Analysis.session_id.in_(session_pks))
+    )
+
+
+def _uncount_skill_gaps(result) -> Counter:
+    """Negated skill-gap counts of rows from ``_stored_skill_gaps_stmt``."""
+    counts = _count_skill_gaps(
+        (job_title, skill_gap_period(created_at), missing) for job_title, created_at, missing in result
+    )
+    return Counter({key: -count for key, count in counts.items()})
+
+
+def _skill_gap_upsert_stmt(dialect_name: str, rows: List[dict]):
+    """Add ``rows`` onto existing counts, or None without native upsert."""
+    if dialect_name == 'postgresql':
+        dialect_insert = postgresql.insert
+    elif dialect_name == 'sqlite':
+        dialect_insert = sqlite.insert
+    else:
+        return None
+    stmt = dialect_insert(SkillGapAggregate).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[SkillGapAggregate.job_title, SkillGapAggregate.period, SkillGapAggregate.skill],
+        set_={'missing_count': SkillGapAggregate.missing_count + stmt.excluded.missing_count}
+    )
+
+
+def _top_missing_skills_stmt(job_title: str, period: str, limit: int):
+    return (
+        select(SkillGapAggregate.skill, SkillGapAggregate.missing_count)
+        .where(SkillGapAggregate.job_title == normalize_job_title(job_title))
+        .where(SkillGapAggregate.period == period)
+        .where(SkillGapAggregate.missing_count > 0)
+        .order_by(SkillGapAggregate.missing_count.desc(), SkillGapAggregate.skill)
+        .limit(limit)
+    )
+
+
+def _session_columns(data: dict):
+    """
+    Map save_session data to session columns, moving long texts into blobs.
+
+    Non-empty texts are replaced by the hash of their ``text_blobs`` row and
+    the inline column is cleared. Only keys present in ``data`` are returned,
+    so absent fields keep their stored value on update.
+
+    Returns:
+        tuple: (column values, list of TextBlob rows to insert)
+    """
+    columns = {}
+    blobs = {}
+    if 'job_title' in data:
+        columns['job_title'] = data['job_title']
+
+    for field, hash_column in TEXT_BLOB_FIELDS.items():
+        if field not in data:
+            continue
+        text = data[field]
+        if text:
+            row = blob_row(text)
+            blobs[row['content_hash']] = row
+            columns[hash_column] = row['content_hash']
+            columns[field] = None
+            text_cache.put(row['content_hash'], text)
+        else:
+            columns[hash_column] = None
+            columns[field] = text
+
+    return columns, list(blobs.values())
+
+
+def _insert_blobs_stmt(dialect_name: str, blob_rows: List[dict]):
+    """INSERT ... ON CONFLICT DO NOTHING for blobs, or None without native upsert."""
+    if dialect_name == 'postgresql':
+        dialect_insert = postgresql.insert
+    elif dialect_name == 'sqlite':
+        dialect_insert = sqlite.insert
+    else:
+        return None
+    return dialect_insert(TextBlob).values(blob_rows).on_conflict_do_nothing(
+        index_elements=[TextBlob.content_hash]
+    )
+
+
+def _upsert_parsed_document_stmt(dialect_name: str, row: dict):
+    """INSERT ... ON CONFLICT DO UPDATE for a parsed document, or None without native upsert."""
+    if dialect_name == 'postgresql':
+        dialect_insert = postgresql.insert
+    elif dialect_name == 'sqlite':
+        dialect_insert = sqlite.insert
+    else:
+        return None
+    stmt = dialect_insert(ParsedDocument).values(row)
+    return stmt.on_conflict_do_update(
+        index_elements=[ParsedDocument.content_hash, ParsedDocument.parser_version],
+        set_={'codec': stmt.excluded.codec, 'data': stmt.excluded.data, 'updated_at': datetime.utcnow()}
+    )
+
+
+def _parsed_document_row(content_hash: str, parser_version: str, parsed: dict) -> dict:
+    return {
+        'content_hash': content_hash,
+        'parser_version': parser_version,
+        'codec': DEFAULT_CODEC,
+        'data': compress_text(json.dumps(parsed), DEFAULT_CODEC)
+    }
+
+
+def _parsed_document_stmt(content_hash: str, parser_version: str):
+    return select(ParsedDocument.codec, ParsedDocument.data).where(
+        ParsedDocument.content_hash == content_hash,
+        ParsedDocument.parser_version == parser_version
+    )
+
+
+def _blob_texts_stmt(content_hashes: List[str]):
+    return select(TextBlob.content_hash, TextBlob.codec, TextBlob.data).where(
+        TextBlob.content_hash.in_(content_hashes)
+    )
+
+
+def _session_hashes(db_sessions: Iterable[Session]) -> List[str]:
+    hashes = set()
+    for db_session in db_sessions:
+        for hash_column in TEXT_BLOB_FIELDS.values():
+            content_hash = getattr(db_session, hash_column)
+            if content_hash:
+                hashes.add(content_hash)
+    return list(hashes)
+
+
+def _decode_blobs(rows, texts: Dict[str, str]):
+    """Decompress fetched blob rows into ``texts`` and the shared cache."""
+    for content_hash, codec, data in rows:
+        text = decompress_text(codec, data)
+        text_cache.put(content_hash, text)
+        texts[content_hash] = text
+
+
+def _session_to_dict(db_session: Session, texts: Dict[str, str]) -> dict:
+    """Session fields, with blob-backed texts looked up in ``texts`` by hash."""
+    result = {'job_title': db_session.job_title}
+    for field, hash_column in TEXT_BLOB_FIELDS.items():
+        content_hash = getattr(db_session, hash_column)
+        result[field] = texts.get(content_hash) if content_hash else getattr(db_session, field)
+    return result
+
+
+def _analysis_to_dict(analysis: Analysis) -> dict:
+    return {
+        'match_result': {
+            'overall_score': analysis.overall_score,
+            'skill_match_score': analysis.skill_match_score,
+            'matching_keywords': analysis.matching_keywords,
+            'missing_keywords': analysis.missing_keywords
+        }
+    }
+
+
+def _interview_to_dict(interview: Interview) -> dict:
+    return {
+        'questions': interview.questions,
+        'answers': interview.answers,
+        'feedback': interview.feedback
+    }
+
+
+def _full_session_stmt():
+    """
+    Select sessions outer-joined to their latest analysis and interview.
+
+    "Latest" is the child row with the highest primary key, picked by a
+    correlated subquery in the join condition so each session yields at
+    most one row.
+    """
+    latest_analysis = (
+        select(func.max(Analysis.id))
+        .where(Analysis.session_id == Session.id)
+        .correlate(Session)
+        .scalar_subquery()
+    )
+    latest_interview = (
+        select(func.max(Interview.id))
+        .where(Interview.session_id == Session.id)
+        .correlate(Session)
+        .scalar_subquery()
+    )
+    return (
+        select(Session, Analysis, Interview)
+        .outerjoin(Analysis, Analysis.id == latest_analysis)
+        .outerjoin(Interview, Interview.id == latest_interview)
+    )
+
+
+def _full_session_to_dict(db_session: Session, analysis: Optional[Analysis],
+                          interview: Optional[Interview], texts: Dict[str, str]) -> dict:
+    return {
+        'session': _session_to_dict(db_session, texts),
+        'analysis': _analysis_to_dict(analysis) if analysis else None,
+        'interview': _interview_to_dict(interview) if interview else None
+    }
+
+
+def _analysis_export_stmt(since: Optional[datetime] = None,
+                          until: Optional[datetime] = None,
+                          job_title: Optional[str] = None):
+    """
+    Select every analysis joined with its session, oldest first.
+
+    The time range applies to ``analyses.created_at`` and the job title is
+    an exact match on ``sessions.job_title``; both columns are indexed.
+    """
+    stmt = (
+        select(
+            Session.session_id,
+            Session.job_title,
+            Analysis.id.label('analysis_id'),
+            Analysis.created_at,
+            Analysis.overall_score,
+            Analysis.skill_match_score,
+            Analysis.matching_keywords,
+            Analysis.missing_keywords,
+        )
+        .join(Session, Session.id == Analysis.session_id)
+        .order_by(Analysis.created_at, Analysis.id)
+    )
+    if since is not None:
+        stmt = stmt.where(Analysis.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(Analysis.created_at < until)
+    if job_title is not None:
+        stmt = stmt.where(Session.job_title == job_title)
+    return stmt
+
+
+def _upsert_session_stmt(dialect_name: str, session_id: str, columns: dict):
+    """
+    Build an INSERT ... ON CONFLICT statement that creates or updates a session.
+
+    Columns missing from ``columns`` keep their stored value on update. On
+    PostgreSQL the owning user is created in the same statement through a
+    data-modifying CTE, and only when the session does not exist yet. SQLite
+    cannot run an INSERT inside a CTE, so there the user is attached
+    afterwards (see ``DataStore._attach_user``).
+
+    Args:
+        dialect_name: Name of the SQLAlchemy dialect in use
+        session_id: Public session identifier
+        columns: Session column values, as built by ``_session_columns``
+
+    Returns:
+        Statement returning ``(sessions.id, sessions.user_id)``, or None if
+        the dialect has no native upsert
+    """
+    if dialect_name == 'postgresql':
+        dialect_insert = postgresql.insert
+    elif dialect_name == 'sqlite':
+        dialect_insert = sqlite.insert
+    else:
+        return None
+
+    now = datetime.utcnow()
+    values = dict(SESSION_DEFAULTS, **columns)
+    values.update(session_id=session_id, created_at=now, updated_at=now)
+
+    if dialect_name == 'postgresql':
+        new_user = (
+            insert(User)
+            .from_select(
+                ['created_at'],
+                select(literal(now)).where(~exists().where(Session.session_id == session_id))
+            )
+            .returning(User.id)
+            .cte('new_user')
+        )
+        values['user_id'] = select(new_user.c.id).scalar_subquery()
+
+    stmt = dialect_insert(Session).values(**values)
+    updates = {column: stmt.excluded[column] for column in columns}
+    updates['updated_at'] = stmt.excluded.updated_at
+
+    return stmt.on_conflict_do_update(
+        index_elements=[Session.session_id],
+        set_=updates
+    ).returning(Session.id, Session.user_id)
+
 
 class DataStore:
     def __init__(self):
@@ -18,32 +433,22 @@ class DataStore:
             except Exception as e:
                 print(f"Error closing database connection: {e}")
 
+    @timed("db_write")
     def save_session(self, session_id: str, data: dict):
-        """Save session data to database."""
+        """Create or update session data in a single upsert."""
         try:
-            # Create a new user if this is the first session
-            user = User()
-            self.db.add(user)
-            self.db.flush()
-
-            # Check if session exists
-            db_session = self.db.query(Session).filter(Session.session_id == session_id).first()
+            dialect_name = self.db.get_bind().dialect.name
+            columns, blob_rows = _session_columns(data)
+            if blob_rows:
+                self._insert_blobs(dialect_name, blob_rows)
 
-            if not db_session:
-                # Create new session
-                db_session = Session(
-                    session_id=session_id,
-                    user_id=user.id,
-                    job_title=data.get('job_title', ''),
-                    job_description=data.get('job_description', ''),
-                    resume_text=data.get('resume_text', '')
-                )
-                self.db.add(db_session)
+            stmt = _upsert_session_stmt(dialect_name, session_id, columns)
+            if stmt is None:
+                self._save_session_fallback(session_id, columns)
             else:
-                # Update existing session
-                db_session.job_title = data.get('job_title', db_session.job_title)
-                db_session.job_description = data.get('job_description', db_session.job_description)
-                db_session.resume_text = data.get('resume_text', db_session.resume_text)
+                session_pk, user_id = self.db.execute(stmt).one()
+                if user_id is None:
+                    self._attach_user(session_pk)
 
             self.db.commit()
             return True
@@ -52,21 +457,66 @@ class DataStore:
             self.db.rollback()
             return False
 
+    def _attach_user(self, session_pk: int):
+        """Create the owning user for a session inserted without one."""
+        user = User()
+        self.db.add(user)
+        self.db.flush()
+        self.db.query(Session).filter(Session.id == session_pk).update(
+            {Session.user_id: user.id}, synchronize_session=False
+        )
+
+    def _save_session_fallback(self, session_id: str, columns: dict):
+        """Select-then-write path for dialects without ON CONFLICT support."""
+        db_session = self.db.query(Session).filter(Session.session_id == session_id).first()
+
+        if not db_session:
+            user = User()
+            self.db.add(user)
+            self.db.flush()
+
+            db_session = Session(session_id=session_id, user_id=user.id, **dict(SESSION_DEFAULTS, **columns))
+            self.db.add(db_session)
+        else:
+            for column, value in columns.items():
+                setattr(db_session, column, value)
+
+    def _insert_blobs(self, dialect_name: str, blob_rows: List[dict]):
+        """Store text blobs that are not in the table yet."""
+        stmt = _insert_blobs_stmt(dialect_name, blob_rows)
+        if stmt is not None:
+            self.db.execute(stmt)
+            return
+
+        existing = set(self.db.scalars(
+            select(TextBlob.content_hash).where(
+                TextBlob.content_hash.in_([row['content_hash'] for row in blob_rows])
+            )
+        ))
+        missing = [row for row in blob_rows if row['content_hash'] not in existing]
+        if missing:
+            self.db.execute(insert(TextBlob), missing)
+
+    def _load_texts(self, content_hashes: List[str]) -> Dict[str, str]:
+        """Resolve blob hashes to text, fetching only what the cache lacks."""
+        texts = text_cache.get_many(content_hashes)
+        missing = [content_hash for content_hash in content_hashes if content_hash not in texts]
+        for chunk in _chunks(missing, IN_CLAUSE_CHUNK_SIZE):
+            _decode_blobs(self.db.execute(_blob_texts_stmt(chunk)), texts)
+        return texts
+
     def load_session(self, session_id: str):
         """Load session data from database."""
         try:
             db_session = self.db.query(Session).filter(Session.session_id == session_id).first()
             if db_session:
-                return {
-                    'job_title': db_session.job_title,
-                    'job_description': db_session.job_description,
-                    'resume_text': db_session.resume_text
-                }
+                return _session_to_dict(db_session, self._load_texts(_session_hashes([db_session])))
             return None
         except Exception as e:
             print(f"Error loading session: {e}")
             return None
 
+    @timed("db_write")
     def save_analysis(self, session_id: str, analysis_data: dict):
         """Save resume analysis results."""
         try:
@@ -77,15 +527,11 @@ class DataStore:
                 return False
 
             # Create analysis
-            analysis = Analysis(
-                session_id=db_session.id,
-                overall_score=analysis_data.get('match_result', {}).get('overall_score', 0),
-                skill_match_score=analysis_data.get('match_result', {}).get('skill_match_score', 0),
-                matching_keywords=json.dumps(analysis_data.get('match_result', {}).get('matching_keywords', [])),
-                missing_keywords=json.dumps(analysis_data.get('match_result', {}).get('missing_keywords', []))
-            )
-
-            self.db.add(analysis)
+            row = _analysis_row(db_session.id, analysis_data)
+            self.db.add(Analysis(**row))
+            self._record_skill_gaps(_count_skill_gaps(
+                [(db_session.job_title, skill_gap_period(), row['missing_keywords'])]
+            ))
             self.db.commit()
             return True
         except Exception as e:
@@ -94,27 +540,24 @@ class DataStore:
             return False
 
     def load_analysis(self, session_id: str):
-        """Load resume analysis results."""
+        """Load the session's latest resume analysis results."""
         try:
             db_session = self.db.query(Session).filter(Session.session_id == session_id).first()
             if not db_session:
                 return None
 
-            analysis = self.db.query(Analysis).filter(Analysis.session_id == db_session.id).first()
+            analysis = (
+                self.db.query(Analysis).filter(Analysis.session_id == db_session.id)
+                .order_by(Analysis.id.desc()).first()
+            )
             if analysis:
-                return {
-                    'match_result': {
-                        'overall_score': analysis.overall_score,
-                        'skill_match_score': analysis.skill_match_score,
-                        'matching_keywords': json.loads(analysis.matching_keywords),
-                        'missing_keywords': json.loads(analysis.missing_keywords)
-                    }
-                }
+                return _analysis_to_dict(analysis)
             return None
         except Exception as e:
             print(f"Error loading analysis: {e}")
             return None
 
+    @timed("db_write")
     def save_interview(self, session_id: str, interview_data: dict):
         """Save interview session data."""
         try:
@@ -123,12 +566,7 @@ class DataStore:
                 print(f"No session found with id: {session_id}")
                 return False
 
-            interview = Interview(
-                session_id=db_session.id,
-                questions=json.dumps(interview_data.get('questions', [])),
-                answers=json.dumps(interview_data.get('answers', {})),
-                feedback=json.dumps(interview_data.get('feedback', {}))
-            )
+            interview = Interview(**_interview_row(db_session.id, interview_data))
 
             self.db.add(interview)
             self.db.commit()
@@ -139,20 +577,361 @@ class DataStore:
             return False
 
     def load_interview(self, session_id: str):
-        """Load interview session data."""
+        """Load the session's latest interview session data."""
         try:
             db_session = self.db.query(Session).filter(Session.session_id == session_id).first()
             if not db_session:
                 return None
 
-            interview = self.db.query(Interview).filter(Interview.session_id == db_session.id).first()
+            interview = (
+                self.db.query(Interview).filter(Interview.session_id == db_session.id)
+                .order_by(Interview.id.desc()).first()
+            )
             if interview:
-                return {
-                    'questions': json.loads(interview.questions),
-                    'answers': json.loads(interview.answers),
-                    'feedback': json.loads(interview.feedback)
-                }
+                return _interview_to_dict(interview)
             return None
         except Exception as e:
             print(f"Error loading interview: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    @timed("db_write")
+    def save_parsed_document(self, content_hash: str, parser_version: str, parsed: dict):
+        """Store the parse of a text for one parser version, replacing an older one."""
+        try:
+            row = _parsed_document_row(content_hash, parser_version, parsed)
+            stmt = _upsert_parsed_document_stmt(self.db.get_bind().dialect.name, row)
+            if stmt is not None:
+                self.db.execute(stmt)
+            else:
+                document = self.db.query(ParsedDocument).filter_by(
+                    content_hash=content_hash, parser_version=parser_version
+                ).first()
+                if document:
+                    document.codec = row['codec']
+                    document.data = row['data']
+                else:
+                    self.db.add(ParsedDocument(**row))
+
+            self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error saving parsed document: {e}")
+            self.db.rollback()
+            return False
+
+    def load_parsed_document(self, content_hash: str, parser_version: str) -> Optional[dict]:
+        """Load the parse of a text stored for this parser version, if any."""
+        try:
+            row = self.db.execute(_parsed_document_stmt(content_hash, parser_version)).first()
+            if row:
+                return json.loads(decompress_text(row.codec, row.data))
+            return None
+        except Exception as e:
+            print(f"Error loading parsed document: {e}")
+            return None
+
+    def _resolve_session_pks(self, session_ids: Iterable[str]) -> Dict[str, int]:
+        """Map public session ids to primary keys, one query per id chunk."""
+        pks = {}
+        unique_ids = list(dict.fromkeys(session_ids))
+        for chunk in _chunks(unique_ids, IN_CLAUSE_CHUNK_SIZE):
+            rows = self.db.execute(_session_pks_stmt(chunk))
+            pks.update((session_id, pk) for session_id, pk in rows)
+        return pks
+
+    def _delete_children(self, model, session_pks: List[int], before_delete=None):
+        """Delete the ``model`` rows of ``session_pks`` inside the current transaction."""
+        for chunk in _chunks(session_pks, IN_CLAUSE_CHUNK_SIZE):
+            if before_delete:
+                before_delete(chunk)
+            self.db.execute(delete(model).where(model.session_id.in_(chunk)))
+
+    @timed("db_write")
+    def _bulk_insert(self, model, results, build_row, chunk_size: int, label: str, after_insert=None,
+                     replace: bool = False, before_delete=None):
+        """
+        Insert child rows for many sessions inside a single transaction.
+
+        Args:
+            model: Mapped class to insert into
+            results: Sequence of (session_id, data) pairs
+            build_row: Function turning (session_pk, data) into a column dict
+            chunk_size: Rows per executemany batch
+            label: Name used in log messages
+            after_insert: Optional callable given the inserted rows, run
+                before the commit
+            replace: Delete the sessions' existing rows first, so each
+                session keeps only its last row from ``results``
+            before_delete: Optional callable given a chunk of session
+                primary keys whose rows are about to be replaced
+
+        Returns:
+            dict with inserted/skipped row counts, elapsed seconds and
+            rows_per_sec, or None if the transaction was rolled back
+        """
+        start = time.perf_counter()
+        try:
+            results = list(results)
+            pks = self._resolve_session_pks(session_id for session_id, _ in results)
+
+            rows, skipped = _build_bulk_rows(results, pks, build_row, label)
+            if replace:
+                rows = list({row['session_id']: row for row in rows}.values())
+                self._delete_children(model, [row['session_id'] for row in rows], before_delete)
+
+            for chunk in _chunks(rows, max(1, chunk_size)):
+                self.db.execute(insert(model), chunk)
+            if after_insert and rows:
+                after_insert(rows)
+
+            self.db.commit()
+            return _bulk_stats(len(rows), skipped, start)
+        except Exception as e:
+            print(f"Error bulk saving {label}: {e}")
+            self.db.rollback()
+            return None
+
+    def save_analyses(self, results: Iterable, chunk_size: int = DEFAULT_BULK_CHUNK_SIZE, replace: bool = False):
+        """
+        Bulk save (session_id, analysis_data) pairs in one transaction.
+
+        With ``replace`` each session's earlier analyses are deleted and their
+        missing skills taken back out of the skill-gap aggregates.
+        """
+        return self._bulk_insert(Analysis, results, _analysis_row, chunk_size, 'analyses',
+                                 after_insert=self._record_analysis_skill_gaps,
+                                 replace=replace, before_delete=self._forget_analysis_skill_gaps)
+
+    def _forget_analysis_skill_gaps(self, session_pks: List[int]):
+        """Subtract the stored analyses of these sessions from the skill-gap aggregates."""
+        self._record_skill_gaps(_uncount_skill_gaps(self.db.execute(_stored_skill_gaps_stmt(session_pks))))
+
+    def _record_analysis_skill_gaps(self, rows: List[dict]):
+        """Update skill-gap aggregates for freshly inserted analysis rows."""
+        titles = {}
+        session_pks = list({row['session_id'] for row in rows})
+        for chunk in _chunks(session_pks, IN_CLAUSE_CHUNK_SIZE):
+            rows_for_chunk = self.db.execute(
+                select(Session.id, Session.job_title).where(Session.id.in_(chunk))
+            )
+            titles.update((pk, job_title) for pk, job_title in rows_for_chunk)
+
+        period = skill_gap_period()
+        self._record_skill_gaps(_count_skill_gaps(
+            (titles.get(row['session_id']), period, row['missing_keywords']) for row in rows
+        ))
+
+    def _record_skill_gaps(self, counts: Counter):
+        """Add counts to the aggregate table inside the current transaction."""
+        rows = _skill_gap_rows(counts)
+        if not rows:
+            return
+
+        dialect_name = self.db.get_bind().dialect.name
+        for chunk in _chunks(rows, IN_CLAUSE_CHUNK_SIZE // 4):
+            stmt = _skill_gap_upsert_stmt(dialect_name, chunk)
+            if stmt is not None:
+                self.db.execute(stmt)
+                continue
+
+            for row in chunk:
+                aggregate = self.db.query(SkillGapAggregate).filter_by(
+                    job_title=row['job_title'], period=row['period'], skill=row['skill']
+                ).first()
+                if aggregate:
+                    aggregate.missing_count += row['missing_count']
+                else:
+                    self.db.add(SkillGapAggregate(**row))
+
+    def top_missing_skills(self, job_title: str, period: Optional[str] = None, limit: int = 10) -> List[dict]:
+        """
+        Most frequently missing skills for a job title in one period.
+
+        Args:
+            job_title: Job title; matched case- and whitespace-insensitively
+            period: 'YYYY-MM', defaults to the current month
+            limit: Maximum number of skills to return
+
+        Returns:
+            list of {'skill', 'count'} dicts, most missing first
+        """
+        try:
+            rows = self.db.execute(_top_missing_skills_stmt(job_title, period or skill_gap_period(), limit))
+            return [{'skill': skill, 'count': count} for skill, count in rows]
+        except Exception as e:
+            print(f"Error loading skill gaps: {e}")
+            return []
+
+    def rebuild_skill_gap_aggregates(self, batch_size: int = DEFAULT_EXPORT_BATCH_SIZE) -> bool:
+        """Recompute the skill-gap aggregates from every stored analysis."""
+        try:
+            counts = Counter()
+            result = self.db.execute(
+                select(Session.job_title, Analysis.created_at, Analysis.missing_keywords)
+                .join(Session, Session.id == Analysis.session_id)
+                .execution_options(yield_per=batch_size)
+            )
+            _count_skill_gaps(
+                ((job_title, skill_gap_period(created_at), missing) for job_title, created_at, missing in result),
+                counts
+            )
+
+            self.db.execute(delete(SkillGapAggregate))
+            self._record_skill_gaps(counts)
+            self.db.commit()
+            return True
+        except Exception as e:
+            print(f"Error rebuilding skill gaps: {e}")
+            self.db.rollback()
+            return False
+
+    def save_interviews(self, results: Iterable, chunk_size: int = DEFAULT_BULK_CHUNK_SIZE, replace: bool = False):
+        """
+        Bulk save (session_id, interview_data) pairs in one transaction.
+
+        With ``replace`` each session's earlier interviews are deleted first.
+        """
+        return self._bulk_insert(Interview, results, _interview_row, chunk_size, 'interviews', replace=replace)
+
+    def load_full_session(self, session_id: str):
+        """Load a session with its latest analysis and interview in one query."""
+        try:
+            row = self.db.execute(
+                _full_session_stmt().where(Session.session_id == session_id)
+            ).first()
+            if row:
+                return _full_session_to_dict(*row, self._load_texts(_session_hashes([row[0]])))
+            return None
+        except Exception as e:
+            print(f"Error loading full session: {e}")
+            return None
+
+    def load_full_sessions(self, session_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Bulk variant of load_full_session.
+
+        Issues one joined query per IN_CLAUSE_CHUNK_SIZE ids rather than one
+        query per session. Unknown ids are absent from the result.
+        """
+        results = {}
+        try:
+            unique_ids = list(dict.fromkeys(session_ids))
+            for chunk in _chunks(unique_ids, IN_CLAUSE_CHUNK_SIZE):
+                rows = self.db.execute(
+                    _full_session_stmt().where(Session.session_id.in_(chunk))
+                ).all()
+                texts = self._load_texts(_session_hashes(row[0] for row in rows))
+                for db_session, analysis, interview in rows:
+                    results[db_session.session_id] = _full_session_to_dict(db_session, analysis, interview, texts)
+            return results
+        except Exception as e:
+            print(f"Error loading full sessions: {e}")
+            return results
+
+    def iter_analyses(self,
+                      since: Optional[datetime] = None,
+                      until: Optional[datetime] = None,
+                      job_title: Optional[str] = None,
+                      batch_size: int = DEFAULT_EXPORT_BATCH_SIZE) -> Iterator[dict]:
+        """
+        Stream analyses joined with their sessions.
+
+        Rows come from a server-side cursor ``batch_size`` at a time, so
+        memory use does not grow with the number of rows. Don't issue other
+        queries on this DataStore until the iterator is exhausted.
+
+        Args:
+            since: Only analyses created at or after this time
+            until: Only analyses created before this time
+            job_title: Only sessions with exactly this job title
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            dict per analysis
+        """
+        result = self.db.execute(
+            _analysis_export_stmt(since, until, job_title)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            result.close()
+
+    def migrate_text_blobs(self, batch_size: int = 500) -> int:
+        """
+        Move inline resume/job description text of older sessions into text_blobs.
+
+        Safe to run repeatedly; each batch is committed on its own.
+
+        Returns:
+            int: Number of sessions migrated
+        """
+        migrated = 0
+        dialect_name = self.db.get_bind().dialect.name
+        pending = (
+            ((Session.resume_text != '') & Session.resume_hash.is_(None))
+            | ((Session.job_description != '') & Session.job_description_hash.is_(None))
+        )
+        try:
+            while True:
+                batch = self.db.query(Session).filter(pending).limit(batch_size).all()
+                if not batch:
+                    return migrated
+
+                for db_session in batch:
+                    columns, blob_rows = _session_columns({
+                        field: getattr(db_session, field)
+                        for field, hash_column in TEXT_BLOB_FIELDS.items()
+                        if getattr(db_session, field) and not getattr(db_session, hash_column)
+                    })
+                    self._insert_blobs(dialect_name, blob_rows)
+                    for column, value in columns.items():
+                        setattr(db_session, column, value)
+
+                self.db.commit()
+                migrated += len(batch)
+        except Exception as e:
+            print(f"Error migrating session text to blobs: {e}")
+            self.db.rollback()
+            return migrated
+
+    def blob_storage_report(self) -> dict:
+        """
+        Summarize how much space content-addressed text storage saves.
+
+        Returns:
+            dict with the bytes the texts would take stored inline on every
+            session (logical_bytes), the bytes actually stored (stored_bytes)
+            and the dedup, compression and overall ratios
+        """
+        sessions = self.db.scalar(select(func.count()).select_from(Session)) or 0
+        blobs, unique_raw, blob_stored = self.db.execute(
+            select(func.count(), func.coalesce(func.sum(TextBlob.raw_size), 0),
+                   func.coalesce(func.sum(TextBlob.stored_size), 0))
+        ).one()
+
+        referenced_raw = 0
+        inline_bytes = 0
+        for field, hash_column in TEXT_BLOB_FIELDS.items():
+            referenced_raw += self.db.scalar(
+                select(func.coalesce(func.sum(TextBlob.raw_size), 0))
+                .select_from(Session)
+                .join(TextBlob, TextBlob.content_hash == getattr(Session, hash_column))
+            )
+            inline_bytes += self.db.scalar(
+                select(func.coalesce(func.sum(func.length(getattr(Session, field))), 0))
+            )
+
+        logical_bytes = referenced_raw + inline_bytes
+        stored_bytes = blob_stored + inline_bytes
+        return {
+            'sessions': sessions,
+            'blobs': blobs,
+            'logical_bytes': logical_bytes,
+            'stored_bytes': stored_bytes,
+            'dedup_ratio': referenced_raw / unique_raw if unique_raw else 1.0,
+            'compression_ratio': unique_raw / blob_stored if blob_stored else 1.0,
+            'savings_ratio': logical_bytes / stored_bytes if stored_bytes else 1.0,
+        }
@@ -1,5 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey
-from sqlalchemy import text
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Index, LargeBinary
+from sqlalchemy import UniqueConstraint
+from sqlalchemy import text, inspect
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 import os
@@ -20,6 +22,9 @@ except Exception as e:
 
 Base = declarative_base()
 
+# Native JSON column; JSONB on PostgreSQL so keyword lists can be GIN indexed
+JsonType = JSON().with_variant(JSONB(), 'postgresql')
+
 
 class User(Base):
     __tablename__ = "users"
@@ -29,16 +34,47 @@ class User(Base):
     sessions = relationship("Session", back_populates="user")
 
 
+class TextBlob(Base):
+    """Compressed text stored once per distinct content."""
+    __tablename__ = "text_blobs"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex of the raw text
+    codec = Column(String(8), nullable=False)  # 'zlib' or 'zstd'
+    data = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ParsedDocument(Base):
+    """Parse and analysis of a resume, stored once per text and parser version."""
+    __tablename__ = "parsed_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 hex of the resume text, as in text_blobs
+    parser_version = Column(String(16), nullable=False)  # nlp_processor.parser_version()
+    codec = Column(String(8), nullable=False)  # 'zlib' or 'zstd'
+    data = Column(LargeBinary, nullable=False)  # Compressed JSON built by utils.parsed_resumes
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('content_hash', 'parser_version', name='uq_parsed_documents_hash_version'),
+    )
+
+
 class Session(Base):
     __tablename__ = "sessions"
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String, unique=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    job_title = Column(String)
-    job_description = Column(Text)
-    resume_text = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    job_title = Column(String, index=True)
+    job_description = Column(Text)  # Inline copy, only for rows predating text_blobs
+    resume_text = Column(Text)  # Inline copy, only for rows predating text_blobs
+    job_description_hash = Column(String(64), ForeignKey("text_blobs.content_hash"), index=True)
+    resume_hash = Column(String(64), ForeignKey("text_blobs.content_hash"), index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime,
                         default=datetime.utcnow,
                         onupdate=datetime.utcnow)
@@ -52,29 +88,106 @@ class Analysis(Base):
     __tablename__ = "analyses"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("sessions.id"))
+    session_id = Column(Integer, ForeignKey("sessions.id"), index=True)
     overall_score = Column(Float)
     skill_match_score = Column(Float)
-    matching_keywords = Column(Text)  # Stored as JSON string
-    missing_keywords = Column(Text)  # Stored as JSON string
-    created_at = Column(DateTime, default=datetime.utcnow)
+    matching_keywords = Column(JsonType)
+    missing_keywords = Column(JsonType)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     session = relationship("Session", back_populates="analysis")
 
+    __table_args__ = (
+        Index('ix_analyses_matching_keywords_gin', 'matching_keywords',
+              postgresql_using='gin').ddl_if(dialect='postgresql'),
+        Index('ix_analyses_missing_keywords_gin', 'missing_keywords',
+              postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
 
 class Interview(Base):
     __tablename__ = "interviews"
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("sessions.id"))
-    questions = Column(Text)  # Stored as JSON string
-    answers = Column(Text)  # Stored as JSON string
-    feedback = Column(Text)  # Stored as JSON string
-    created_at = Column(DateTime, default=datetime.utcnow)
+    session_id = Column(Integer, ForeignKey("sessions.id"), index=True)
+    questions = Column(JsonType)
+    answers = Column(JsonType)
+    feedback = Column(JsonType)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     session = relationship("Session", back_populates="interview")
 
 
+class SkillGapAggregate(Base):
+    """Running count of analyses missing a skill, per job title and month."""
+    __tablename__ = "skill_gap_aggregates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_title = Column(String, nullable=False)  # Lowercased, whitespace-collapsed
+    period = Column(String(7), nullable=False)  # 'YYYY-MM' of the analysis
+    skill = Column(String, nullable=False)
+    missing_count = Column(Integer, nullable=False, default=0)
+
+    # Leading (job_title, period) columns serve the top-skills lookup
+    __table_args__ = (
+        UniqueConstraint('job_title', 'period', 'skill', name='uq_skill_gap_title_period_skill'),
+    )
+
+
+# Columns that held json.dumps() output in Text columns before the JSON revision
+JSON_COLUMNS = {
+    'analyses': ('matching_keywords', 'missing_keywords'),
+    'interviews': ('questions', 'answers', 'feedback'),
+}
+
+# Columns added to existing tables after their first release
+ADDED_COLUMNS = {
+    'sessions': ('job_description_hash', 'resume_hash'),
+}
+
+
+def migrate_db():
+    """
+    Bring an existing database up to the current schema revision.
+
+    Safe to run repeatedly. On PostgreSQL the former Text JSON columns are
+    converted in place to JSONB (existing rows are cast with ``::jsonb``).
+    On SQLite the JSON type shares TEXT storage, so existing rows already
+    decode without a rewrite. Columns listed in ADDED_COLUMNS are added when
+    missing. Missing indexes, including the PostgreSQL-only GIN indexes, are
+    created on every backend.
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table_name, column_names in ADDED_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            existing = {col['name'] for col in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+            for column_name in column_names:
+                if column_name not in existing:
+                    column_type = table.c[column_name].type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+
+    if engine.dialect.name == 'postgresql':
+        with engine.begin() as conn:
+            for table_name, column_names in JSON_COLUMNS.items():
+                if not inspector.has_table(table_name):
+                    continue
+                column_types = {col['name']: col['type'] for col in inspector.get_columns(table_name)}
+                for column_name in column_names:
+                    if isinstance(column_types.get(column_name), Text):
+                        conn.execute(text(
+                            f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                            f"TYPE JSONB USING {column_name}::jsonb"
+                        ))
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def init_db():
     """Initialize database with proper error handling."""
     try:
@@ -88,6 +201,9 @@ def init_db():
 
         # Create all tables
         Base.metadata.create_all(bind=engine)
+
+        # Upgrade tables created by earlier schema revisions
+        migrate_db()
         print("✅ Database initialization successful.")
         return True
     except Exception as e:
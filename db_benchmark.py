@@ -0,0 +1,186 @@
+"""
+Micro-benchmarks for the DataStore persistence paths.
+
+Runs against DATABASE_URL when it is set, otherwise against a throwaway
+SQLite file. Run it as a module from the directory that contains the
+``utils`` package:
+
+    python -m utils.db_benchmark --saves 2000 --sessions 200 --bulk-rows 20000 --distinct-resumes 20
+"""
+import argparse
+import os
+import tempfile
+import time
+
+if not os.getenv('DATABASE_URL'):
+    _db_dir = tempfile.mkdtemp(prefix='trail-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from models.database import Base, engine, init_db, User, Session
+from utils.data_store import DataStore
+from utils.text_blobs import text_cache
+
+
+def _legacy_save_session(store: DataStore, session_id: str, data: dict) -> bool:
+    """The original save_session: new user, SELECT, then INSERT/UPDATE."""
+    try:
+        user = User()
+        store.db.add(user)
+        store.db.flush()
+
+        db_session = store.db.query(Session).filter(Session.session_id == session_id).first()
+        if not db_session:
+            db_session = Session(
+                session_id=session_id,
+                user_id=user.id,
+                job_title=data.get('job_title', ''),
+                job_description=data.get('job_description', ''),
+                resume_text=data.get('resume_text', '')
+            )
+            store.db.add(db_session)
+        else:
+            db_session.job_title = data.get('job_title', db_session.job_title)
+            db_session.job_description = data.get('job_description', db_session.job_description)
+            db_session.resume_text = data.get('resume_text', db_session.resume_text)
+
+        store.db.commit()
+        return True
+    except Exception as e:
+        print(f"Error saving session: {e}")
+        store.db.rollback()
+        return False
+
+
+def _reset_tables():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def _count_users(store: DataStore) -> int:
+    return store.db.query(User).count()
+
+
+def bench_save_session(saves: int, sessions: int) -> dict:
+    """Compare saves/sec of the legacy and upsert save_session paths."""
+    payload = {
+        'job_title': 'Senior Data Scientist',
+        'job_description': 'Python, SQL and machine learning. ' * 40,
+        'resume_text': 'Data scientist with Python and PostgreSQL. ' * 80
+    }
+    results = {}
+
+    for label, save in (('legacy', _legacy_save_session),
+                        ('upsert', lambda store, sid, data: store.save_session(sid, data))):
+        _reset_tables()
+        store = DataStore()
+
+        start = time.perf_counter()
+        for i in range(saves):
+            save(store, f"bench-{i % sessions}", payload)
+        elapsed = time.perf_counter() - start
+
+        results[label] = {
+            'saves_per_sec': saves / elapsed if elapsed else 0.0,
+            'users': _count_users(store)
+        }
+        store.db.close()
+
+    return results
+
+
+def bench_bulk_analyses(rows: int, sessions: int, chunk_size: int) -> dict:
+    """Compare rows/sec of per-row save_analysis against save_analyses."""
+    _reset_tables()
+    store = DataStore()
+    for i in range(sessions):
+        store.save_session(f"bench-{i}", {'job_title': 'Data Scientist'})
+
+    analysis = {
+        'match_result': {
+            'overall_score': 0.62,
+            'skill_match_score': 0.62,
+            'matching_keywords': ['python', 'sql', 'pandas', 'machine learning'],
+            'missing_keywords': ['kubernetes', 'spark', 'airflow']
+        }
+    }
+    batch = [(f"bench-{i % sessions}", analysis) for i in range(rows)]
+
+    # Per-row commits are slow enough that a slice is representative
+    single_rows = min(rows, 1000)
+    start = time.perf_counter()
+    for session_id, data in batch[:single_rows]:
+        store.save_analysis(session_id, data)
+    single_elapsed = time.perf_counter() - start
+
+    stats = store.save_analyses(batch, chunk_size=chunk_size)
+    store.db.close()
+
+    return {
+        'single': {'rows_per_sec': single_rows / single_elapsed if single_elapsed else 0.0},
+        'bulk': stats or {'rows_per_sec': 0.0}
+    }
+
+
+def bench_text_blobs(sessions: int, distinct_resumes: int) -> dict:
+    """Store many sessions sharing a few resumes and report blob savings."""
+    _reset_tables()
+    store = DataStore()
+    resumes = [
+        f"Candidate {n}\nEXPERIENCE\n" + "Built Python and SQL data pipelines on AWS. " * 120
+        for n in range(distinct_resumes)
+    ]
+    job_description = "We need Python, SQL, Spark and Kubernetes experience. " * 40
+
+    for i in range(sessions):
+        store.save_session(f"bench-{i}", {
+            'job_title': 'Data Engineer',
+            'job_description': job_description,
+            'resume_text': resumes[i % distinct_resumes]
+        })
+
+    session_ids = [f"bench-{i}" for i in range(sessions)]
+    text_cache._entries.clear()
+    start = time.perf_counter()
+    store.load_full_sessions(session_ids)
+    load_elapsed = time.perf_counter() - start
+
+    report = store.blob_storage_report()
+    report['loads_per_sec'] = sessions / load_elapsed if load_elapsed else 0.0
+    store.db.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataStore persistence paths")
+    parser.add_argument('--saves', type=int, default=2000, help="Total save_session calls")
+    parser.add_argument('--sessions', type=int, default=200, help="Distinct session ids")
+    parser.add_argument('--bulk-rows', type=int, default=20000, help="Rows for the bulk insert benchmark")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows per bulk executemany batch")
+    parser.add_argument('--distinct-resumes', type=int, default=20, help="Distinct resumes in the blob benchmark")
+    args = parser.parse_args()
+
+    init_db()
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+
+    results = bench_save_session(args.saves, args.sessions)
+    for label, stats in results.items():
+        print(f"save_session [{label}]: {stats['saves_per_sec']:.1f} saves/sec, "
+              f"{stats['users']} user rows")
+
+    if results['legacy']['saves_per_sec']:
+        speedup = results['upsert']['saves_per_sec'] / results['legacy']['saves_per_sec']
+        print(f"Speedup: {speedup:.2f}x")
+
+    bulk = bench_bulk_analyses(args.bulk_rows, args.sessions, args.chunk_size)
+    print(f"save_analysis [single]: {bulk['single']['rows_per_sec']:.1f} rows/sec")
+    print(f"save_analyses [bulk, chunk={args.chunk_size}]: {bulk['bulk']['rows_per_sec']:.1f} rows/sec")
+
+    blobs = bench_text_blobs(args.sessions, args.distinct_resumes)
+    print(f"text blobs: {blobs['sessions']} sessions, {blobs['blobs']} blobs, "
+          f"{blobs['logical_bytes']} logical bytes -> {blobs['stored_bytes']} stored bytes")
+    print(f"text blobs: dedup {blobs['dedup_ratio']:.1f}x, compression {blobs['compression_ratio']:.1f}x, "
+          f"overall {blobs['savings_ratio']:.1f}x; cold load_full_sessions {blobs['loads_per_sec']:.1f} sessions/sec")
+
+
+if __name__ == "__main__":
+    main()
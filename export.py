@@ -0,0 +1,167 @@
+"""
+Stream match results out of the database as CSV, JSONL or Parquet.
+
+Run it as a module from the directory that contains the ``utils`` package:
+
+    python -m utils.export --format csv --output analyses.csv
+    python -m utils.export --format jsonl --since 2026-01-01 --job-title "Data Scientist"
+    python -m utils.export --format parquet --output analyses.parquet --until 2026-07-01
+"""
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+from typing import IO, Iterable, Optional
+
+# Try to import pyarrow, but Parquet export is optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+EXPORT_COLUMNS = (
+    'session_id',
+    'job_title',
+    'analysis_id',
+    'created_at',
+    'overall_score',
+    'skill_match_score',
+    'matching_keywords',
+    'missing_keywords',
+)
+
+# Separator used for keyword lists in CSV cells
+CSV_LIST_SEPARATOR = ';'
+
+
+def _batched(rows: Iterable[dict], size: int):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_csv(rows: Iterable[dict], out: IO[str]) -> int:
+    """Write rows as CSV with keyword lists joined by CSV_LIST_SEPARATOR."""
+    writer = csv.DictWriter(out, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        row = dict(row)
+        row['created_at'] = row['created_at'].isoformat() if row['created_at'] else ''
+        row['matching_keywords'] = CSV_LIST_SEPARATOR.join(row['matching_keywords'] or [])
+        row['missing_keywords'] = CSV_LIST_SEPARATOR.join(row['missing_keywords'] or [])
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[dict], out: IO[str]) -> int:
+    """Write one JSON object per line."""
+    count = 0
+    for row in rows:
+        out.write(json.dumps(row, default=str))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def write_parquet(rows: Iterable[dict], path: str, batch_size: int) -> int:
+    """Write rows to a Parquet file one row group per batch."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ('session_id', pa.string()),
+        ('job_title', pa.string()),
+        ('analysis_id', pa.int64()),
+        ('created_at', pa.timestamp('us')),
+        ('overall_score', pa.float64()),
+        ('skill_match_score', pa.float64()),
+        ('matching_keywords', pa.list_(pa.string())),
+        ('missing_keywords', pa.list_(pa.string())),
+    ])
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in _batched(rows, batch_size):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def export_analyses(fmt: str,
+                    output: str = '-',
+                    since: Optional[datetime] = None,
+                    until: Optional[datetime] = None,
+                    job_title: Optional[str] = None,
+                    batch_size: int = 1000,
+                    store=None) -> int:
+    """
+    Export analyses joined with their sessions
+
+    Args:
+        fmt: One of EXPORT_FORMATS
+        output: File path, or '-' for stdout (CSV and JSONL only)
+        since: Only analyses created at or after this time
+        until: Only analyses created before this time
+        job_title: Only sessions with exactly this job title
+        batch_size: Rows fetched from the database per round trip
+        store: DataStore to read from; a new one is created if omitted
+
+    Returns:
+        int: Number of rows written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    if store is None:
+        from utils.data_store import DataStore
+        store = DataStore()
+
+    rows = store.iter_analyses(since=since, until=until, job_title=job_title, batch_size=batch_size)
+
+    if fmt == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet export needs an output file path")
+        return write_parquet(rows, output, batch_size)
+
+    writer = write_csv if fmt == 'csv' else write_jsonl
+    if output == '-':
+        return writer(rows, sys.stdout)
+    with open(output, 'w', newline='' if fmt == 'csv' else None, encoding='utf-8') as out:
+        return writer(rows, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export match results from the database")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv', help="Output format")
+    parser.add_argument('--output', default='-', help="Output file, '-' for stdout")
+    parser.add_argument('--since', type=datetime.fromisoformat, help="Earliest analysis time (ISO 8601)")
+    parser.add_argument('--until', type=datetime.fromisoformat, help="Latest analysis time, exclusive (ISO 8601)")
+    parser.add_argument('--job-title', help="Exact job title to export")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Rows fetched per round trip")
+    args = parser.parse_args()
+
+    count = export_analyses(
+        args.format,
+        output=args.output,
+        since=args.since,
+        until=args.until,
+        job_title=args.job_title,
+        batch_size=args.batch_size
+    )
+    print(f"Exported {count} analyses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import atexit
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_JOB_DB = os.getenv("JOB_QUEUE_PATH", os.path.join(tempfile.gettempdir(), "trail-jobs.sqlite3"))
+
+# A running job whose owner hasn't renewed it for this long is queued again
+DEFAULT_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Finished jobs are kept this long so a page can pick up their results later
+DEFAULT_RETENTION_SECONDS = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    dedup_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_finished ON jobs (finished_at);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_jobs_in_flight ON jobs (dedup_key)
+    WHERE status IN ('queued', 'running');
+"""
+
+
+def job_key(kind: str, payload: dict) -> str:
+    """Identity of a job: identical kind and payload share one in-flight job."""
+    encoded = json.dumps([kind, payload], sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class JobQueue:
+    """
+    Local job queue persisted in SQLite and run by worker threads.
+
+    Pages ``submit`` a job, keep the returned id in session state and poll
+    ``get`` on later reruns, so long calls no longer block the script and a
+    result is not lost when the user navigates away. Identical jobs that are
+    still queued or running are deduplicated to the same id.
+
+    Jobs live in their own SQLite file, independent of DATABASE_URL, which
+    several processes may share. A running job is leased by the queue that
+    claimed it and renewed by a heartbeat thread; a job whose lease lapses
+    (its process died) is queued again by whichever queue notices first.
+    Finished jobs are purged after ``retention_seconds``.
+    """
+
+    def __init__(self,
+                 handlers: Dict[str, Callable[[dict], Any]],
+                 path: str = DEFAULT_JOB_DB,
+                 workers: int = 2,
+                 retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+                 poll_interval: float = 1.0,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Args:
+            handlers: Job kind -> callable taking the payload dict and
+                returning a JSON-serializable result
+            path: SQLite file holding the jobs
+            workers: Number of worker threads
+            retention_seconds: How long finished jobs are kept
+            poll_interval: Seconds idle workers wait before re-checking the
+                table (jobs submitted by other processes)
+            lease_seconds: How long a running job stays claimed without a
+                heartbeat from its owner
+        """
+        self._handlers = dict(handlers)
+        self._path = path
+        self._retention_seconds = retention_seconds
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._owner = uuid.uuid4().hex
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self._running = set()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            _add_missing_columns(conn)
+        # Work interrupted by a dead process runs again; live owners keep theirs
+        self.requeue_expired()
+        self.purge()
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True) for i in range(workers)
+        ]
+        self._threads.append(threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        atexit.register(self.close)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Autocommit connection per call; workers and pages run on different threads
+        conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, kind: str, payload: dict) -> str:
+        """
+        Queue a job, or join an identical one that is still in flight
+
+        Args:
+            kind: One of the registered handler names
+            payload: JSON-serializable arguments for the handler
+
+        Returns:
+            str: Job id to poll with ``get``
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        key = job_key(kind, payload)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE dedup_key = ? AND status IN (?, ?)", (key, QUEUED, RUNNING)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("COMMIT")
+                    return row['id']
+
+                job_id = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, dedup_key, status, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, kind, key, QUEUED, json.dumps(payload, default=str), time.time())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        with self._cond:
+            self._cond.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """
+        Current state of a job
+
+        Returns:
+            dict: id, kind, status, result, error and timestamps, or None if
+            the job is unknown or has been purged
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, kind, status, result, error, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] is not None else None
+        return job
+
+    def purge(self) -> int:
+        """Delete finished jobs older than the retention period."""
+        cutoff = time.time() - self._retention_seconds
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?", (DONE, FAILED, cutoff)
+            ).rowcount
+        return deleted
+
+    def requeue_expired(self) -> int:
+        """Queue running jobs again whose lease has lapsed."""
+        cutoff = time.time() - self._lease_seconds
+        with self._connect() as conn:
+            requeued = conn.execute(
+                """
+                UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL
+                WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+                """,
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+        if requeued:
+            print(f"Requeued {requeued} job(s) with expired leases")
+        return requeued
+
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+    def close(self, timeout: float = 5.0):
+        """Stop the workers; queued jobs stay in the table for the next start."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest queued job to running, leased to this queue."""
+        now = time.time()
+        with self._connect() as conn:
+            # fetchall steps the statement to completion so the update commits
+            rows = conn.execute(
+                """
+                UPDATE jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ?
+                WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1)
+                RETURNING id, kind, payload
+                """,
+                (RUNNING, now, self._owner, now, QUEUED)
+            ).fetchall()
+        if not rows:
+            return None
+        with self._cond:
+            self._running.add(rows[0]['id'])
+        return rows[0]
+
+    def _finish(self, job_id: str, status: str, result=None, error: Optional[str] = None):
+        try:
+            with self._connect() as conn:
+                # A job whose lease lapsed may be running elsewhere; leave it to that owner
+                conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ? AND owner = ?",
+                    (status, json.dumps(result, default=str) if status == DONE else None, error, time.time(),
+                     job_id, self._owner)
+                )
+        finally:
+            # Without heartbeats an unfinished job is requeued once its lease lapses
+            with self._cond:
+                self._running.discard(job_id)
+
+    def _heartbeat(self):
+        """Renew the leases of this queue's running jobs and requeue expired ones."""
+        while True:
+            with self._cond:
+                if not self._closed:
+                    self._cond.wait(self._lease_seconds / 4)
+                if self._closed:
+                    return
+                running = list(self._running)
+
+            try:
+                if running:
+                    with self._connect() as conn:
+                        conn.execute(
+                            f"UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND id IN ({','.join('?' * len(running))})",
+                            (time.time(), self._owner, *running)
+                        )
+                if self.requeue_expired():
+                    with self._cond:
+                        self._cond.notify_all()
+            except sqlite3.Error as e:
+                print(f"Error renewing job leases: {e}")
+
+    def _run(self):
+        last_purge = time.monotonic()
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"Error claiming job: {e}")
+                job = None
+
+            if job is None:
+                if time.monotonic() - last_purge > self._retention_seconds / 24:
+                    try:
+                        self.purge()
+                    except sqlite3.Error as e:
+                        print(f"Error purging jobs: {e}")
+                    last_purge = time.monotonic()
+                with self._cond:
+                    if not self._closed:
+                        self._cond.wait(self._poll_interval)
+                continue
+
+            handler = self._handlers.get(job['kind'])
+            status, result, error = DONE, None, None
+            try:
+                if handler is None:
+                    raise ValueError(f"No handler registered for job kind: {job['kind']}")
+                result = handler(json.loads(job['payload']))
+            except Exception as e:
+                print(f"Job {job['id']} ({job['kind']}) failed: {str(e)}")
+                status, error = FAILED, str(e)
+
+            try:
+                self._finish(job['id'], status, result=result, error=error)
+            except sqlite3.Error as e:
+                print(f"Error recording job {job['id']}: {e}")
+
+
+def _add_missing_columns(conn: sqlite3.Connection):
+    """Add the lease columns to a jobs table created before they existed."""
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for column, column_type in (('owner', 'TEXT'), ('heartbeat_at', 'REAL')):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
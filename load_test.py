@@ -0,0 +1,140 @@
+"""
+Load test for the HTTP scoring service.
+
+Sends requests built from the benchmark corpus at a fixed concurrency and
+reports throughput and latency percentiles. Start the service first, then
+run the test as a module from the same directory:
+
+    uvicorn utils.service:app --port 8000
+    python -m utils.load_test --url http://localhost:8000 --endpoint match --requests 500 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import List
+
+# Try to import httpx, but the load test is optional
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from utils.benchmark import CORPUS_SIZES, generate_job_description, generate_pdf, generate_resume
+
+ENDPOINTS = ('match', 'analyze', 'extract')
+
+
+def build_payloads(endpoint: str, size: str, seed: int = 7) -> List[dict]:
+    """httpx request kwargs for each document in the corpus preset."""
+    params = CORPUS_SIZES[size]
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(params['documents']):
+        resume = generate_resume(rng, params['section_words'], params['skills'])
+        job_description = generate_job_description(rng, params['section_words'], params['skills'])
+        if endpoint == 'match':
+            payloads.append({'url': '/match', 'json': {'resume_text': resume, 'job_description': job_description}})
+        elif endpoint == 'analyze':
+            payloads.append({'url': '/jobs/analyze', 'json': {'job_description': job_description}})
+        else:
+            payloads.append({
+                'url': '/resumes/extract',
+                'content': generate_pdf(resume, params['pdf_pages']),
+                'headers': {'Content-Type': 'application/pdf'}
+            })
+    return payloads
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load_test(url: str, payloads: List[dict], requests: int, concurrency: int,
+                        timeout: float = 60.0) -> dict:
+    """
+    Fire ``requests`` requests with at most ``concurrency`` in flight
+
+    Args:
+        url: Base URL of the service
+        payloads: Request kwargs to cycle through
+        requests: Total requests to send
+        concurrency: Requests in flight at once
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        dict: Throughput, latency percentiles in milliseconds and status counts
+    """
+    latencies = []
+    statuses = {}
+    next_request = iter(range(requests))
+
+    async def worker(client):
+        for i in next_request:
+            payload = payloads[i % len(payloads)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(**payload)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'elapsed_sec': elapsed,
+        'requests_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': statistics.fmean(latencies) if latencies else 0.0,
+        'p50_ms': _percentile(latencies, 50),
+        'p90_ms': _percentile(latencies, 90),
+        'p99_ms': _percentile(latencies, 99),
+        'max_ms': latencies[-1] if latencies else 0.0,
+        'statuses': statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the HTTP scoring service")
+    parser.add_argument('--url', default='http://localhost:8000', help="Base URL of the service")
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='match', help="Endpoint to exercise")
+    parser.add_argument('--size', choices=sorted(CORPUS_SIZES), default='small', help="Corpus preset")
+    parser.add_argument('--requests', type=int, default=200, help="Total requests")
+    parser.add_argument('--concurrency', type=int, default=16, help="Requests in flight at once")
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if not HTTPX_AVAILABLE:
+        sys.exit("The load test requires httpx (pip install httpx)")
+
+    payloads = build_payloads(args.endpoint, args.size)
+    results = asyncio.run(run_load_test(args.url, payloads, args.requests, args.concurrency))
+
+    print(f"{results['requests']} requests to /{args.endpoint} at concurrency {results['concurrency']}")
+    print(f"  throughput: {results['requests_per_sec']:.1f} req/s")
+    print(f"  latency ms: p50 {results['p50_ms']:.1f}  p90 {results['p90_ms']:.1f}  "
+          f"p99 {results['p99_ms']:.1f}  max {results['max_ms']:.1f}")
+    print(f"  statuses: {json.dumps(results['statuses'], sort_keys=True)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
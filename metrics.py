@@ -0,0 +1,197 @@
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Histogram bucket upper bounds in seconds (Prometheus convention)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_NAME = "trail_stage_duration_seconds"
+
+# Spans of the request being handled on this thread/task, if tracing
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("trail_trace", default=None)
+_current_depth: contextvars.ContextVar = contextvars.ContextVar("trail_trace_depth", default=0)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = []
+            running = 0
+            for count in self.counts:
+                running += count
+                cumulative.append(running)
+            return {'buckets': self.buckets, 'cumulative': cumulative, 'count': self.count, 'sum': self.sum}
+
+
+class MetricsRegistry:
+    """Per-stage latency histograms for the whole process."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._buckets = buckets
+        self._histograms: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram(self._buckets))
+        histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            stages = list(self._histograms.items())
+        return {stage: histogram.snapshot() for stage, histogram in sorted(stages)}
+
+    def set_gauge(self, name: str, value: float, help: str = "", labels: Optional[Dict[str, str]] = None):
+        """Set a point-in-time value exported alongside the stage histograms."""
+        label_key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            gauge = self._gauges.setdefault(name, {'help': help, 'values': {}})
+            gauge['values'][label_key] = value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._gauges.clear()
+
+    def to_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent in each resume-analysis pipeline stage.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for stage, snap in self.snapshot().items():
+            label = stage.replace('\\', '\\\\').replace('"', '\\"')
+            for bound, cumulative in zip(snap['buckets'], snap['cumulative']):
+                lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{label}",le="+Inf"}} {snap["cumulative"][-1]}')
+            lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {snap["sum"]}')
+            lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {snap["count"]}')
+
+        with self._lock:
+            gauges = {name: (gauge['help'], dict(gauge['values'])) for name, gauge in self._gauges.items()}
+        for name, (help_text, values) in sorted(gauges.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for label_key, value in sorted(values.items()):
+                labels = ','.join(
+                    '{}="{}"'.format(key, str(val).replace('\\', '\\\\').replace('"', '\\"')) for key, val in label_key
+                )
+                lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class timed:
+    """
+    Time a pipeline stage, as a context manager or decorator.
+
+    Every call feeds the stage histogram in ``registry``; if a trace was
+    started in this context (see ``start_trace``) a span is appended to it.
+
+        with timed("spacy_parse"):
+            doc = nlp(text)
+
+        @timed("scoring")
+        def calculate_match_score(...): ...
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(self.stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        self._depth = _current_depth.get()
+        self._token = _current_depth.set(self._depth + 1)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        _current_depth.reset(self._token)
+
+        registry.observe(self.stage, elapsed)
+        spans = _current_trace.get()
+        if spans is not None:
+            spans.append({
+                'stage': self.stage,
+                'ms': elapsed * 1000,
+                'depth': self._depth,
+                'error': exc_type is not None
+            })
+        return False
+
+
+def start_trace() -> List[dict]:
+    """Start collecting spans for the current request and return the list."""
+    spans = []
+    _current_trace.set(spans)
+    _current_depth.set(0)
+    return spans
+
+
+def current_trace() -> Optional[List[dict]]:
+    """Spans collected since the last start_trace on this thread, if any."""
+    return _current_trace.get()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = registry.to_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` in Prometheus text format from a daemon thread
+
+    Args:
+        port: TCP port to listen on
+        host: Interface to bind
+
+    Returns:
+        The running server
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
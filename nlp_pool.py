@@ -0,0 +1,262 @@
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from utils.metrics import registry, timed
+
+NLP_POOL_WORKERS = int(os.getenv("NLP_POOL_WORKERS", "0"))
+NLP_POOL_TIMEOUT = float(os.getenv("NLP_POOL_TIMEOUT", "30"))
+# Seconds for every worker to start and load the model
+NLP_POOL_START_TIMEOUT = float(os.getenv("NLP_POOL_START_TIMEOUT", "120"))
+
+
+def _init_worker():
+    """Load the spaCy model once per worker process."""
+    from utils.nlp_processor import get_nlp
+    get_nlp()
+
+
+def _parse_in_worker(text: str, budget: Optional[float]) -> dict:
+    from utils.nlp_processor import parse_local
+    return parse_local(text, budget)
+
+
+def _ready():
+    return True
+
+
+_launch_lock = threading.Lock()
+
+
+def _launch_workers(executor: ProcessPoolExecutor, workers: int, timeout: float = NLP_POOL_START_TIMEOUT):
+    """
+    Start every worker process up front.
+
+    Spawned children re-import ``__main__``, and under Streamlit that is the
+    app script, so each worker would run the whole page. The script module is
+    swapped for an empty one while the processes start; once all of them
+    exist the executor never spawns again.
+
+    Raises:
+        TimeoutError: The workers were not all ready within ``timeout``
+        BrokenProcessPool: A worker died while starting
+    """
+    with _launch_lock:
+        main = sys.modules['__main__']
+        sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            # A fresh executor starts one process per submit until it is full
+            futures = [executor.submit(_ready) for _ in range(workers)]
+        finally:
+            sys.modules['__main__'] = main
+    deadline = time.monotonic() + timeout
+    for future in futures:
+        try:
+            future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            raise TimeoutError(f"spaCy workers did not start within {timeout:.0f}s")
+
+
+class SpacyWorkerPool:
+    """
+    Worker processes that each hold a loaded spaCy model.
+
+    ``nlp_processor.parse`` sends texts here when a pool is installed, so
+    parses from concurrent Streamlit sessions run on separate cores instead
+    of taking turns on the GIL. Only the text goes out and only the extracted
+    sentences, noun chunks and entities come back.
+
+    At most ``max_pending`` parses are queued or running; further requests
+    are rejected immediately and the caller parses in-process. A request
+    that doesn't finish within ``timeout`` seconds raises TimeoutError; a
+    running parse can't be cancelled, so its workers are terminated and
+    replaced, and the other parses they held fall back to in-process. A
+    crashed worker breaks the executor, which is replaced the same way.
+    Replacements start outside the pool's lock, so parses and health checks
+    never wait on them; if one fails to start the pool shuts down and every
+    caller parses in-process.
+    """
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None, timeout: float = NLP_POOL_TIMEOUT):
+        """
+        Args:
+            workers: Number of worker processes
+            max_pending: Parses queued or running at once (default: 4 per worker)
+            timeout: Seconds to wait for one parse
+        """
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        self._closed = False
+        self._restarting = False
+        self._in_flight = 0
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'timeouts': 0,
+            'rejected': 0,
+            'restarts': 0,
+        }
+        self._publish()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: Streamlit's process already runs threads, which fork doesn't copy safely
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+        try:
+            _launch_workers(executor, self.workers)
+        except BaseException:
+            _terminate(executor)
+            raise
+        return executor
+
+    def _count(self, event: str, in_flight_delta: int = 0):
+        with self._lock:
+            self.stats[event] += 1
+            self._in_flight += in_flight_delta
+        self._publish()
+
+    def _publish(self):
+        with self._lock:
+            stats = dict(self.stats)
+            in_flight = self._in_flight
+        registry.set_gauge("trail_nlp_pool_workers", self.workers, "spaCy worker processes.")
+        registry.set_gauge("trail_nlp_pool_in_flight", in_flight, "Parses queued or running in the spaCy pool.")
+        registry.set_gauge("trail_nlp_pool_capacity", self.max_pending, "Maximum parses queued or running at once.")
+        for event, value in stats.items():
+            registry.set_gauge("trail_nlp_pool_events", value, "spaCy pool requests by outcome.", {'event': event})
+
+    def parse(self, text: str, budget: Optional[float] = None) -> Optional[dict]:
+        """
+        Parse text in a worker process
+
+        Args:
+            text: Text to parse
+            budget: Seconds the worker may spend, see nlp_processor.parse_local
+
+        Returns:
+            dict: Features from nlp_processor.parse_local, or None if the pool
+            is full, closed, restarting or broken and the caller should parse
+            in-process
+
+        Raises:
+            TimeoutError: The parse did not finish within the timeout
+        """
+        if self._closed or self._restarting or not self._slots.acquire(blocking=False):
+            self._count('rejected')
+            return None
+
+        self._count('submitted', in_flight_delta=1)
+        executor = self._executor
+        try:
+            with timed("nlp_pool_parse"):
+                future = executor.submit(_parse_in_worker, text, budget)
+                result = future.result(timeout=self.timeout)
+            self._count('completed')
+            return result
+        except FutureTimeoutError:
+            self._count('timeouts')
+            self._restart(executor, "spaCy parse timed out; restarted the worker pool")
+            raise TimeoutError(f"spaCy parse timed out after {self.timeout:.0f}s")
+        except (BrokenProcessPool, CancelledError):
+            # Cancelled: the executor was shut down by a restart while this parse waited
+            self._count('failed')
+            self._restart(executor, "spaCy worker pool broke; started a new one")
+            return None
+        except Exception as e:
+            print(f"spaCy worker error: {str(e)}")
+            self._count('failed')
+            return None
+        finally:
+            self._slots.release()
+            with self._lock:
+                self._in_flight -= 1
+            self._publish()
+
+    def _restart(self, executor: ProcessPoolExecutor, reason: str):
+        """Replace ``executor`` unless another caller already has or is doing so."""
+        with self._lock:
+            if self._closed or self._restarting or self._executor is not executor:
+                return
+            self._restarting = True
+        print(reason)
+        # Parses submitted meanwhile hit the broken executor and fall back in-process
+        _terminate(executor)
+        try:
+            replacement = self._new_executor()
+        except Exception as e:
+            print(f"spaCy worker pool could not restart, parsing in-process: {str(e)}")
+            with self._lock:
+                self._restarting = False
+                self._closed = True
+            return
+
+        with self._lock:
+            self._restarting = False
+            closed = self._closed
+            if not closed:
+                self._executor = replacement
+                self.stats['restarts'] += 1
+        if closed:
+            _terminate(replacement)
+        self._publish()
+
+    def health(self) -> dict:
+        """Pool size, load and outcome counters."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'in_flight': self._in_flight,
+                **self.stats
+            }
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        _terminate(self._executor)
+
+
+def _terminate(executor: ProcessPoolExecutor):
+    """Shut an executor down without waiting for the parses it is running."""
+    # shutdown() lets running tasks finish; stop the processes outright
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def start_worker_pool(workers: int = NLP_POOL_WORKERS) -> Optional[SpacyWorkerPool]:
+    """
+    Start a pool and route nlp_processor parses through it
+
+    Args:
+        workers: Worker processes; 0 keeps parsing in-process
+
+    Returns:
+        The pool, or None if disabled or its workers failed to start
+    """
+    if workers <= 0:
+        return None
+    from utils.nlp_processor import set_worker_pool
+    try:
+        pool = SpacyWorkerPool(workers)
+    except (BrokenProcessPool, TimeoutError, OSError) as e:
+        print(f"spaCy worker pool failed to start, parsing in-process: {str(e)}")
+        return None
+    set_worker_pool(pool)
+    return pool
@@ -1,20 +1,240 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import contextvars
+import hashlib
+import json
 import re
-import spacy
-import nltk
-nltk.data.path.append(r'C:\Users\priya\AppData\Roaming\nltk_data')
-
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    # Add sentencizer to the pipeline if not present
-    if 'sentencizer' not in nlp.pipe_names:
-        nlp.add_pipe('sentencizer')
-except OSError:
-    # Fallback to blank model with sentencizer if model not found
-    nlp = spacy.blank("en")
-    nlp.add_pipe('sentencizer')
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from utils.metrics import timed
+from utils.pipeline import NodeCache
+
+SPACY_MODEL = "en_core_web_sm"
+
+# Bump when parse_local() output changes shape, so stored parses are not reused
+PARSE_FEATURES_VERSION = 2
+
+# Analysis stages, cheapest first; under a latency budget later ones are cut first
+NLP_STAGES = ('keywords', 'sentences', 'noun_chunks', 'ner')
+FULL, TRUNCATED, SKIPPED = 'full', 'truncated', 'skipped'
+
+# Shortest text worth running a truncated stage on
+MIN_STAGE_CHARS = 500
+
+# Seconds per character of each budgeted parse stage; priors until measured
+_stage_costs = {'sentences': 1e-6, 'noun_chunks': 2e-5, 'ner': 8e-6}
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """
+    Load the spaCy pipeline on first use.
+
+    spaCy and its model are only imported when text is actually parsed, so
+    importing this module stays cheap for workers and the UI.
+    """
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                try:
+                    nlp = spacy.load(SPACY_MODEL)
+                    # Add sentencizer to the pipeline if not present
+                    if 'sentencizer' not in nlp.pipe_names:
+                        nlp.add_pipe('sentencizer')
+                except OSError:
+                    # Fallback to blank model with sentencizer if model not found
+                    nlp = spacy.blank("en")
+                    nlp.add_pipe('sentencizer')
+                _nlp = nlp
+    return _nlp
+
+# Set by nlp_pool.start_worker_pool to parse in worker processes
+_worker_pool = None
+
+def set_worker_pool(pool):
+    """Route parse() through a SpacyWorkerPool, or back in-process with None."""
+    global _worker_pool
+    _worker_pool = pool
+
+def parse_local(text, budget=None):
+    """
+    Parse text in this process and keep only the features callers use.
+
+    With a budget in seconds, stages run cheapest first and each one covers
+    only as much text as its measured cost per character allows; the
+    'stages' entry records which ran in full, truncated or not at all.
+    """
+    nlp = get_nlp()
+    if budget is not None:
+        return _parse_within(nlp, text, time.perf_counter() + budget)
+
+    doc = nlp(text)
+    return {
+        'sents': [sent.text for sent in doc.sents],
+        # The blank fallback model has no parser, so no noun chunks
+        'noun_chunks': [chunk.text for chunk in doc.noun_chunks] if doc.has_annotation("DEP") else [],
+        'ents': [(ent.text, ent.label_) for ent in doc.ents],
+        'stages': {stage: FULL for stage in NLP_STAGES[1:]}
+    }
+
+def _stage_extent(stage, length, deadline):
+    """Characters a stage can get through before the deadline; 0 to skip it."""
+    affordable = max(0.0, deadline - time.perf_counter()) / _stage_costs[stage]
+    if affordable >= length:
+        return length
+    return int(affordable) if affordable >= MIN_STAGE_CHARS else 0
+
+def _stage_status(covered, length):
+    if covered >= length:
+        return FULL
+    return TRUNCATED if covered else SKIPPED
+
+def _truncate(text, limit):
+    """At most limit characters of text, ending at a line or sentence break if one is near."""
+    if limit >= len(text):
+        return text
+    cut = max(text.rfind('\n', 0, limit), text.rfind('. ', 0, limit))
+    return text[:cut + 1] if cut > limit // 2 else text[:limit]
+
+def _run_stage(stage, func, arg, chars):
+    """Run one parse stage and fold its cost per character into the estimate."""
+    start = time.perf_counter()
+    result = func(arg)
+    if chars:
+        _stage_costs[stage] = 0.8 * _stage_costs[stage] + 0.2 * (time.perf_counter() - start) / chars
+    return result
+
+def _parse_within(nlp, text, deadline):
+    stages = {}
+    features = {'sents': [], 'noun_chunks': [], 'ents': [], 'stages': stages}
+
+    # Rule-based sentence split
+    part = _truncate(text, _stage_extent('sentences', len(text), deadline))
+    if part:
+        doc = _run_stage('sentences', lambda t: nlp.get_pipe('sentencizer')(nlp.make_doc(t)), part, len(part))
+        features['sents'] = [sent.text for sent in doc.sents]
+    stages['sentences'] = _stage_status(len(part), len(text))
+
+    # Tagger and parser, for noun chunks
+    part = _truncate(text, _stage_extent('noun_chunks', len(text), deadline))
+    doc = None
+    if part:
+        def syntax(t):
+            doc = nlp.make_doc(t)
+            for name, proc in nlp.pipeline:
+                if name != 'ner':
+                    doc = proc(doc)
+            return doc
+        doc = _run_stage('noun_chunks', syntax, part, len(part))
+        features['noun_chunks'] = [chunk.text for chunk in doc.noun_chunks] if doc.has_annotation("DEP") else []
+        if len(part) == len(text):
+            # Parser sentence boundaries, as an unbudgeted parse would give
+            features['sents'] = [sent.text for sent in doc.sents]
+    stages['noun_chunks'] = _stage_status(len(part), len(text))
+
+    # Named entities, over the text the parser covered or not at all
+    covered = 0
+    if doc is not None and 'ner' not in nlp.pipe_names:
+        covered = len(part)
+    elif doc is not None and _stage_extent('ner', len(part), deadline) == len(part):
+        doc = _run_stage('ner', nlp.get_pipe('ner'), doc, len(part))
+        features['ents'] = [(ent.text, ent.label_) for ent in doc.ents]
+        covered = len(part)
+    stages['ner'] = _stage_status(covered, len(text))
+    return features
+
+_parser_version = None
+
+def parser_version():
+    """Short hash of the spaCy version, model and pipeline config that parses depend on."""
+    global _parser_version
+    if _parser_version is None:
+        import spacy
+        nlp = get_nlp()
+        described = json.dumps([
+            PARSE_FEATURES_VERSION, spacy.__version__,
+            nlp.meta.get('name'), nlp.meta.get('version'), nlp.config.to_str()
+        ])
+        _parser_version = hashlib.sha256(described.encode('utf-8')).hexdigest()[:16]
+    return _parser_version
+
+def parse_key(text):
+    """Key of a parse: hash of the exact text given to parse()."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# Parses loaded from the database by utils.parsed_resumes, by parse_key
+_stored_parses = NodeCache(max_entries=256)
+
+# Dict collecting every parse of the current context, if recording
+_recorded_parses = contextvars.ContextVar("trail_recorded_parses", default=None)
+
+def seed_parses(parses):
+    """Let parse() return stored features for these parse keys instead of running spaCy."""
+    for key, features in parses.items():
+        _stored_parses.put(key, features)
+
+# perf_counter() time by which parses in the current context should finish, if any
+_deadline = contextvars.ContextVar("trail_analysis_deadline", default=None)
+
+@contextmanager
+def analysis_deadline(seconds):
+    """Share a latency budget between the parses in this context; None means no limit."""
+    token = _deadline.set(None if seconds is None else time.perf_counter() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining_budget():
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else max(0.0, deadline - time.perf_counter())
+
+def parse_complete(features):
+    """Whether every parse stage covered the whole text."""
+    return all(status == FULL for status in features['stages'].values())
+
+@contextmanager
+def record_parses():
+    """Collect the features of every complete parse() made in this context, by parse_key."""
+    parses = {}
+    token = _recorded_parses.set(parses)
+    try:
+        yield parses
+    finally:
+        _recorded_parses.reset(token)
+
+def parse(text):
+    """Sentences, noun chunks and entities of text, from storage or the worker pool when available."""
+    key = parse_key(text)
+    hit, features = _stored_parses.get(key)
+    if not hit:
+        features = _parse(text, remaining_budget())
+        if features is None:
+            # Timed out
+            return {'sents': [], 'noun_chunks': [], 'ents': [], 'stages': {stage: SKIPPED for stage in NLP_STAGES[1:]}}
+    recorded = _recorded_parses.get()
+    # Only complete parses may be stored and reused
+    if recorded is not None and parse_complete(features):
+        recorded[key] = features
+    return features
+
+def _parse(text, budget=None):
+    pool = _worker_pool
+    if pool is not None:
+        try:
+            features = pool.parse(text, budget)
+        except TimeoutError as e:
+            print(f"Warning: {str(e)}")
+            return None
+        if features is not None:
+            return features
+    # No pool, or it is full or restarting
+    with timed("spacy_parse"):
+        return parse_local(text, budget)
 
 def clean_text(text):
     """Clean and normalize extracted text."""
@@ -33,43 +253,60 @@ def clean_text(text):
 
     return text.strip()
 
+def merge_stages(*stage_maps):
+    """Combine stage flags of several parses, keeping the least complete status of each stage."""
+    rank = {FULL: 0, TRUNCATED: 1, SKIPPED: 2}
+    merged = {}
+    for stages in stage_maps:
+        for stage, status in stages.items():
+            if rank[status] > rank.get(merged.get(stage), -1):
+                merged[stage] = status
+    return {stage: merged[stage] for stage in NLP_STAGES if stage in merged}
+
 def analyze_job_description(text):
     """Analyze job description to extract key information."""
     if not text:
         print("Warning: Empty job description text")
-        return {'skills': [], 'requirements': [], 'responsibilities': []}
+        return {'skills': [], 'requirements': [], 'responsibilities': [], 'nlp_stages': {}}
 
     text = clean_text(text)
-    doc = nlp(text)
 
-    # Extract key requirements
-    skills = extract_skills(text)  # Extract from full text
+    # Extract key requirements; skills first, as keywords are the cheapest stage
+    skills, skill_stages = _extract_skills(text)  # Extract from full text
+    doc = parse(text)
     requirements = []
     responsibilities = []
 
-    for sent in doc.sents:
-        sent_text = sent.text.lower()
+    for sent in doc['sents']:
+        sent_text = sent.lower()
 
         # Identify requirements
         if any(keyword in sent_text for keyword in ['required', 'must have', 'minimum', 'qualification']):
-            requirements.append(sent.text.strip())
+            requirements.append(sent.strip())
 
         # Identify responsibilities
         if any(keyword in sent_text for keyword in ['responsible for', 'duties', 'will be', 'role includes']):
-            responsibilities.append(sent.text.strip())
+            responsibilities.append(sent.strip())
 
-    print(f"Found {len(skills)} skills in job description")
     return {
         'skills': skills,
         'requirements': requirements,
-        'responsibilities': responsibilities
+        'responsibilities': responsibilities,
+        'nlp_stages': merge_stages(skill_stages, doc['stages'])
     }
 
+def resume_parse_texts(text, sections):
+    """Texts analyze_resume passes to parse(), so their parses can be stored."""
+    texts = [clean_text(text).lower()] if text else []
+    if text and sections.get('skills'):
+        texts.append(sections['skills'].lower())
+    return texts
+
 def analyze_resume(text, sections):
     """Analyze resume content and extract relevant information."""
     if not text:
         print("Warning: Empty resume text")
-        return {'skills': [], 'experience': [], 'education': []}
+        return {'skills': [], 'experience': [], 'total_years_experience': 0.0, 'education': [], 'nlp_stages': {}}
 
     text = clean_text(text)
 
@@ -77,33 +314,58 @@ def analyze_resume(text, sections):
     all_skills = set()
 
     # Extract from full text
-    full_text_skills = extract_skills(text)
+    full_text_skills, stages = _extract_skills(text)
     all_skills.update(full_text_skills)
 
     # Extract from specific sections if available
     if sections.get('skills'):
-        skills_section_skills = extract_skills(sections['skills'])
+        skills_section_skills, section_stages = _extract_skills(sections['skills'])
         all_skills.update(skills_section_skills)
+        stages = merge_stages(stages, section_stages)
 
-    print(f"Found {len(all_skills)} total skills in resume")
+    experience = extract_resume_facts(sections.get('experience', ''))
+    education = extract_resume_facts(sections.get('education', ''))
 
     return {
         'skills': list(all_skills),
-        'experience': extract_experience(sections.get('experience', '')),
-        'education': extract_education(sections.get('education', ''))
+        'experience': experience['experience'],
+        'total_years_experience': experience['total_years_experience'],
+        'education': education['education'],
+        'nlp_stages': stages
     }
 
-def calculate_match_score(resume_analysis, job_analysis):
-    """Calculate match score between resume and job description."""
+@timed("scoring")
+def calculate_match_score(resume_analysis, job_analysis, threshold=None):
+    """Calculate match score between resume and job description, treating spelling variants of a skill as a match."""
+    from utils.skill_index import default_skill_index, FUZZY_MATCH_THRESHOLD
+    if threshold is None:
+        threshold = FUZZY_MATCH_THRESHOLD
+
     # Calculate skill match
     job_skills = set(s.lower() for s in job_analysis['skills'])
     resume_skills = set(s.lower() for s in resume_analysis['skills'])
 
-    print(f"Job skills: {job_skills}")
-    print(f"Resume skills: {resume_skills}")
+    # Resume skills by canonical name, so "postgres" on one side meets "postgresql" on the other
+    resume_canonical = {}
+    for skill in resume_skills:
+        resolved = default_skill_index.resolve(skill, threshold)
+        if resolved:
+            resume_canonical.setdefault(resolved[0], (skill, resolved[1]))
 
     matching_skills = job_skills.intersection(resume_skills)
-    missing_skills = job_skills - resume_skills
+    fuzzy_matches = []
+    for skill in job_skills - matching_skills:
+        resolved = default_skill_index.resolve(skill, threshold)
+        if resolved and resolved[0] in resume_canonical:
+            resume_skill, resume_similarity = resume_canonical[resolved[0]]
+            matching_skills.add(skill)
+            fuzzy_matches.append({
+                'job_skill': skill,
+                'resume_skill': resume_skill,
+                'skill': resolved[0],
+                'similarity': round(min(resolved[1], resume_similarity), 2)
+            })
+    missing_skills = job_skills - matching_skills
 
     skill_match_score = len(matching_skills) / len(job_skills) if job_skills else 0
 
@@ -114,106 +376,237 @@ def calculate_match_score(resume_analysis, job_analysis):
         'overall_score': overall_score,
         'skill_match_score': skill_match_score,
         'matching_keywords': list(matching_skills),
-        'missing_keywords': list(missing_skills)
+        'missing_keywords': list(missing_skills),
+        'fuzzy_matches': sorted(fuzzy_matches, key=lambda m: m['job_skill']),
+        'nlp_stages': merge_stages(resume_analysis.get('nlp_stages', {}), job_analysis.get('nlp_stages', {}))
     }
 
-def extract_skills(text):
-    """Extract skills from text using keyword matching and NLP."""
+# Common technical skills and keywords
+SKILL_PATTERNS = [
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
+    'rust', 'go', 'scala', 'perl', 'r', 'matlab', 'sql', 'bash', 'shell', 'powershell',
+
+    # Web Technologies
+    'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 'flask',
+    'asp.net', 'spring', 'laravel', 'jquery', 'bootstrap', 'tailwind', 'webpack', 'redux',
+
+    # Databases
+    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'firebase',
+    'oracle', 'cassandra', 'dynamodb', 'graphql', 'nosql', 'sqlite',
+
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'terraform',
+    'ansible', 'puppet', 'chef', 'circleci', 'prometheus', 'grafana', 'nginx', 'apache',
+
+    # AI/ML
+    'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch',
+    'scikit-learn', 'pandas', 'numpy', 'opencv', 'nlp', 'computer vision', 'ai',
+
+    # Other Technologies
+    'rest api', 'microservices', 'git', 'agile', 'scrum', 'jira', 'confluence',
+    'linux', 'unix', 'ci/cd', 'oauth', 'jwt', 'api', 'sdk', 'saas', 'testing'
+]
+
+# Common spellings of skills in SKILL_PATTERNS that trigram similarity can't link
+SKILL_ALIASES = {
+    'k8s': 'kubernetes', 'postgres': 'postgresql', 'psql': 'postgresql', 'golang': 'go',
+    'js': 'javascript', 'ts': 'typescript', 'nodejs': 'node', 'node.js': 'node',
+    'reactjs': 'react', 'react.js': 'react', 'vuejs': 'vue', 'vue.js': 'vue', 'angularjs': 'angular',
+    'mongo': 'mongodb', 'elastic': 'elasticsearch', 'sklearn': 'scikit-learn',
+    'ml': 'machine learning', 'dl': 'deep learning', 'amazon web services': 'aws',
+    'google cloud': 'gcp', 'google cloud platform': 'gcp', 'cicd': 'ci/cd', 'restful api': 'rest api'
+}
+
+# Aliases that are also ordinary words or units ("elastic infrastructure", "5 ml");
+# they resolve skills found by other means but aren't picked out of plain text
+AMBIGUOUS_SKILL_ALIASES = {'elastic', 'ml', 'dl', 'ts', 'js'}
+
+def _term_pattern(terms):
+    """Regex matching any of terms as whole words; '+', '#', '.' and '/' count as part of a term (c++, c#, asp.net, ci/cd)."""
+    alternatives = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(r'(?<![\w+#./])(?:' + alternatives + r')(?![\w+#/]|\.\w)')
+
+SKILL_TERM_PATTERN = _term_pattern(SKILL_PATTERNS)
+SKILL_ALIAS_PATTERN = _term_pattern(alias for alias in SKILL_ALIASES if alias not in AMBIGUOUS_SKILL_ALIASES)
+
+def find_skill_terms(text):
+    """Skill keywords that appear in text as whole words, aliases resolved (k8s -> kubernetes), without parsing it."""
     if not text:
-        return []
-
-    # Common technical skills and keywords
-    skill_patterns = [
-        # Programming Languages
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-        'rust', 'go', 'scala', 'perl', 'r', 'matlab', 'sql', 'bash', 'shell', 'powershell',
-
-        # Web Technologies
-        'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 'flask',
-        'asp.net', 'spring', 'laravel', 'jquery', 'bootstrap', 'tailwind', 'webpack', 'redux',
-
-        # Databases
-        'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'firebase',
-        'oracle', 'cassandra', 'dynamodb', 'graphql', 'nosql', 'sqlite',
-
-        # Cloud & DevOps
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'terraform',
-        'ansible', 'puppet', 'chef', 'circleci', 'prometheus', 'grafana', 'nginx', 'apache',
+        return set()
+    text_lower = text.lower()
+    terms = set(SKILL_TERM_PATTERN.findall(text_lower))
+    terms.update(SKILL_ALIASES[alias] for alias in SKILL_ALIAS_PATTERN.findall(text_lower))
+    return terms
 
-        # AI/ML
-        'machine learning', 'deep learning', 'neural networks', 'tensorflow', 'pytorch',
-        'scikit-learn', 'pandas', 'numpy', 'opencv', 'nlp', 'computer vision', 'ai',
+@timed("skill_extraction")
+def extract_skills(text):
+    """Extract skills from text using keyword matching and NLP."""
+    return _extract_skills(text)[0]
 
-        # Other Technologies
-        'rest api', 'microservices', 'git', 'agile', 'scrum', 'jira', 'confluence',
-        'linux', 'unix', 'ci/cd', 'oauth', 'jwt', 'api', 'sdk', 'saas', 'testing'
-    ]
+def _extract_skills(text):
+    """Skills in text and the flags of the parse stages they came from."""
+    if not text:
+        return [], {}
 
     text_lower = text.lower()
     skills = set()
 
-    # Extract skills using pattern matching
-    for pattern in skill_patterns:
-        if pattern in text_lower:
-            skills.add(pattern)
+    # Skill keywords as whole words; a substring test finds "go" in "good" and "java" in "javascript"
+    skills.update(SKILL_TERM_PATTERN.findall(text_lower))
+
+    # Known variant spellings as written; calculate_match_score resolves them
+    skills.update(SKILL_ALIAS_PATTERN.findall(text_lower))
 
     # Process with spaCy
-    doc = nlp(text_lower)
+    doc = parse(text_lower)
 
     # Extract skills from noun phrases
-    for chunk in doc.noun_chunks:
-        chunk_text = chunk.text.strip().lower()
+    for chunk in doc['noun_chunks']:
+        chunk_text = chunk.strip().lower()
         # Check if chunk contains technical terms
-        if any(pattern in chunk_text for pattern in skill_patterns):
+        if SKILL_TERM_PATTERN.search(chunk_text):
             if 2 <= len(chunk_text.split()) <= 4:  # Reasonable length for skill names
                 skills.add(chunk_text)
 
     # Extract potential skills from named entities
-    for ent in doc.ents:
-        if ent.label_ in ['ORG', 'PRODUCT']:
-            ent_text = ent.text.lower().strip()
-            if any(pattern in ent_text for pattern in skill_patterns):
+    for ent_text, label in doc['ents']:
+        if label in ['ORG', 'PRODUCT']:
+            ent_text = ent_text.lower().strip()
+            if SKILL_TERM_PATTERN.search(ent_text):
                 if len(ent_text.split()) <= 3:  # Keep entity names concise
                     skills.add(ent_text)
 
-    print(f"Extracted {len(skills)} unique skills from text")
-    return list(skills)
-
-def extract_experience(text):
-    """Extract work experience details."""
+    return list(skills), merge_stages({'keywords': FULL}, doc['stages'])
+
+# Month names and abbreviations -> month number
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_MONTH = r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?'
+_YEAR = r'(?:19|20)\d{2}'
+_DEGREE = (
+    r"bachelor(?:'?s)?|master(?:'?s)?|doctorate|ph\.?\s?d\.?|mba|associate(?:'?s)?"
+    r"|b\.?\s?tech|m\.?\s?tech|b\.?sc\.?|m\.?sc\.?|b\.s\.|m\.s\.|b\.a\.|m\.a\.|diploma"
+)
+_INSTITUTION = r'university|college|institute|school|academy'
+_NAME_WORD = r"(?!(?:" + _DEGREE + r"|" + _INSTITUTION + r")\b)[^\W\d_][\w&'.-]*"
+# Whitespace within one line; degree fields and institution names don't span lines
+_SP = r'[^\S\n]+'
+
+# One alternation so a single scan finds date ranges, degrees and institutions
+# without counting the same span twice; every branch starts at a word boundary
+# so the scanner only tries word starts
+RESUME_FACTS_PATTERN = re.compile(
+    r'\b(?:(?P<range>'
+    rf'(?:(?P<start_month>{_MONTH})\.?\s+)?(?P<start_year>{_YEAR})'
+    r'\s*(?:-|–|—|to|until)\s*'
+    rf'(?:(?:(?P<end_month>{_MONTH})\.?\s+)?(?P<end_year>{_YEAR})|(?P<present>present|current|now|today))'
+    r')'
+    rf'|(?P<degree>{_DEGREE})(?![\w.])'
+    rf"(?:{_SP}(?:of|in){_SP}(?P<field>{_NAME_WORD}(?:{_SP}(?:and{_SP}|&{_SP})?{_NAME_WORD}){{0,3}}))?"
+    r'|(?P<institution>'
+    rf"(?:(?-i:[A-Z][\w&'.-]*){_SP}){{0,4}}(?:{_INSTITUTION})\b"
+    rf"(?:{_SP}of(?:{_SP}the)?(?:{_SP}{_NAME_WORD}){{1,3}})?"
+    r'))',
+    re.IGNORECASE
+)
+
+def _month_index(year, month):
+    """Months since year 0, for date arithmetic."""
+    return int(year) * 12 + (MONTHS[month[:3].lower()] if month else 1) - 1
+
+def _same_entry(gap):
+    """Whether text between a degree and an institution keeps them in one entry: the same line, or the institution opening the next one."""
+    lines = gap.split('\n')
+    return len(lines) == 1 or (len(lines) == 2 and not lines[1].strip())
+
+def _month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def _total_years(intervals):
+    """Years covered by the union of [start, end) month intervals."""
+    months = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start
+    return round(months / 12, 1)
+
+def extract_resume_facts(text, today=None):
+    """Scan text once for employment date ranges, degrees and institutions."""
     if not text:
-        return []
-
-    experiences = []
-    experience_patterns = [
-        r'(\d{4})\s*-\s*(\d{4}|present)',
-        r'(\w+ \d{4})\s*-\s*(\w+ \d{4}|present)',
-        r'(\d{4})\s*to\s*(\d{4}|present)',
-        r'(\w+ \d{4})\s*to\s*(\w+ \d{4}|present)'
-    ]
+        return {'experience': [], 'total_years_experience': 0.0, 'education': []}
+
+    today = today or date.today()
+    now_index = today.year * 12 + today.month - 1
+
+    experience, intervals, seen_ranges = [], [], set()
+    education, seen_education = [], set()
+    record, record_end = None, 0
+
+    for match in RESUME_FACTS_PATTERN.finditer(text):
+        if match.group('range'):
+            start = _month_index(match.group('start_year'), match.group('start_month'))
+            if match.group('present'):
+                end = now_index
+            else:
+                end = _month_index(match.group('end_year'), match.group('end_month'))
+                # "Jan - Dec 2018" includes December: 12 months, not 11
+                if match.group('end_month'):
+                    end += 1
+            if end < start or (start, end) in seen_ranges:
+                continue
+            seen_ranges.add((start, end))
+            intervals.append((start, end))
+            experience.append({
+                'start': _month_label(start),
+                'end': 'present' if match.group('present') else _month_label(end - 1 if match.group('end_month') else end),
+                'months': end - start,
+                'text': match.group('range')
+            })
+        elif match.group('degree'):
+            record = {
+                'degree': match.group('degree').strip(),
+                'field': (match.group('field') or '').strip().rstrip('.') or None,
+                'institution': None
+            }
+            education.append(record)
+            record_end = match.end()
+        else:
+            institution = match.group('institution').strip().rstrip('.')
+            if record is not None and record['institution'] is None and _same_entry(text[record_end:match.start()]):
+                record['institution'] = institution
+            else:
+                record = {'degree': None, 'field': None, 'institution': institution}
+                education.append(record)
+
+    # Same degree listed twice (e.g. in summary and education) counts once
+    unique_education = []
+    for entry in education:
+        key = tuple((entry[field] or '').lower() for field in ('degree', 'field', 'institution'))
+        if key not in seen_education:
+            seen_education.add(key)
+            unique_education.append(entry)
 
-    for pattern in experience_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            experiences.append(match.group())
+    return {
+        'experience': experience,
+        'total_years_experience': _total_years(intervals),
+        'education': unique_education
+    }
 
-    return experiences
+def extract_experience(text):
+    """Extract deduplicated, normalized employment date ranges."""
+    return extract_resume_facts(text)['experience']
 
 def extract_education(text):
-    """Extract education details."""
-    if not text:
-        return []
-
-    education = []
-    education_patterns = [
-        r'(bachelor|master|phd|b\.?s\.?|m\.?s\.?|ph\.?d\.?)',
-        r'(university|college|institute) of',
-        r'(degree|diploma) in'
-    ]
-
-    for pattern in education_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            education.append(match.text.strip())
-
-    return education
\ No newline at end of file
+    """Extract degree and institution records."""
+    return extract_resume_facts(text)['education']
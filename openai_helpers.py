@@ -1,7 +1,10 @@
 import os
 import json
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, TYPE_CHECKING
+from utils.metrics import timed
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # Initialize the OpenAI client
 def initialize_openai(api_key=None):
@@ -21,6 +24,8 @@ def initialize_openai(api_key=None):
                 print("OPENAI_API_KEY is not set in your .env file!")
                 return None
         
+        # Imported lazily; the SDK is slow to import and only needed here
+        from openai import OpenAI
         client = OpenAI(api_key=api_key)
         return client
     except Exception as e:
@@ -28,7 +33,7 @@ def initialize_openai(api_key=None):
         return None
 
 def generate_interview_questions(
-    client: OpenAI,
+    client: "OpenAI",
     job_title: str, 
     job_description: str, 
     resume_text: str, 
@@ -97,15 +102,16 @@ def generate_interview_questions(
     try:
         # Use the newest OpenAI model (gpt-4o) which was released May 13, 2024.
         # Do not change this unless explicitly requested by the user
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are an expert interviewer who generates tailored interview questions."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=800
-        )
+        with timed("llm_call"):
+            response = client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": "You are an expert interviewer who generates tailored interview questions."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                max_tokens=800
+            )
         
         # Extract the generated questions
         if response.choices and response.choices[0].message.content:
@@ -0,0 +1,110 @@
+from typing import Callable, Optional
+
+from utils.metrics import timed
+from utils.nlp_processor import parser_version, parse_key, resume_parse_texts, seed_parses
+from utils.pipeline import NodeCache, analysis_pipeline
+from utils.text_blobs import content_hash
+
+# Pipeline nodes whose results are stored with the parse
+RESUME_NODES = ('resume_sections', 'resume_analysis')
+
+
+def analysis_version() -> str:
+    """Versions of the stored pipeline nodes; a bump makes the stored results stale."""
+    return ",".join(f"{name}:{analysis_pipeline.nodes[name].version}" for name in RESUME_NODES)
+
+
+def build_parsed_resume(resume_text: str, sections: dict, analysis: dict, parses: dict) -> dict:
+    """
+    Bundle what re-scoring a resume needs into one storable dict
+
+    Args:
+        resume_text: Resume text the analysis was computed from
+        sections: Result of the resume_sections node
+        analysis: Result of the resume_analysis node
+        parses: Parse features recorded with nlp_processor.record_parses()
+            while the analysis ran
+
+    Returns:
+        dict: Parse features of the resume texts (sentences, noun chunks
+        and entities), sections, analysis and the versions they belong to
+    """
+    keys = [parse_key(text) for text in resume_parse_texts(resume_text, sections)]
+    return {
+        'parses': {key: parses[key] for key in keys if key in parses},
+        'analysis_version': analysis_version(),
+        'sections': sections,
+        'analysis': analysis
+    }
+
+
+def seed_parsed_resume(resume_text: str, parsed: dict) -> bool:
+    """
+    Load a stored parse into the in-process caches
+
+    The parse features always apply, since the row was looked up by parser
+    version. The sections and analysis only seed the pipeline when they were
+    computed by the current node versions; otherwise the analysis reruns on
+    the stored parses without spaCy.
+
+    Returns:
+        bool: True if the stored analysis was reusable
+    """
+    seed_parses(parsed.get('parses') or {})
+    if parsed.get('analysis_version') != analysis_version():
+        return False
+    analysis_pipeline.seed(
+        {'resume_text': resume_text},
+        {'resume_sections': parsed['sections'], 'resume_analysis': parsed['analysis']}
+    )
+    return True
+
+
+class ParsedResumeStore:
+    """
+    Resume parses kept in the database alongside sessions.
+
+    ``load`` is called before every match analysis, so each resume text is
+    looked up at most once per process; after that the pipeline cache (or the
+    analysis that just ran and was saved) already covers it.
+    """
+
+    def __init__(self, store_factory: Optional[Callable] = None):
+        """
+        Args:
+            store_factory: Returns a DataStore; defaults to DataStore()
+        """
+        self.store_factory = store_factory
+        self._checked = NodeCache(max_entries=1024)
+
+    def _store(self):
+        if self.store_factory is None:
+            from utils.data_store import DataStore
+            return DataStore()
+        return self.store_factory()
+
+    def load(self, resume_text: str) -> bool:
+        """
+        Seed the caches from the stored parse of a resume
+
+        Returns:
+            bool: True if the stored analysis was reused
+        """
+        key = content_hash(resume_text)
+        hit, reused = self._checked.get(key)
+        if hit:
+            return reused
+        with timed("parsed_resume_load"):
+            parsed = self._store().load_parsed_document(key, parser_version())
+        reused = bool(parsed) and seed_parsed_resume(resume_text, parsed)
+        self._checked.put(key, reused)
+        return reused
+
+    def save(self, resume_text: str, sections: dict, analysis: dict, parses: dict) -> bool:
+        """Store a freshly computed analysis and the parses it was built from."""
+        key = content_hash(resume_text)
+        saved = self._store().save_parsed_document(
+            key, parser_version(), build_parsed_resume(resume_text, sections, analysis, parses)
+        )
+        self._checked.put(key, saved)
+        return saved
@@ -1,7 +1,7 @@
 import io
-import streamlit as st
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+from utils.metrics import timed
 
 # Try to import fitz (PyMuPDF), but have a fallback if it fails
 try:
@@ -11,26 +11,33 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
     print("PyMuPDF not available. PDF extraction will use fallback method.")
 
-def extract_text_from_pdf(pdf_file) -> Optional[str]:
+def _warning(level: str, message: str) -> Dict[str, str]:
+    """Structured message for the caller to surface (level: info, warning or error)."""
+    return {'level': level, 'message': message}
+
+@timed("pdf_extraction")
+def extract_pdf_text(pdf_file) -> Tuple[Optional[str], List[Dict[str, str]]]:
     """
-    Extract text content from a PDF file
+    Extract text content from a PDF file, collecting user-facing warnings
     
     Args:
-        pdf_file: The uploaded PDF file
+        pdf_file: The uploaded PDF file (anything with getvalue(), e.g. io.BytesIO)
     
     Returns:
-        str: The extracted text content or a placeholder if extraction failed
+        tuple: The extracted text content or a placeholder if extraction
+        failed, and a list of {'level', 'message'} warnings
     """
+    warnings = []
+    
     # Check if the PDF file was actually uploaded
     if pdf_file is None:
         print("No PDF file was provided")
-        return None
+        return None, warnings
     
     # If PyMuPDF is not available, provide a sample resume text
     if not PYMUPDF_AVAILABLE:
         print("PyMuPDF not available - using sample resume text")
-        # Let the user know about the issue using streamlit
-        st.warning("PDF extraction library (PyMuPDF) is not properly configured. Using sample resume text instead.")
+        warnings.append(_warning('warning', "PDF extraction library (PyMuPDF) is not properly configured. Using sample resume text instead."))
         
         # Generate a sample resume text for testing
         sample_text = """
@@ -61,7 +68,7 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
         Visualization: Tableau, PowerBI, Matplotlib
         Soft Skills: Problem-solving, Communication, Teamwork
         """
-        return sample_text
+        return sample_text, warnings
     
     # Use PyMuPDF if it's available
     try:
@@ -76,7 +83,7 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
         
         # Check if document is empty
         if doc.page_count == 0:
-            return "This PDF document has no pages. Please upload a valid resume."
+            return "This PDF document has no pages. Please upload a valid resume.", warnings
         
         # Extract text from each page
         for page_num in range(len(doc)):
@@ -86,7 +93,7 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
         
         # If no text was extracted but the PDF has pages
         if not text.strip() and doc.page_count > 0:
-            st.warning("The PDF appears to contain no extractable text (possibly a scanned document). Using sample resume text instead.")
+            warnings.append(_warning('warning', "The PDF appears to contain no extractable text (possibly a scanned document). Using sample resume text instead."))
             return """
             RESUME
             
@@ -103,16 +110,16 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
             
             SKILLS
             Technical skills, Soft skills, Industry knowledge
-            """
+            """, warnings
         
-        return text
+        return text, warnings
     except Exception as e:
         error_message = str(e)
         print(f"PDF extraction error: {error_message}")
-        st.error(f"Error processing PDF: {error_message}")
+        warnings.append(_warning('error', f"Error processing PDF: {error_message}"))
         
         # Show a more friendly message to the user
-        st.info("Using a sample resume for demonstration. Upload a different PDF or continue with the sample.")
+        warnings.append(_warning('info', "Using a sample resume for demonstration. Upload a different PDF or continue with the sample."))
         
         # Return a sample resume
         return """
@@ -131,7 +138,20 @@ def extract_text_from_pdf(pdf_file) -> Optional[str]:
         
         SKILLS
         Technical skills, Tools, Software, Soft skills
-        """
+        """, warnings
+
+def extract_text_from_pdf(pdf_file) -> Optional[str]:
+    """
+    Extract text content from a PDF file, discarding warnings
+    
+    Args:
+        pdf_file: The uploaded PDF file
+    
+    Returns:
+        str: The extracted text content or a placeholder if extraction failed
+    """
+    text, _ = extract_pdf_text(pdf_file)
+    return text
 
 def clean_text(text: str) -> str:
     """
@@ -157,6 +177,7 @@ def clean_text(text: str) -> str:
     
     return text
 
+@timed("sectioning")
 def extract_resume_sections(text: str) -> Dict[str, str]:
     """
     Attempt to extract common resume sections
@@ -0,0 +1,233 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+
+class PersistenceQueue:
+    """
+    Write-behind queue that moves session-state snapshots into a DataStore.
+
+    Page renders call ``submit`` and return immediately; a single background
+    thread owns the database session and drains the queue. Snapshots for the
+    same session are coalesced while they wait, so a burst of reruns costs
+    one write per flush window rather than one per rerun.
+
+    A snapshot is a dict with any of these parts:
+
+    - ``session``: fields for ``DataStore.save_session``
+    - ``analysis``: payload for ``DataStore.save_analysis``
+    - ``interview``: payload for ``DataStore.save_interview``
+
+    Later parts replace earlier ones of the same kind; ``session`` fields
+    are merged key by key. A snapshot holds the session's current state, so
+    its analysis and interview replace the stored rows rather than adding
+    new ones.
+    """
+
+    def __init__(self,
+                 store_factory: Optional[Callable] = None,
+                 max_pending: int = 1000,
+                 flush_interval: float = 2.0,
+                 submit_timeout: float = 1.0):
+        """
+        Args:
+            store_factory: Callable returning a DataStore; called once on the
+                writer thread. Defaults to ``DataStore``
+            max_pending: Maximum number of sessions waiting to be written
+            flush_interval: Seconds to collect snapshots before writing them
+            submit_timeout: Default seconds ``submit`` blocks while the queue
+                is full before giving up
+        """
+        if store_factory is None:
+            from utils.data_store import DataStore
+            store_factory = DataStore
+
+        self._store_factory = store_factory
+        self._max_pending = max_pending
+        self._flush_interval = flush_interval
+        self._submit_timeout = submit_timeout
+
+        self._pending: "OrderedDict[str, dict]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._in_flight = False
+        self._flush_requested = False
+        self._closed = False
+
+        self.stats = {
+            'submitted': 0,
+            'coalesced': 0,
+            'rejected': 0,
+            'written': 0,
+            'failed': 0,
+            'flushes': 0,
+        }
+
+        self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, session_id: str, snapshot: dict, timeout: Optional[float] = None) -> bool:
+        """
+        Queue a snapshot for writing.
+
+        Blocks for up to ``timeout`` seconds (default ``submit_timeout``) when
+        ``max_pending`` sessions are already waiting. Snapshots for a session
+        that is already queued never block, they are merged in place.
+
+        Returns:
+            bool: True if the snapshot was queued, False if it was rejected
+            because the queue stayed full or has been closed
+        """
+        timeout = self._submit_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            if self._closed:
+                self.stats['rejected'] += 1
+                return False
+
+            self.stats['submitted'] += 1
+            if session_id in self._pending:
+                _merge_snapshot(self._pending[session_id], snapshot)
+                self.stats['coalesced'] += 1
+                return True
+
+            while len(self._pending) >= self._max_pending and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats['rejected'] += 1
+                    print(f"Persistence queue full; dropped snapshot for session {session_id}")
+                    return False
+                self._flush_requested = True
+                self._cond.notify_all()
+                self._cond.wait(remaining)
+
+            if self._closed:
+                self.stats['rejected'] += 1
+                return False
+
+            self._pending[session_id] = _merge_snapshot({}, snapshot)
+            self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far and wait for it to finish."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while (self._pending or self._in_flight) and self._thread.is_alive():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return not self._pending
+
+    def close(self, timeout: float = 10.0):
+        """Flush outstanding snapshots and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def depth(self) -> int:
+        """Number of sessions waiting to be written."""
+        with self._cond:
+            return len(self._pending)
+
+    def _next_batch(self) -> Optional[Dict[str, dict]]:
+        """Wait for a flush window to close and take everything queued."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+
+            # Let further snapshots coalesce until the window closes
+            window_end = time.monotonic() + self._flush_interval
+            while not self._closed and not self._flush_requested:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            if not self._pending:
+                return None if self._closed else {}
+
+            batch = self._pending
+            self._pending = OrderedDict()
+            self._flush_requested = False
+            self._in_flight = True
+            self._cond.notify_all()
+            return batch
+
+    def _run(self):
+        store = None
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            if not batch:
+                continue
+
+            try:
+                if store is None:
+                    store = self._store_factory()
+                written, failed = _write_batch(store, batch)
+            except Exception as e:
+                print(f"Error writing persistence batch: {e}")
+                written, failed = 0, len(batch)
+
+            with self._cond:
+                self.stats['written'] += written
+                self.stats['failed'] += failed
+                self.stats['flushes'] += 1
+                self._in_flight = False
+                self._cond.notify_all()
+
+
+def _merge_snapshot(target: dict, snapshot: dict) -> dict:
+    """Fold ``snapshot`` into ``target``: session fields merge, other parts replace."""
+    for part, value in snapshot.items():
+        if part == 'session' and isinstance(target.get('session'), dict):
+            target['session'].update(value)
+        elif part == 'session':
+            target['session'] = dict(value)
+        else:
+            target[part] = value
+    return target
+
+
+def _write_batch(store, batch: Dict[str, dict]):
+    """
+    Write one coalesced batch: sessions first, then children in bulk.
+
+    Each session keeps a single analysis and interview row; a failed bulk
+    save counts every session in it as failed.
+
+    Returns:
+        tuple: (sessions written, sessions that failed)
+    """
+    written = failed = 0
+    analyses = []
+    interviews = []
+
+    for session_id, snapshot in batch.items():
+        if 'session' in snapshot and not store.save_session(session_id, snapshot['session']):
+            failed += 1
+            continue
+        written += 1
+        if snapshot.get('analysis'):
+            analyses.append((session_id, snapshot['analysis']))
+        if snapshot.get('interview'):
+            interviews.append((session_id, snapshot['interview']))
+
+    failed_children = set()
+    if analyses and store.save_analyses(analyses, replace=True) is None:
+        failed_children.update(session_id for session_id, _ in analyses)
+    if interviews and store.save_interviews(interviews, replace=True) is None:
+        failed_children.update(session_id for session_id, _ in interviews)
+
+    return written - len(failed_children), failed + len(failed_children)
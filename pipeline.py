@@ -0,0 +1,223 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+COMPUTED = 'computed'
+REUSED = 'reused'
+
+
+class Node:
+    """A pipeline stage: ``func`` is called with the values of ``deps`` in order."""
+
+    def __init__(self, name: str, func: Callable, deps: Tuple[str, ...], version: int = 1,
+                 complete: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            name: Name other nodes use to depend on this one
+            func: Stage function
+            deps: Names of pipeline inputs or other nodes
+            version: Bump when ``func`` changes output so old results are not reused
+            complete: Returns False for a result cut short (e.g. by a latency
+                budget); such results and everything computed from them are
+                not cached
+        """
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.version = version
+        self.complete = complete
+
+
+class NodeCache:
+    """Thread-safe LRU of node results keyed by node key."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def input_key(value) -> str:
+    """Content hash of a pipeline input."""
+    encoded = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """
+    DAG of memoized stages keyed by the hashes of their inputs.
+
+    A node's key is derived from its name, version and the keys of its
+    dependencies, so editing one input only invalidates the nodes downstream
+    of it; everything else is served from the cache. Each run reports which
+    nodes were reused and the keys they were computed from.
+    """
+
+    def __init__(self, nodes: Iterable[Node], cache: Optional[NodeCache] = None):
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate pipeline node: {node.name}")
+            self.nodes[node.name] = node
+        self.cache = cache if cache is not None else NodeCache()
+
+    def _order(self, targets: Iterable[str]) -> List[str]:
+        """Nodes needed for ``targets`` in dependency order."""
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done or name not in self.nodes:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline cycle through node: {name}")
+            visiting.add(name)
+            for dep in self.nodes[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for target in targets:
+            if target not in self.nodes:
+                raise ValueError(f"Unknown pipeline node: {target}")
+            visit(target)
+        return order
+
+    def _node_key(self, node: Node, keys: Dict[str, str]) -> str:
+        return input_key([node.name, node.version, [keys[dep] for dep in node.deps]])
+
+    def seed(self, inputs: Dict[str, Any], values: Dict[str, Any]):
+        """
+        Cache node results computed elsewhere (e.g. loaded from the database)
+
+        Args:
+            inputs: Pipeline inputs the results were computed from
+            values: Node name -> result; each node's dependencies must be
+                among ``inputs`` or ``values``
+        """
+        keys = {name: input_key(value) for name, value in inputs.items()}
+        for name in self._order(values):
+            node = self.nodes[name]
+            if name not in values or any(dep not in keys for dep in node.deps):
+                raise ValueError(f"Cannot seed node {name} without its inputs")
+            keys[name] = self._node_key(node, keys)
+            self.cache.put(keys[name], copy.deepcopy(values[name]))
+
+    def run(self, inputs: Dict[str, Any], targets: Iterable[str], force: Iterable[str] = ()) -> dict:
+        """
+        Compute ``targets``, recomputing only nodes whose inputs changed
+
+        Args:
+            inputs: Values for the pipeline inputs, by name
+            targets: Node names to compute
+            force: Node names to recompute even if cached (e.g. regenerating
+                questions for unchanged inputs)
+
+        Returns:
+            dict: ``values`` (node name -> result), ``stages`` (node name ->
+            'computed' or 'reused'), ``provenance`` (node name -> its key
+            and the keys of its inputs) and ``partial`` (names of nodes whose
+            results were incomplete and so were not cached)
+        """
+        force = set(force)
+        keys = {name: input_key(value) for name, value in inputs.items()}
+        values, stages, provenance = {}, {}, {}
+        partial = set()
+
+        for name in self._order(targets):
+            node = self.nodes[name]
+            missing = [dep for dep in node.deps if dep not in keys]
+            if missing:
+                raise ValueError(f"Node {name} is missing input(s): {', '.join(missing)}")
+
+            dep_keys = {dep: keys[dep] for dep in node.deps}
+            key = self._node_key(node, keys)
+            keys[name] = key
+            provenance[name] = {'key': key, 'inputs': dep_keys}
+
+            hit, value = (False, None) if name in force else self.cache.get(key)
+            if hit:
+                stages[name] = REUSED
+            else:
+                args = [values[dep] if dep in values else inputs[dep] for dep in node.deps]
+                value = node.func(*args)
+                if any(dep in partial for dep in node.deps) or (node.complete and not node.complete(value)):
+                    partial.add(name)
+                else:
+                    self.cache.put(key, value)
+                stages[name] = COMPUTED
+            # Callers may mutate what they get back; the cached copy must not change
+            values[name] = copy.deepcopy(value)
+
+        return {'values': values, 'stages': stages, 'provenance': provenance, 'partial': sorted(partial)}
+
+
+# ---- Resume analysis pipeline ----
+
+def _resume_sections(resume_text):
+    from utils.pdf_processor import extract_resume_sections
+    return extract_resume_sections(resume_text)
+
+
+def _resume_analysis(resume_text, resume_sections):
+    from utils.nlp_processor import analyze_resume
+    return analyze_resume(resume_text, resume_sections)
+
+
+def _job_analysis(job_description):
+    from utils.nlp_processor import analyze_job_description
+    return analyze_job_description(job_description)
+
+
+def _analysis_complete(analysis):
+    return all(status == 'full' for status in analysis.get('nlp_stages', {}).values())
+
+
+def _match_result(resume_analysis, job_analysis):
+    from utils.nlp_processor import calculate_match_score
+    return calculate_match_score(resume_analysis, job_analysis)
+
+
+def _questions(job_title, job_description, resume_text, match_result):
+    from utils.openai_helpers import initialize_openai, generate_interview_questions
+    questions = generate_interview_questions(
+        initialize_openai(), job_title, job_description, resume_text, match_result
+    )
+    if not questions:
+        # Raising keeps a failed generation out of the cache
+        raise RuntimeError("Failed to generate questions. Please try again.")
+    return questions
+
+
+# Inputs: resume_text, job_description, job_title
+ANALYSIS_NODES = (
+    Node('resume_sections', _resume_sections, ('resume_text',)),
+    Node('resume_analysis', _resume_analysis, ('resume_text', 'resume_sections'), version=6, complete=_analysis_complete),
+    Node('job_analysis', _job_analysis, ('job_description',), version=5, complete=_analysis_complete),
+    Node('match_result', _match_result, ('resume_analysis', 'job_analysis'), version=4),
+    Node('questions', _questions, ('job_title', 'job_description', 'resume_text', 'match_result')),
+)
+
+# Shared by every session in the process; keys are content hashes so sharing is safe
+analysis_pipeline = Pipeline(ANALYSIS_NODES)
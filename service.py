@@ -0,0 +1,274 @@
+"""
+HTTP scoring service for machine-to-machine use (e.g. ATS integrations).
+
+Exposes the same pipeline as the Streamlit app without the UI. CPU-bound
+NLP work runs in a process pool whose workers load the spaCy model once at
+start-up; question generation calls OpenAI from a thread. Usage:
+
+    uvicorn utils.service:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+
+    POST /resumes/extract   PDF upload (multipart field "file" or raw body)
+    POST /jobs/analyze      {"job_description": ...}
+    POST /match             {"resume_text": ..., "job_description": ..., "resume_sections": {...}}
+    POST /questions         {"job_title": ..., "job_description": ..., "resume_text": ..., "match_result": {...}}
+    GET  /healthz
+    GET  /metrics           Prometheus text format
+
+Configuration (environment):
+
+    SCORING_WORKERS          Worker processes (default: CPU count)
+    MAX_CONCURRENT_REQUESTS  Requests processed at once (default: 4 per worker)
+    QUEUE_TIMEOUT            Seconds a request may wait for a slot before a 503 (default: 5)
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+from utils.metrics import registry, start_trace, timed
+
+# Try to import starlette, but the service is optional
+try:
+    from starlette.applications import Starlette
+    from starlette.concurrency import run_in_threadpool
+    from starlette.responses import JSONResponse, PlainTextResponse
+    from starlette.routing import Route
+    STARLETTE_AVAILABLE = True
+except ImportError:
+    STARLETTE_AVAILABLE = False
+
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0")) or os.cpu_count() or 1
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "0")) or SCORING_WORKERS * 4
+QUEUE_TIMEOUT = float(os.getenv("QUEUE_TIMEOUT", "5"))
+
+# Largest PDF accepted by /resumes/extract
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+
+# ---- Worker-side tasks (run inside the process pool) ----
+
+def _init_worker():
+    """Load the spaCy model once per worker so requests don't pay for it."""
+    from utils.nlp_processor import get_nlp
+    get_nlp()
+
+
+def _traced(func, *args):
+    # Worker stage timings are shipped back so the parent's /metrics sees them
+    spans = start_trace()
+    result = func(*args)
+    return result, [(span['stage'], span['ms'] / 1000) for span in spans]
+
+
+def _extract_task(pdf_bytes: bytes) -> dict:
+    from utils.pdf_processor import extract_pdf_text, clean_text, extract_resume_sections
+
+    text, warnings = extract_pdf_text(io.BytesIO(pdf_bytes))
+    if not text:
+        return {'resume_text': None, 'resume_sections': {}, 'warnings': warnings}
+    cleaned = clean_text(text)
+    return {
+        'resume_text': cleaned,
+        'resume_sections': extract_resume_sections(cleaned),
+        'warnings': warnings
+    }
+
+
+def _analyze_job_task(job_description: str) -> dict:
+    from utils.nlp_processor import analyze_job_description
+    return analyze_job_description(job_description)
+
+
+def _match_task(resume_text: str, resume_sections: dict, job_description: str) -> dict:
+    from utils.pdf_processor import extract_resume_sections
+    from utils.nlp_processor import analyze_job_description, analyze_resume, calculate_match_score
+
+    if not resume_sections:
+        resume_sections = extract_resume_sections(resume_text)
+    job_analysis = analyze_job_description(job_description)
+    resume_analysis = analyze_resume(resume_text, resume_sections)
+    return {
+        'job_analysis': job_analysis,
+        'resume_analysis': resume_analysis,
+        'match_result': calculate_match_score(resume_analysis, job_analysis)
+    }
+
+
+# ---- Request handling ----
+
+class ServiceError(Exception):
+    """Error with an HTTP status, rendered as {"error": ...}."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def _run_in_pool(request, func, *args):
+    """Run a worker task in the process pool and record its stage timings."""
+    loop = asyncio.get_running_loop()
+    result, spans = await loop.run_in_executor(request.app.state.pool, _traced, func, *args)
+    for stage, seconds in spans:
+        registry.observe(stage, seconds)
+    return result
+
+
+async def _json_body(request, *required: str) -> dict:
+    try:
+        body = await request.json()
+    except ValueError:
+        raise ServiceError(400, "Request body must be JSON")
+    if not isinstance(body, dict):
+        raise ServiceError(400, "Request body must be a JSON object")
+    missing = [field for field in required if not isinstance(body.get(field), str) or not body[field].strip()]
+    if missing:
+        raise ServiceError(422, f"Missing required field(s): {', '.join(missing)}")
+    return body
+
+
+def endpoint(stage: str):
+    """
+    Wrap a handler with the concurrency limit, timing and error rendering
+
+    Requests wait up to QUEUE_TIMEOUT seconds for one of the
+    MAX_CONCURRENT_REQUESTS slots and are rejected with 503 after that, so
+    overload sheds load instead of growing an unbounded backlog.
+    """
+    def decorator(handler):
+        async def wrapper(request):
+            limiter = request.app.state.limiter
+            try:
+                await asyncio.wait_for(limiter.acquire(), timeout=QUEUE_TIMEOUT)
+            except asyncio.TimeoutError:
+                return JSONResponse({'error': "Server busy, retry later"}, status_code=503,
+                                    headers={'Retry-After': '1'})
+            try:
+                with timed(stage):
+                    return JSONResponse(await handler(request))
+            except ServiceError as e:
+                return JSONResponse({'error': e.message}, status_code=e.status_code)
+            except Exception as e:
+                print(f"Error handling {request.url.path}: {str(e)}")
+                return JSONResponse({'error': "Internal error"}, status_code=500)
+            finally:
+                limiter.release()
+        wrapper.__name__ = handler.__name__
+        return wrapper
+    return decorator
+
+
+@endpoint("http_extract")
+async def extract_resume(request):
+    content_type = request.headers.get('content-type', '')
+    if content_type.startswith('multipart/form-data'):
+        form = await request.form()
+        upload = form.get('file')
+        if upload is None or not hasattr(upload, 'read'):
+            raise ServiceError(422, "Missing multipart field: file")
+        pdf_bytes = await upload.read()
+    else:
+        pdf_bytes = await request.body()
+
+    if not pdf_bytes:
+        raise ServiceError(422, "Empty upload")
+    if len(pdf_bytes) > MAX_UPLOAD_BYTES:
+        raise ServiceError(413, f"PDF larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+    return await _run_in_pool(request, _extract_task, pdf_bytes)
+
+
+@endpoint("http_analyze_job")
+async def analyze_job(request):
+    body = await _json_body(request, 'job_description')
+    return await _run_in_pool(request, _analyze_job_task, body['job_description'])
+
+
+@endpoint("http_match")
+async def match(request):
+    body = await _json_body(request, 'resume_text', 'job_description')
+    sections = body.get('resume_sections') or {}
+    if not isinstance(sections, dict):
+        raise ServiceError(422, "resume_sections must be an object")
+    return await _run_in_pool(request, _match_task, body['resume_text'], sections, body['job_description'])
+
+
+@endpoint("http_questions")
+async def questions(request):
+    from utils.openai_helpers import generate_interview_questions
+
+    body = await _json_body(request, 'job_title', 'job_description', 'resume_text')
+    client = request.app.state.openai_client
+    if client is None:
+        raise ServiceError(503, "Question generation is not configured (OPENAI_API_KEY)")
+
+    match_result = body.get('match_result')
+    if not isinstance(match_result, dict):
+        scored = await _run_in_pool(request, _match_task, body['resume_text'], {}, body['job_description'])
+        match_result = scored['match_result']
+
+    # The OpenAI call is I/O-bound, so a thread is enough
+    generated = await run_in_threadpool(
+        generate_interview_questions, client,
+        body['job_title'], body['job_description'], body['resume_text'], match_result
+    )
+    return {'questions': generated or [], 'match_result': match_result}
+
+
+async def healthz(request):
+    return JSONResponse({'status': 'ok', 'workers': SCORING_WORKERS,
+                         'max_concurrent_requests': MAX_CONCURRENT_REQUESTS})
+
+
+async def metrics(request):
+    return PlainTextResponse(registry.to_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+def create_app(workers: int = SCORING_WORKERS, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+    """
+    Build the ASGI application
+
+    Args:
+        workers: Worker processes for NLP work
+        max_concurrent: Requests processed at once
+
+    Returns:
+        Starlette application
+    """
+    if not STARLETTE_AVAILABLE:
+        raise RuntimeError("The scoring service requires starlette (pip install starlette uvicorn python-multipart)")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        from utils.openai_helpers import initialize_openai
+
+        # spawn: forking a process that already runs threads is unsafe
+        app.state.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+        app.state.limiter = asyncio.Semaphore(max_concurrent)
+        app.state.openai_client = initialize_openai() if os.getenv("OPENAI_API_KEY") else None
+        try:
+            yield
+        finally:
+            app.state.pool.shutdown(wait=True, cancel_futures=True)
+
+    return Starlette(
+        routes=[
+            Route('/resumes/extract', extract_resume, methods=['POST']),
+            Route('/jobs/analyze', analyze_job, methods=['POST']),
+            Route('/match', match, methods=['POST']),
+            Route('/questions', questions, methods=['POST']),
+            Route('/healthz', healthz, methods=['GET']),
+            Route('/metrics', metrics, methods=['GET']),
+        ],
+        lifespan=lifespan
+    )
+
+
+app = create_app() if STARLETTE_AVAILABLE else None
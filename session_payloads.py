@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from utils.metrics import registry
+
+DEFAULT_PAYLOAD_DIR = os.getenv("SESSION_PAYLOAD_DIR", os.path.join(tempfile.gettempdir(), "trail-payloads"))
+
+# Decoded payloads kept in memory across all sessions
+DEFAULT_HOT_BYTES = int(os.getenv("SESSION_PAYLOAD_HOT_BYTES", str(64 * 1024 * 1024)))
+
+# Sessions not seen for this long drop out of the memory accounting
+SESSION_TRACKING_TTL = 60 * 60
+
+
+class PayloadRef(NamedTuple):
+    """Handle kept in session state in place of a large value."""
+    key: str
+    size: int
+
+
+class SessionPayloadStore:
+    """
+    Content-addressed store for large session-state values.
+
+    Values are JSON-encoded, compressed and written once per distinct content
+    under ``directory``, so sessions holding the same resume share one file.
+    Session state only keeps a small PayloadRef. Recently used encodings stay
+    in an in-memory LRU bounded by ``hot_bytes``; each ``get`` decodes a
+    fresh copy, so callers can never mutate a shared value.
+    """
+
+    def __init__(self, directory: str = DEFAULT_PAYLOAD_DIR, hot_bytes: int = DEFAULT_HOT_BYTES):
+        """
+        Args:
+            directory: Where payload files are written
+            hot_bytes: Upper bound on encoded bytes kept in memory
+        """
+        self.directory = directory
+        self.hot_bytes = hot_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._hot: "OrderedDict[str, str]" = OrderedDict()
+        self._hot_size = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json.z")
+
+    def _remember(self, key: str, encoded: str):
+        with self._lock:
+            if key in self._hot:
+                self._hot.move_to_end(key)
+                return
+            self._hot[key] = encoded
+            self._hot_size += len(encoded)
+            while self._hot_size > self.hot_bytes and len(self._hot) > 1:
+                _, evicted = self._hot.popitem(last=False)
+                self._hot_size -= len(evicted)
+
+    def put(self, value: Any) -> PayloadRef:
+        """
+        Store a JSON-serializable value
+
+        Returns:
+            PayloadRef: Handle to keep in session state
+        """
+        encoded = json.dumps(value, sort_keys=True, default=str)
+        key = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        path = self._path(key)
+
+        if os.path.exists(path):
+            # Refresh the age so purge keeps payloads that are still in use
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(encoded.encode('utf-8'), 6))
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.stats['writes'] += 1
+
+        self._remember(key, encoded)
+        return PayloadRef(key, len(encoded))
+
+    def get(self, ref: Optional[PayloadRef], default: Any = None) -> Any:
+        """
+        Value behind a handle
+
+        Returns ``default`` if the handle is empty or the payload is gone.
+        Anything that is not a PayloadRef (e.g. a value set before offloading
+        existed) is returned unchanged.
+        """
+        if ref is None:
+            return default
+        if not isinstance(ref, PayloadRef):
+            return ref
+        key = ref.key
+
+        with self._lock:
+            encoded = self._hot.get(key)
+            if encoded is not None:
+                self._hot.move_to_end(key)
+                self.stats['hits'] += 1
+        if encoded is None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    encoded = zlib.decompress(f.read()).decode('utf-8')
+            except OSError:
+                print(f"Session payload {key} is missing")
+                return default
+            with self._lock:
+                self.stats['misses'] += 1
+            self._remember(key, encoded)
+        return json.loads(encoded)
+
+    def hot_size(self) -> int:
+        with self._lock:
+            return self._hot_size
+
+    def purge(self, max_age: float) -> int:
+        """Delete payload files not written or reused for ``max_age`` seconds."""
+        cutoff = time.time() - max_age
+        deleted = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        deleted += 1
+                except OSError:
+                    continue
+        return deleted
+
+
+def _approx_size(value: Any) -> int:
+    """Rough in-memory footprint of a session-state value in bytes."""
+    if isinstance(value, PayloadRef):
+        return sys.getsizeof(value) + sys.getsizeof(value.key)
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    try:
+        return sys.getsizeof(value) + len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+def session_memory_usage(state) -> Dict[str, dict]:
+    """
+    Per-key memory accounting for one session's state
+
+    Args:
+        state: st.session_state or any mapping
+
+    Returns:
+        dict: key -> {'resident': bytes held in the session,
+        'offloaded': bytes held in the payload store (0 if not offloaded)}
+    """
+    usage = {}
+    for key in list(state.keys()):
+        value = state[key]
+        usage[str(key)] = {
+            'resident': _approx_size(value),
+            'offloaded': value.size if isinstance(value, PayloadRef) else 0
+        }
+    return usage
+
+
+class SessionMemoryTracker:
+    """Latest memory accounting per session, exported as /metrics gauges."""
+
+    def __init__(self, ttl: float = SESSION_TRACKING_TTL):
+        self.ttl = ttl
+        self._sessions: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id: str, usage: Dict[str, dict], store: Optional[SessionPayloadStore] = None):
+        resident = sum(entry['resident'] for entry in usage.values())
+        offloaded = sum(entry['offloaded'] for entry in usage.values())
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (resident, offloaded, now)
+            for stale in [sid for sid, (_, _, seen) in self._sessions.items() if now - seen > self.ttl]:
+                del self._sessions[stale]
+            sessions = list(self._sessions.values())
+
+        registry.set_gauge("trail_sessions_tracked", len(sessions), "Sessions seen within the tracking window.")
+        registry.set_gauge("trail_session_state_bytes", sum(s[0] for s in sessions),
+                           "Approximate session-state bytes across sessions.", {'tier': 'resident'})
+        registry.set_gauge("trail_session_state_bytes", sum(s[1] for s in sessions),
+                           "Approximate session-state bytes across sessions.", {'tier': 'offloaded'})
+        registry.set_gauge("trail_session_state_max_bytes", max((s[0] for s in sessions), default=0),
+                           "Resident session-state bytes of the largest session.")
+        if store is not None:
+            registry.set_gauge("trail_payload_hot_bytes", store.hot_size(), "Encoded payload bytes in the hot tier.")
+            for stat, value in store.stats.items():
+                registry.set_gauge("trail_payload_store_events", value, "Payload store hits, misses and writes.",
+                                   {'event': stat})
+
+    def top_sessions(self, limit: int = 10) -> list:
+        """Largest sessions by resident bytes: (session_id, resident, offloaded)."""
+        with self._lock:
+            rows = [(sid, resident, offloaded) for sid, (resident, offloaded, _) in self._sessions.items()]
+        return sorted(rows, key=lambda row: row[1], reverse=True)[:limit]
@@ -0,0 +1,97 @@
+import functools
+import os
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.nlp_processor import SKILL_PATTERNS, SKILL_ALIASES
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.65"))
+
+
+def normalize_skill(term: str) -> str:
+    """Lowercase and collapse whitespace and separators."""
+    term = term.lower().strip()
+    term = re.sub(r'[\s_-]+', ' ', term)
+    return term.strip(' .,;:')
+
+
+def trigrams(term: str) -> set:
+    """Character trigrams of a term, padded so short terms still have a few."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SkillIndex:
+    """
+    Inverted index from character trigrams to known skill spellings.
+
+    Every canonical skill and alias is indexed once up front. Resolving a
+    term only looks at spellings that share at least one trigram with it,
+    counting shared trigrams from the posting lists, so the cost depends on
+    how common the term's trigrams are rather than on the vocabulary size.
+    """
+
+    def __init__(self, vocabulary: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            vocabulary: Canonical skill names
+            aliases: Alternative spelling -> canonical skill name
+        """
+        self.canonical: Dict[str, str] = {}
+        for skill in vocabulary:
+            self.canonical[normalize_skill(skill)] = skill
+        for alias, skill in (aliases or {}).items():
+            self.canonical[normalize_skill(alias)] = skill
+
+        self._spellings: List[str] = list(self.canonical)
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for spelling_id, spelling in enumerate(self._spellings):
+            grams = trigrams(spelling)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(spelling_id)
+
+        # Resolutions are pure functions of the term; keep one cache per index
+        self.resolve = functools.lru_cache(maxsize=4096)(self._resolve)
+
+    def _resolve(self, term: str, threshold: float = FUZZY_MATCH_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """
+        Canonical skill for a term
+
+        Args:
+            term: Skill as written
+            threshold: Minimum trigram similarity for a fuzzy match
+
+        Returns:
+            (canonical skill, similarity) with similarity 1.0 for exact and
+            alias matches, or None if nothing is similar enough
+        """
+        term = normalize_skill(term)
+        if not term:
+            return None
+        if term in self.canonical:
+            return self.canonical[term], 1.0
+
+        grams = trigrams(term)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for spelling_id in self._postings.get(gram, ()):
+                shared[spelling_id] += 1
+
+        best, best_score = None, 0.0
+        for spelling_id, count in shared.items():
+            score = 2 * count / (len(grams) + self._sizes[spelling_id])
+            # Ties go to the shorter spelling, which is usually the base skill
+            if score > best_score or (score == best_score and best is not None
+                                      and len(self._spellings[spelling_id]) < len(self._spellings[best])):
+                best, best_score = spelling_id, score
+        if best is None or best_score < threshold:
+            return None
+        return self.canonical[self._spellings[best]], best_score
+
+
+# Built once per process from the skill vocabulary in nlp_processor
+default_skill_index = SkillIndex(SKILL_PATTERNS, SKILL_ALIASES)
@@ -0,0 +1,34 @@
+import streamlit as st
+from typing import Dict, List, Optional
+from utils.pdf_processor import extract_pdf_text
+
+# Streamlit element used for each warning level returned by the core
+MESSAGE_RENDERERS = {
+    'info': st.info,
+    'warning': st.warning,
+    'error': st.error,
+}
+
+def show_messages(messages: List[Dict[str, str]]) -> None:
+    """
+    Display structured warnings returned by the core modules
+    
+    Args:
+        messages: List of {'level', 'message'} dicts
+    """
+    for message in messages:
+        MESSAGE_RENDERERS.get(message.get('level'), st.warning)(message['message'])
+
+def extract_text_from_pdf(pdf_file) -> Optional[str]:
+    """
+    Extract text from an uploaded PDF and show any warnings in the page
+    
+    Args:
+        pdf_file: The uploaded PDF file
+    
+    Returns:
+        str: The extracted text content or a placeholder if extraction failed
+    """
+    text, warnings = extract_pdf_text(pdf_file)
+    show_messages(warnings)
+    return text
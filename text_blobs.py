@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Try to import zstandard, but fall back to zlib if it is missing
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+DEFAULT_CODEC = 'zstd' if ZSTD_AVAILABLE else 'zlib'
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 10
+
+
+def content_hash(text: str) -> str:
+    """
+    Content address of a text blob
+
+    Args:
+        text: Raw text
+
+    Returns:
+        str: SHA-256 hex digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def compress_text(text: str, codec: str = DEFAULT_CODEC) -> bytes:
+    """Compress text with the given codec ('zlib' or 'zstd')."""
+    raw = text.encode('utf-8')
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if codec == 'zlib':
+        return zlib.compress(raw, ZLIB_LEVEL)
+    raise ValueError(f"Unknown text blob codec: {codec}")
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Inverse of compress_text."""
+    if codec == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstandard is required to read zstd text blobs")
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    raise ValueError(f"Unknown text blob codec: {codec}")
+
+
+def blob_row(text: str, codec: str = DEFAULT_CODEC) -> dict:
+    """
+    Build a ``text_blobs`` row for the given text
+
+    Args:
+        text: Raw text to store
+        codec: Compression codec
+
+    Returns:
+        dict: Column values for TextBlob
+    """
+    data = compress_text(text, codec)
+    return {
+        'content_hash': content_hash(text),
+        'codec': codec,
+        'data': data,
+        'raw_size': len(text.encode('utf-8')),
+        'stored_size': len(data),
+    }
+
+
+class TextCache:
+    """Thread-safe LRU of decompressed texts keyed by content hash."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, keys) -> Dict[str, str]:
+        found = {}
+        for key in keys:
+            text = self.get(key)
+            if text is not None:
+                found[key] = text
+        return found
+
+
+# Shared by every DataStore in the process; blobs are immutable so entries never go stale
+text_cache = TextCache()
@@ -1,8 +1,55 @@
+import functools
+import json
+import math
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
 from typing import Dict, List, Any
 
+# plotly is slow to import and to build figures with, so the Match-page charts
+# are small Vega-Lite specs built once per distinct input; charts that still use
+# plotly import it when they are first drawn
+GAUGE_BANDS = [
+    {'start': 0, 'end': 30, 'color': 'red'},
+    {'start': 30, 'end': 70, 'color': 'orange'},
+    {'start': 70, 'end': 100, 'color': 'green'},
+]
+
+@functools.lru_cache(maxsize=256)
+def _gauge_spec(score_pct: float, title: str) -> str:
+    """Vega-Lite half-donut gauge for a 0-100 score, as a JSON string."""
+    # Angles run from -90° to 90° so the gauge is a half circle
+    theta = {'type': 'quantitative', 'scale': {'domain': [0, 100], 'range': [-math.pi / 2, math.pi / 2]}}
+    spec = {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'title': {'text': title, 'color': 'darkblue'},
+        'height': 200,
+        'view': {'stroke': None},
+        'layer': [
+            {
+                'data': {'values': GAUGE_BANDS},
+                'mark': {'type': 'arc', 'innerRadius': 70, 'outerRadius': 100, 'opacity': 0.35},
+                'encoding': {
+                    'theta': {'field': 'start', **theta},
+                    'theta2': {'field': 'end'},
+                    'color': {'field': 'color', 'type': 'nominal', 'scale': None, 'legend': None},
+                },
+            },
+            {
+                'data': {'values': [{'start': 0, 'end': score_pct}]},
+                'mark': {'type': 'arc', 'innerRadius': 78, 'outerRadius': 92, 'color': 'darkblue'},
+                'encoding': {
+                    'theta': {'field': 'start', **theta},
+                    'theta2': {'field': 'end'},
+                },
+            },
+            {
+                'data': {'values': [{'label': f"{score_pct:.1f}"}]},
+                'mark': {'type': 'text', 'fontSize': 30, 'color': 'darkblue', 'dy': -10},
+                'encoding': {'text': {'field': 'label', 'type': 'nominal'}},
+            },
+        ],
+    }
+    return json.dumps(spec)
+
 def display_match_score_gauge(score: float, title: str = "Overall Match Score") -> None:
     """
     Display a gauge chart for match score visualization
@@ -11,33 +58,46 @@ def display_match_score_gauge(score: float, title: str = "Overall Match Score")
         score: Score value between 0 and 1
         title: Chart title
     """
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number",
-        value = score * 100,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': title},
-        gauge = {
-            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': "darkblue"},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 30], 'color': 'red'},
-                {'range': [30, 70], 'color': 'orange'},
-                {'range': [70, 100], 'color': 'green'},
-            ],
-        }
-    ))
-    
-    fig.update_layout(
-        height=250,
-        margin=dict(l=20, r=20, b=20, t=40),
-        paper_bgcolor="white",
-        font={'color': "darkblue", 'family': "Arial"}
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    # Rounded so reruns with the same displayed value reuse the spec
+    spec = _gauge_spec(round(score * 100, 1), title)
+    st.vega_lite_chart(json.loads(spec), use_container_width=True)
+
+@functools.lru_cache(maxsize=256)
+def _keyword_bar_spec(matching_count: int, missing_count: int) -> str:
+    """Vega-Lite horizontal bar chart of matching vs missing keyword counts, as a JSON string."""
+    total = matching_count + missing_count
+    matched_pct = matching_count / total if total > 0 else 0
+    values = [
+        {'category': 'Matching', 'count': matching_count, 'color': 'green', 'label': f"{matched_pct:.0%}"},
+        {'category': 'Missing', 'count': missing_count, 'color': 'red', 'label': ''},
+    ]
+    encoding = {
+        'y': {'field': 'category', 'type': 'nominal', 'sort': None, 'title': 'Keywords'},
+        'x': {'field': 'count', 'type': 'quantitative', 'title': 'Count'},
+    }
+    spec = {
+        '$schema': 'https://vega.github.io/schema/vega-lite/v5.json',
+        'title': 'Keyword Match Analysis',
+        'height': 120,
+        'data': {'values': values},
+        'layer': [
+            {
+                'mark': 'bar',
+                'encoding': {**encoding, 'color': {'field': 'color', 'type': 'nominal', 'scale': None, 'legend': None}},
+            },
+            {
+                # Percentage of matching keywords, centered in the bar
+                'transform': [{'calculate': 'datum.count / 2', 'as': 'middle'}],
+                'mark': {'type': 'text', 'color': 'white', 'fontSize': 14},
+                'encoding': {
+                    'y': encoding['y'],
+                    'x': {'field': 'middle', 'type': 'quantitative'},
+                    'text': {'field': 'label', 'type': 'nominal'},
+                },
+            },
+        ],
+    }
+    return json.dumps(spec)
 
 def display_keyword_match_bar(matching_keywords: List[str], 
                               missing_keywords: List[str]) -> None:
@@ -52,41 +112,8 @@ def display_keyword_match_bar(matching_keywords: List[str],
         st.info("No keywords identified for comparison.")
         return
     
-    total = len(matching_keywords) + len(missing_keywords)
-    matched_pct = len(matching_keywords) / total if total > 0 else 0
-    
-    # Create data for visualization
-    categories = ["Matching", "Missing"]
-    values = [len(matching_keywords), len(missing_keywords)]
-    colors = ['green', 'red']
-    
-    fig = px.bar(
-        x=values,
-        y=categories,
-        orientation='h',
-        color=categories,
-        color_discrete_sequence=colors,
-        labels={'x': 'Count', 'y': 'Keywords'},
-        title='Keyword Match Analysis'
-    )
-    
-    fig.update_layout(
-        height=200,
-        margin=dict(l=20, r=20, b=20, t=40),
-        showlegend=False,
-        paper_bgcolor="white"
-    )
-    
-    # Add percentages as text
-    fig.add_annotation(
-        x=len(matching_keywords)/2 if len(matching_keywords) > 0 else 0, 
-        y="Matching",
-        text=f"{matched_pct:.0%}",
-        showarrow=False,
-        font=dict(color="white", size=14)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    spec = _keyword_bar_spec(len(matching_keywords), len(missing_keywords))
+    st.vega_lite_chart(json.loads(spec), use_container_width=True)
 
 def display_match_details_expander(match_result: Dict[str, Any]) -> None:
     """
@@ -114,6 +141,11 @@ def display_match_details_expander(match_result: Dict[str, Any]) -> None:
             else:
                 st.success("No missing keywords. Great job!")
         
+        if match_result.get("fuzzy_matches"):
+            st.caption("Matched as spelling variants: " + ", ".join(
+                f"{m['job_skill']} ≈ {m['resume_skill']}" for m in match_result["fuzzy_matches"]
+            ))
+        
         st.divider()
         
         # Display different scores
@@ -160,4 +192,179 @@ def display_recommendations(match_result: Dict[str, Any], job_title: str) -> Non
             st.error("Critical skills missing from your resume:")
             st.write(", ".join(missing_keywords[:10]))
         
-        st.info(f"Consider gaining experience or training in these areas for {job_title} positions.")
\ No newline at end of file
+        st.info(f"Consider gaining experience or training in these areas for {job_title} positions.")
+
+def display_skill_gap_panel(top_skills: List[Dict[str, Any]], job_title: str, period_label: str = "this month") -> None:
+    """
+    Display the most common missing skills across all analyses for a job title
+    
+    Args:
+        top_skills: List of {'skill', 'count'} dicts, most missing first
+        job_title: The job title the counts belong to
+        period_label: Human-readable description of the period
+    """
+    st.subheader(f"Top Missing Skills for {job_title} Roles ({period_label})")
+    
+    if not top_skills:
+        st.info("No analyses recorded for this job title yet.")
+        return
+    
+    # Reverse so the most missing skill is drawn at the top
+    skills = [item["skill"] for item in reversed(top_skills)]
+    counts = [item["count"] for item in reversed(top_skills)]
+    
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Bar(x=counts, y=skills, orientation='h', marker_color='indianred'))
+    fig.update_layout(
+        height=40 + 28 * len(skills),
+        margin=dict(l=20, r=20, b=20, t=20),
+        xaxis_title="Analyses missing this skill",
+        paper_bgcolor="white"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_timing_sidebar(spans: List[Dict[str, Any]]) -> None:
+    """
+    Display the per-stage cost breakdown of the current request in the sidebar
+    
+    Args:
+        spans: Spans collected by utils.metrics for this script run
+    """
+    with st.sidebar.expander("⏱ Timing breakdown", expanded=True):
+        if not spans:
+            st.caption("No instrumented stages ran on this page load.")
+            return
+        
+        # Spans are recorded as they finish; list outermost stages by total cost
+        totals: Dict[str, float] = {}
+        for span in spans:
+            totals[span["stage"]] = totals.get(span["stage"], 0.0) + span["ms"]
+        
+        top_level_ms = sum(span["ms"] for span in spans if span["depth"] == 0)
+        st.metric("Instrumented time", f"{top_level_ms:.0f} ms")
+        for stage, ms in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+            st.write(f"`{stage}` — {ms:.1f} ms")
+
+def display_pipeline_stages(stages: Dict[str, str]) -> None:
+    """
+    Display which analysis stages were recomputed and which were reused
+    
+    Args:
+        stages: Node name -> 'computed' or 'reused', from utils.pipeline
+    """
+    labels = []
+    for stage, status in stages.items():
+        icon = "♻️" if status == "reused" else "⚙️"
+        labels.append(f"{icon} {stage.replace('_', ' ')}")
+    reused = sum(1 for status in stages.values() if status == "reused")
+    st.caption(f"Stages reused: {reused}/{len(stages)} — " + " · ".join(labels))
+
+def display_analysis_coverage(nlp_stages: Dict[str, str]) -> None:
+    """
+    Note which NLP stages were cut short by the analysis time budget
+    
+    Args:
+        nlp_stages: Stage -> 'full', 'truncated' or 'skipped', from a match result
+    """
+    labels = {"keywords": "keywords", "sentences": "sentences", "noun_chunks": "noun phrases", "ner": "named entities"}
+    cut = [f"{labels.get(stage, stage)} {status}" for stage, status in nlp_stages.items() if status != "full"]
+    if cut:
+        st.caption("⏱️ Analysis hit its time budget (" + ", ".join(cut) + "); some skills may not be detected.")
+
+def display_resume_result(result: Dict[str, Any]) -> None:
+    """
+    Display one resume's match result in a compact bordered card
+    
+    Args:
+        result: Result from utils.batch_analysis.analyze_resume_file
+    """
+    with st.container(border=True):
+        if result.get("error"):
+            st.error(f"**{result['name']}**: {result['error']}")
+            return
+        
+        match_result = result["match_result"]
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"**{result['name']}**")
+            matching = match_result.get("matching_keywords", [])
+            missing = match_result.get("missing_keywords", [])
+            st.caption(f"{len(matching)} matching, {len(missing)} missing keywords")
+            if missing:
+                st.caption("Missing: " + ", ".join(missing[:8]))
+        with col2:
+            st.metric("Match", f"{match_result.get('overall_score', 0)*100:.1f}%")
+        for warning in result.get("warnings", []):
+            st.caption(f"⚠️ {warning['message']}")
+
+def display_resume_comparison_table(results: List[Dict[str, Any]]) -> None:
+    """
+    Display a table comparing several resumes, best match first
+    
+    Args:
+        results: Results from utils.batch_analysis, already ranked
+    """
+    rows = []
+    for rank, result in enumerate(results, start=1):
+        match_result = result.get("match_result") or {}
+        analysis = result.get("resume_analysis") or {}
+        rows.append({
+            "Rank": rank if match_result else None,
+            "Resume": result["name"],
+            "Match %": round(match_result.get("overall_score", 0) * 100, 1) if match_result else None,
+            "Matching": len(match_result.get("matching_keywords", [])) if match_result else None,
+            "Missing": len(match_result.get("missing_keywords", [])) if match_result else None,
+            "Years exp.": analysis.get("total_years_experience"),
+            "Status": "Failed" if result.get("error") else "OK",
+        })
+    
+    st.dataframe(
+        rows,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "Match %": st.column_config.ProgressColumn("Match %", min_value=0, max_value=100, format="%.1f%%"),
+        }
+    )
+
+def display_answer_feedback(feedback: Dict[str, Any]) -> None:
+    """
+    Display instant feedback on a practice answer
+    
+    Args:
+        feedback: Result from utils.answer_scoring.score_answer
+    """
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Answer score", f"{feedback['score']*100:.0f}%")
+    col2.metric("Length", f"{feedback['word_count']} words", f"~{feedback['speaking_seconds']}s spoken", delta_color="off")
+    if feedback["coverage"] is None:
+        col3.metric("Skill coverage", "n/a")
+    else:
+        col3.metric("Skill coverage", f"{len(feedback['covered_terms'])}/{len(feedback['skill_terms'])}")
+    col4.metric("Filler words", feedback["filler_count"])
+    
+    star = " · ".join(f"{'✅' if found else '⬜'} {part.title()}" for part, found in feedback["star"].items())
+    st.caption(f"STAR: {star}")
+    for tip in feedback["tips"]:
+        st.caption(f"💡 {tip}")
+
+def display_session_memory(usage: Dict[str, Dict[str, int]]) -> None:
+    """
+    Display the approximate memory held by the current session in the sidebar
+    
+    Args:
+        usage: Per-key accounting from utils.session_payloads.session_memory_usage
+    """
+    with st.sidebar.expander("🧮 Session memory"):
+        resident = sum(entry["resident"] for entry in usage.values())
+        offloaded = sum(entry["offloaded"] for entry in usage.values())
+        col1, col2 = st.columns(2)
+        col1.metric("In memory", f"{resident / 1024:.1f} KB")
+        col2.metric("Offloaded", f"{offloaded / 1024:.1f} KB")
+        
+        largest = sorted(usage.items(), key=lambda item: item[1]["resident"], reverse=True)[:8]
+        for key, entry in largest:
+            note = f" (+{entry['offloaded'] / 1024:.1f} KB on disk)" if entry["offloaded"] else ""
+            st.write(f"`{key}` — {entry['resident'] / 1024:.1f} KB{note}")
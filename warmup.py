@@ -0,0 +1,57 @@
+import importlib
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from utils.metrics import timed
+
+# Heavy modules the pages import on first use, slowest first
+WARMUP_MODULES = (
+    'plotly.graph_objects',
+    'openai',
+)
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+# Seconds each warm-up step took, for the startup benchmark and debugging
+warmup_timings: Dict[str, float] = {}
+
+
+def warm_up():
+    """Import heavy modules and load the spaCy model so the first analysis doesn't pay for it."""
+    for name in WARMUP_MODULES:
+        start = time.perf_counter()
+        try:
+            with timed("warmup"):
+                importlib.import_module(name)
+        except ImportError as e:
+            print(f"Warm-up skipped {name}: {e}")
+        warmup_timings[name] = time.perf_counter() - start
+
+    from utils.nlp_processor import get_nlp
+    start = time.perf_counter()
+    with timed("warmup"):
+        # One tiny parse also initializes lazily built pipeline state
+        get_nlp()("warm up")
+    warmup_timings['spacy'] = time.perf_counter() - start
+
+
+def start_warmup() -> Optional[threading.Thread]:
+    """
+    Run warm_up on a daemon thread, once per process
+
+    Set TRAIL_WARMUP=0 to disable (e.g. to measure cold pages).
+
+    Returns:
+        The warm-up thread, or None if disabled
+    """
+    global _warmup_thread
+    if os.getenv("TRAIL_WARMUP", "1") == "0":
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread